@@ -25,6 +25,7 @@ class MenuBar(DirectObject):
         self.export_entry = DirectMenuItemSubMenu("Export >", [
             DirectMenuItemEntry("Python", base.messenger.send, ["exportProject_python"]),
             DirectMenuItemEntry("Bam", base.messenger.send, ["exportProject_bam"]),
+            DirectMenuItemEntry("Bam (streaming cells)", base.messenger.send, ["exportProject_bam_cells"]),
         ])
         self.fileEntries = [
             DirectMenuItemEntry("New", base.messenger.send, ["newProject"]),
@@ -39,6 +40,12 @@ class MenuBar(DirectObject):
 
         viewEntries = [
             DirectMenuItemEntry("Toggle Grid", base.messenger.send, ["toggleGrid"]),
+            DirectMenuItemSubMenu("Helpers >", [
+                DirectMenuItemEntry("Toggle Empties", base.messenger.send, ["toggleHelpers", ["empty"]]),
+                DirectMenuItemEntry("Toggle Lights", base.messenger.send, ["toggleHelpers", ["light"]]),
+                DirectMenuItemEntry("Toggle Cameras", base.messenger.send, ["toggleHelpers", ["camera"]]),
+                DirectMenuItemEntry("Toggle Collisions", base.messenger.send, ["toggleHelpers", ["collision"]]),
+                ]),
             DirectMenuSeparator(),
             DirectMenuItemEntry("Zoom-in", base.messenger.send, ["zoom-in"]),
             DirectMenuItemEntry("Zoom-out", base.messenger.send, ["zoom-out"]),
@@ -56,6 +63,11 @@ class MenuBar(DirectObject):
             DirectMenuItemEntry("Copy", base.messenger.send, ["copyElement"]),
             DirectMenuItemEntry("Cut", base.messenger.send, ["cutElement"]),
             DirectMenuItemEntry("Paste", base.messenger.send, ["pasteElement"]),
+            DirectMenuItemEntry("Purge Removed Objects", base.messenger.send, ["purgeRemovedObjects"]),
+            DirectMenuSeparator(),
+            DirectMenuItemEntry("Toggle Profiler", base.messenger.send, ["toggleProfiler"]),
+            DirectMenuItemEntry("Memory Report", base.messenger.send, ["writeMemoryReport"]),
+            DirectMenuItemEntry("Asset Cache Stats", base.messenger.send, ["logAssetCacheStats"]),
             #DirectMenuSeparator(),
             #DirectMenuItemEntry("Options", base.messenger.send, ["showSettings"]),
             #DirectMenuItemEntry("Help", base.messenger.send, ["showHelp"]),
@@ -0,0 +1,64 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+from panda3d.core import TextNode
+
+from direct.gui.OnscreenText import OnscreenText
+
+from SceneEditor.tools import Instrumentation
+
+class PerformanceHUD:
+    """Shows the frame rate and the timings of the instrumented editor
+    sections on top of the editor"""
+
+    def __init__(self, update_interval=0.5):
+        self.update_interval = update_interval
+
+        self.text = OnscreenText(
+            text="",
+            fg=(1, 1, 1, 1),
+            bg=(0, 0, 0, 0.6),
+            scale=0.035,
+            align=TextNode.A_left,
+            pos=(0.02, 0.3),
+            parent=base.a2dBottomLeft,
+            mayChange=True,
+            sort=1000)
+        self.text.hide()
+
+    def show(self):
+        self.text.show()
+        base.task_mgr.do_method_later(
+            0, self.update_task, "SceneEditor_performance_hud_update")
+
+    def hide(self):
+        self.text.hide()
+        base.task_mgr.remove("SceneEditor_performance_hud_update")
+
+    def toggle(self):
+        if self.text.is_hidden():
+            self.show()
+        else:
+            self.hide()
+
+    def update_task(self, task):
+        lines = [
+            f"{globalClock.get_average_frame_rate():.1f} fps",
+            f"{'section':28}{'calls':>7}{'last':>9}{'avg':>9}{'max':>9}",
+        ]
+        for name, calls, last, average, maximum in Instrumentation.get_report():
+            if calls == 0:
+                continue
+            lines.append(
+                f"{name:28}{calls:>7}"
+                f"{last * 1000:>7.2f}ms{average * 1000:>7.2f}ms"
+                f"{maximum * 1000:>7.2f}ms")
+        self.text.setText("\n".join(lines))
+
+        task.delayTime = self.update_interval
+        return task.again
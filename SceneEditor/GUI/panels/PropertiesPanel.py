@@ -21,6 +21,8 @@ from panda3d.core import (
     PGFrameStyle,
     MouseButton,
     NodePath,
+    ConfigVariableBool,
+    ConfigVariableDouble,
     ConfigVariableString)
 from direct.showbase.DirectObject import DirectObject
 
@@ -41,6 +43,8 @@ from DirectGuiExtension.DirectAutoSizer import DirectAutoSizer
 from DirectGuiExtension.DirectCollapsibleFrame import DirectCollapsibleFrame
 
 from SceneEditor.GUI.panels import ObjectPropertiesDefinition
+from SceneEditor.tools.EditedProperties import set_edited
+from SceneEditor.tools.Instrumentation import timed
 
 DGG.BELOW = "below"
 MWUP = PGButton.getPressPrefix() + MouseButton.wheel_up().getName() + '-'
@@ -48,6 +52,9 @@ MWDOWN = PGButton.getPressPrefix() + MouseButton.wheel_down().getName() + '-'
 
 SCROLLBARWIDTH = 20
 
+# shown in entries of properties which differ between the edited objects
+MIXED_VALUE_TEXT = "--"
+
 
 class PropertyHelper:
     def getFormated(value, isInt=False):
@@ -62,41 +69,134 @@ class PropertyHelper:
         else:
             return value
 
-    def getValues(definition, obj):
+    # compiled accessor functions per definition
+    getters = {}
+    setters = {}
+
+    def getLookupCode(definition):
+        """Returns the code resolving the lookupAttrs chain of the definition
+        as it would be written by hand, e.g. obj.get_child(1).node()"""
+        code = "obj"
+        if definition.lookupAttrs is not None:
+            for lookupAttr, lookupAttrArgs in definition.lookupAttrs.items():
+                args = ", ".join([repr(arg) for arg in lookupAttrArgs])
+                code += f".{lookupAttr}({args})"
+        return code
+
+    def canCompile(definition):
+        names = [definition.internalName]
+        if definition.getFunctionName:
+            names.append(definition.getFunctionName)
+        if definition.lookupAttrs is not None:
+            names += list(definition.lookupAttrs.keys())
+        for name in names:
+            if not name.isidentifier():
+                return False
+        return True
+
+    def compileGetter(definition):
+        if not PropertyHelper.canCompile(definition):
+            return lambda obj: PropertyHelper.lookupValues(definition, obj)
+
+        code = PropertyHelper.getLookupCode(definition)
+        if definition.setAsTag:
+            code += f".get_tag({definition.internalName!r})"
+        elif definition.getFunctionName:
+            code += f".{definition.getFunctionName}()"
+        else:
+            code += f".{definition.internalName}"
+        return eval(f"lambda obj: {code}")
+
+    def compileSetter(definition):
+        name = definition.internalName
+        if definition.setFunctionName:
+            setFunctionName = definition.setFunctionName
+            convert = definition.type != object
+            def setFunc(editObj, value):
+                if convert:
+                    try:
+                        value = definition.type(*value)
+                    except:
+                        logging.debug(f"couldn't convert value {value} to type {definition.type}")
+                getattr(editObj, setFunctionName)(value)
+        elif definition.setAsTag:
+            def setFunc(editObj, value):
+                editObj.set_tag(name, value)
+        else:
+            def setFunc(editObj, value):
+                setattr(editObj, name, value)
+
+        if definition.lookupAttrs is None:
+            return setFunc
+        if PropertyHelper.canCompile(definition):
+            lookup = eval(f"lambda obj: {PropertyHelper.getLookupCode(definition)}")
+        else:
+            lookup = lambda obj: PropertyHelper.lookupObject(definition, obj)
+        return lambda obj, value: setFunc(lookup(obj), value)
+
+    def lookupObject(definition, obj):
         editObj = obj
         if definition.lookupAttrs is not None:
             for lookupAttr, lookupAttrArgs in definition.lookupAttrs.items():
                 editObj = getattr(editObj, lookupAttr)(*lookupAttrArgs)
+        return editObj
+
+    def lookupValues(definition, obj):
+        """Gets the value by walking the definitions attributes on each call,
+        used for definitions which can't be compiled"""
+        editObj = PropertyHelper.lookupObject(definition, obj)
         if definition.setAsTag:
             return editObj.get_tag(definition.internalName)
         if definition.getFunctionName:
             return getattr(editObj, definition.getFunctionName)()
         return getattr(editObj, definition.internalName)
 
+    def getValues(definition, obj):
+        getter = PropertyHelper.getters.get(definition)
+        if getter is None:
+            getter = PropertyHelper.compileGetter(definition)
+            PropertyHelper.getters[definition] = getter
+        return getter(obj)
+
     def setValue(definition, obj, value, valueAsString=""):
-        editObj = obj
-        if definition.lookupAttrs is not None:
-            for lookupAttr, lookupAttrArgs in definition.lookupAttrs.items():
-                editObj = getattr(editObj, lookupAttr)(*lookupAttrArgs)
-        if definition.setFunctionName:
-            if definition.type != object:
-                try:
-                    value = definition.type(*value)
-                except:
-                    logging.debug(f"couldn't convert value {value} to type {definition.type}")
-            getattr(editObj, definition.setFunctionName)(value)
-        elif definition.setAsTag:
-            editObj.set_tag(definition.internalName, value)
-        else:
-            setattr(editObj, definition.internalName, value)
+        setter = PropertyHelper.setters.get(definition)
+        if setter is None:
+            setter = PropertyHelper.compileSetter(definition)
+            PropertyHelper.setters[definition] = setter
+        setter(obj, value)
 
         # store a list of edited properties
-        edit_list = []
-        if obj.has_tag("edited_properties"):
-            edit_list = obj.get_tag("edited_properties").split(",")
-        if definition.internalName not in edit_list:
-            edit_list.append(definition.internalName)
-            obj.set_tag("edited_properties", ",".join(edit_list))
+        set_edited(obj, definition.internalName)
+
+class PropertyEditorSet:
+    """The widgets to edit the properties of one object type. Sets are kept in
+    a pool and get bound to the next objects of their type instead of being
+    recreated with every selection change. If multiple objects are bound,
+    edits are applied to all of them."""
+    def __init__(self, objectType, objs):
+        self.objectType = objectType
+        self.objs = objs
+
+        # the top level widgets to be added to the panel
+        self.widgets = []
+
+        # functions updating the widgets values from the bound object
+        self.binders = []
+
+        self.section = None
+        self.boxFrame = None
+
+        # set if the widgets of the section need to be placed again
+        self.layoutChanged = False
+
+    @property
+    def obj(self):
+        return self.objs[0]
+
+    def bind(self, objs):
+        self.objs = objs
+        for binder in self.binders:
+            binder()
 
 class PropertiesPanel(DirectObject):
     scrollSpeedUp = -0.001
@@ -110,6 +210,26 @@ class PropertiesPanel(DirectObject):
 
         self.setupDone = False
 
+        # edit all selected objects of the same type with one set of editors
+        self.aggregate = ConfigVariableBool(
+            "scene-editor-aggregate-properties", True).getValue()
+
+        # how often per second the shown values may be updated
+        updateRate = ConfigVariableDouble(
+            "scene-editor-properties-update-rate", 10.0).getValue()
+        self.updateInterval = 1.0 / updateRate if updateRate > 0 else 0
+
+        self.mainBoxFrame = None
+        # the editor sets bound to the current selection
+        self.shownSets = []
+        # the panel width the pooled editors have been created for
+        self.editorWidth = None
+
+        # object type -> list of editor sets for this type
+        self.editorPool = {}
+        # parent for the editor sets currently not shown in the panel
+        self.poolRoot = NodePath("propertiesPanelPool")
+
         self.box = DirectBoxSizer(
             frameColor=(0.25, 0.25, 0.25, 1),
             autoUpdateFrameSize=False,
@@ -175,80 +295,109 @@ class PropertiesPanel(DirectObject):
                 self.sizer["frameSize"][0], self.sizer["frameSize"][1],
                 self.sizer["frameSize"][2]+DGH.getRealHeight(self.lblHeader), self.sizer["frameSize"][3])
 
-        if self.setupDone and not taskMgr.hasTaskNamed("updatePropPanel"):
-            taskMgr.doMethodLater(0.99, self.clear, "clearPropPanel", extraArgs=[])
-            taskMgr.doMethodLater(1, self.refreshProperties, "updatePropPanel", extraArgs=[])
+        if not self.setupDone: return
+
+        width = self.propertiesFrame["frameSize"][1] - self.propertiesFrame["frameSize"][0]
+        if width != self.editorWidth:
+            # the pooled editors were sized for the old width, rebuild them
+            # once the resizing stopped
+            taskMgr.remove("updatePropPanel")
+            taskMgr.doMethodLater(1, self.rebuildProperties, "updatePropPanel", extraArgs=[])
+        else:
+            self.updateCanvasSize()
+
+    def rebuildProperties(self):
+        self.clearPool()
+        self.refreshProperties()
 
+    def isShowing(self, objs):
+        """Returns True if the panel is bound to exactly the given objects"""
+        return self.setupDone and objs != [] and objs == self.ojbs
 
     def setupProperties(self, objs):
-        """Creates the set of editable properties for the given element"""
+        """Binds the set of editable properties to the given elements"""
         if taskMgr.hasTaskNamed("updatePropPanel"):
             taskMgr.remove("updatePropPanel")
-        self.ignoreAll()
-        self.ojbs = objs
+            self.clearPool()
+        taskMgr.remove("updatePropPanelValues")
+        # copy the list as the selection gets changed in place
+        self.ojbs = list(objs)
         self.refreshProperties()
 
+    def requestValueUpdate(self):
+        """Updates the shown values of the bound objects, at most as often as
+        configured by scene-editor-properties-update-rate"""
+        if not self.setupDone or taskMgr.hasTaskNamed("updatePropPanelValues"):
+            return
+        taskMgr.doMethodLater(
+            self.updateInterval, self.updateValues, "updatePropPanelValues",
+            extraArgs=[])
+
+    def updateValues(self):
+        """Writes the current values of the bound objects to the editors, only
+        widgets showing a changed value get updated"""
+        layoutChanged = False
+        for editorSet in self.shownSets:
+            editorSet.bind(editorSet.objs)
+            if editorSet.layoutChanged:
+                self.updateSection(editorSet)
+                editorSet.layoutChanged = False
+                layoutChanged = True
+        if layoutChanged:
+            self.updateCanvasSize()
+
+    def getObjectType(self, obj):
+        object_type = obj.get_tag("object_type")
+        if object_type == "light":
+            object_type = obj.get_tag("light_type")
+        elif object_type == "collision":
+            object_type = obj.get_tag("collision_solid_type")
+        elif object_type == "camera":
+            object_type = obj.get_tag("camera_type")
+        return object_type
+
+    @timed("Panels:Properties")
     def refreshProperties(self):
         objs = self.ojbs
         if objs == []: return
 
-        # create the frame that will hold all our properties
-        self.mainBoxFrame = DirectBoxSizer(
-            orientation=DGG.VERTICAL,
-            frameColor=VBase4(0, 0, 0, 0),
-            parent=self.propertiesFrame.getCanvas(),
-            suppressMouse=True,
-            state=DGG.NORMAL)
-        self.mainBoxFrame.bind(DGG.MWDOWN, self.scroll, [self.scrollSpeedDown])
-        self.mainBoxFrame.bind(DGG.MWUP, self.scroll, [self.scrollSpeedUp])
-
-        for obj in objs:
-            headerText = obj.get_name()
-            # Create the header for the properties
-            lbl = DirectLabel(
-                text=headerText,
-                text_scale=18,
-                text_pos=(-10, 0),
-                text_align=TextNode.ACenter,
-                frameSize=VBase4(
-                    -self.propertiesFrame["frameSize"][1],
-                    self.propertiesFrame["frameSize"][1],
-                    -10,
-                    20),
-                frameColor=VBase4(0.7, 0.7, 0.7, 1),
+        if self.mainBoxFrame is None:
+            # create the frame that will hold all our properties
+            self.mainBoxFrame = DirectBoxSizer(
+                orientation=DGG.VERTICAL,
+                frameColor=VBase4(0, 0, 0, 0),
+                parent=self.propertiesFrame.getCanvas(),
+                suppressMouse=True,
                 state=DGG.NORMAL)
-            lbl.bind(DGG.MWDOWN, self.scroll, [self.scrollSpeedDown])
-            lbl.bind(DGG.MWUP, self.scroll, [self.scrollSpeedUp])
-            self.mainBoxFrame.addItem(lbl)
+            self.mainBoxFrame.bind(DGG.MWDOWN, self.scroll, [self.scrollSpeedDown])
+            self.mainBoxFrame.bind(DGG.MWUP, self.scroll, [self.scrollSpeedUp])
+
+        # group the objects which will be edited by the same editor set
+        objectGroups = []
+        if self.aggregate:
+            groupsByType = {}
+            for obj in objs:
+                object_type = self.getObjectType(obj)
+                if object_type not in groupsByType:
+                    groupsByType[object_type] = []
+                    objectGroups.append((object_type, groupsByType[object_type]))
+                groupsByType[object_type].append(obj)
+        else:
+            for obj in objs:
+                objectGroups.append((self.getObjectType(obj), [obj]))
 
-            # Set up all the properties
+        # count how many sets of each type are in use by this selection
+        usedSets = {}
+        self.shownSets = []
+        for object_type, group in objectGroups:
             try:
+                setIndex = usedSets.get(object_type, 0)
+                editorSet = self.getEditorSet(object_type, setIndex, group)
+                usedSets[object_type] = setIndex + 1
+                self.shownSets.append(editorSet)
 
-                allDefinitions = {**ObjectPropertiesDefinition.DEFINITIONS}
-
-                object_type = obj.get_tag("object_type")
-
-                if object_type == "light":
-                    object_type = obj.get_tag("light_type")
-                elif object_type == "collision":
-                    object_type = obj.get_tag("collision_solid_type")
-                elif object_type == "camera":
-                    object_type = obj.get_tag("camera_type")
-
-                # check if we have a definition for this specific GUI element
-                if object_type in allDefinitions:
-                    # create the main set of properties to edit
-                    wd = allDefinitions[object_type]
-                    # create a header for this type of element
-                    self.__createInbetweenHeader(object_type)
-
-                    section = self.createSection()
-
-                    # create the set of properties to edit on the main component
-                    for definition in wd:
-                        self.createProperty(definition, obj)
-
-                    self.updateSection(section)
+                for widget in editorSet.widgets:
+                    self.mainBoxFrame.addItem(widget, skipRefresh=True)
 
                 self.setupDone = True
             except Exception:
@@ -261,7 +410,80 @@ class PropertiesPanel(DirectObject):
         #
         self.updateCanvasSize()
 
+    def getEditorSet(self, object_type, index, objs):
+        """Returns an editor set for the given object type bound to objs. Sets
+        from the pool are reused, new ones are only created if all sets of
+        this type are already in use."""
+        if object_type not in self.editorPool:
+            self.editorPool[object_type] = []
+        pool = self.editorPool[object_type]
+
+        if index < len(pool):
+            editorSet = pool[index]
+            editorSet.bind(objs)
+            if editorSet.layoutChanged:
+                self.updateSection(editorSet)
+                editorSet.layoutChanged = False
+            return editorSet
+
+        editorSet = self.createEditorSet(object_type, objs)
+        pool.append(editorSet)
+        return editorSet
+
+    def getHeaderText(self, objs):
+        if len(objs) == 1:
+            return objs[0].get_name()
+        return f"{len(objs)} objects"
+
+    def createEditorSet(self, object_type, objs):
+        editorSet = PropertyEditorSet(object_type, objs)
+        self.editorWidth = self.propertiesFrame["frameSize"][1] - self.propertiesFrame["frameSize"][0]
+
+        # Create the header for the properties
+        lbl = DirectLabel(
+            text=self.getHeaderText(objs),
+            text_scale=18,
+            text_pos=(-10, 0),
+            text_align=TextNode.ACenter,
+            frameSize=VBase4(
+                -self.propertiesFrame["frameSize"][1],
+                self.propertiesFrame["frameSize"][1],
+                -10,
+                20),
+            frameColor=VBase4(0.7, 0.7, 0.7, 1),
+            state=DGG.NORMAL)
+        lbl.bind(DGG.MWDOWN, self.scroll, [self.scrollSpeedDown])
+        lbl.bind(DGG.MWUP, self.scroll, [self.scrollSpeedUp])
+        editorSet.widgets.append(lbl)
+
+        def bindHeader():
+            text = self.getHeaderText(editorSet.objs)
+            if lbl["text"] != text:
+                lbl["text"] = text
+        editorSet.binders.append(bindHeader)
+
+        # check if we have a definition for this specific GUI element
+        if object_type in ObjectPropertiesDefinition.DEFINITIONS:
+            # create the main set of properties to edit
+            wd = ObjectPropertiesDefinition.DEFINITIONS[object_type]
+            # create a header for this type of element
+            editorSet.widgets.append(self.__createInbetweenHeader(object_type))
+
+            self.createSection(editorSet)
+            editorSet.widgets.append(editorSet.section)
+
+            # create the set of properties to edit on the main component
+            for definition in wd:
+                self.createProperty(definition, editorSet)
+
+            self.updateSection(editorSet)
+
+        return editorSet
+
     def updateCanvasSize(self):
+        # sections may report size changes while they're not shown
+        if self.mainBoxFrame is None or self.mainBoxFrame["items"] == []:
+            return
         self.mainBoxFrame.refresh()
 
         self.propertiesFrame["canvasSize"] = (
@@ -279,7 +501,7 @@ class PropertiesPanel(DirectObject):
         self.propertiesFrame["verticalScroll_scrollSize"] = s
         self.propertiesFrame["verticalScroll_pageSize"] = s
 
-    def createSection(self):
+    def createSection(self, editorSet):
         section = DirectCollapsibleFrame(
             collapsed=True,
             frameColor=(1, 1, 1, 1),
@@ -301,8 +523,7 @@ class PropertiesPanel(DirectObject):
         section.bind(DGG.MWDOWN, self.scroll, [self.scrollSpeedDown])
         section.bind(DGG.MWUP, self.scroll, [self.scrollSpeedUp])
 
-        self.mainBoxFrame.addItem(section)
-        self.boxFrame = DirectBoxSizer(
+        boxFrame = DirectBoxSizer(
             pos=(0, 0, -section["headerheight"]),
             frameSize=(
                 self.propertiesFrame["frameSize"][0],
@@ -314,52 +535,73 @@ class PropertiesPanel(DirectObject):
             parent=section,
             suppressMouse=True,
             state=DGG.NORMAL)
-        self.boxFrame.bind(DGG.MWDOWN, self.scroll, [self.scrollSpeedDown])
-        self.boxFrame.bind(DGG.MWUP, self.scroll, [self.scrollSpeedUp])
+        boxFrame.bind(DGG.MWDOWN, self.scroll, [self.scrollSpeedDown])
+        boxFrame.bind(DGG.MWUP, self.scroll, [self.scrollSpeedUp])
+
+        editorSet.section = section
+        editorSet.boxFrame = boxFrame
         return section
 
     def sectionCollapsed(self, section):
         self.updateCanvasSize()
 
-    def updateSection(self, section):
-        self.boxFrame.refresh()
-        fs = self.boxFrame["frameSize"]
+    def updateSection(self, editorSet):
+        section = editorSet.section
+        editorSet.boxFrame.refresh()
+        fs = editorSet.boxFrame["frameSize"]
         section["frameSize"] = (fs[0], fs[1]-SCROLLBARWIDTH, fs[2]-section["headerheight"], fs[3])
         section.updateFrameSize()
         section.setCollapsed()
 
-    def createProperty(self, definition, obj):
+    def createProperty(self, definition, editorSet):
         if definition.editType == ObjectPropertiesDefinition.PropertyEditTypes.integer:
-            self.__createNumberInput(definition, obj, int)
+            self.__createNumberInput(definition, editorSet, int)
         elif definition.editType == ObjectPropertiesDefinition.PropertyEditTypes.float:
-            self.__createNumberInput(definition, obj, float)
+            self.__createNumberInput(definition, editorSet, float)
         elif definition.editType == ObjectPropertiesDefinition.PropertyEditTypes.bool:
-            self.__createBoolProperty(definition, obj)
+            self.__createBoolProperty(definition, editorSet)
         elif definition.editType == ObjectPropertiesDefinition.PropertyEditTypes.text:
-            self.__createTextProperty(definition, obj)
+            self.__createTextProperty(definition, editorSet)
         elif definition.editType == ObjectPropertiesDefinition.PropertyEditTypes.base2:
-            self.__createBaseNInput(definition, obj, 2, definition.numberType)
+            self.__createBaseNInput(definition, editorSet, 2, definition.numberType)
         elif definition.editType == ObjectPropertiesDefinition.PropertyEditTypes.base3:
-            self.__createBaseNInput(definition, obj, 3, definition.numberType)
+            self.__createBaseNInput(definition, editorSet, 3, definition.numberType)
         elif definition.editType == ObjectPropertiesDefinition.PropertyEditTypes.base4:
-            self.__createBaseNInput(definition, obj, 4, definition.numberType)
+            self.__createBaseNInput(definition, editorSet, 4, definition.numberType)
         elif definition.editType == ObjectPropertiesDefinition.PropertyEditTypes.command:
-            self.__createCustomCommand(definition, obj)
+            self.__createCustomCommand(definition, editorSet)
         elif definition.editType == ObjectPropertiesDefinition.PropertyEditTypes.path:
-            self.__createPathProperty(definition, obj)
+            self.__createPathProperty(definition, editorSet)
         elif definition.editType == ObjectPropertiesDefinition.PropertyEditTypes.optionMenu:
-            self.__createOptionMenuProperty(definition, obj)
+            self.__createOptionMenuProperty(definition, editorSet)
         elif definition.editType == ObjectPropertiesDefinition.PropertyEditTypes.list:
-            self.__createListProperty(definition, obj)
+            self.__createListProperty(definition, editorSet)
         elif definition.editType == ObjectPropertiesDefinition.PropertyEditTypes.tuple:
-            self.__createTupleProperty(definition, obj)
+            self.__createTupleProperty(definition, editorSet)
         else:
             logging.error(f"Edit type {definition.editType} not in Edit type definitions")
 
     def clear(self):
-        if not hasattr(self, "mainBoxFrame"): return
-        if self.mainBoxFrame is not None:
-            self.mainBoxFrame.destroy()
+        """Removes all editor sets from the panel and moves them back to the
+        pool so they can be bound to the next selection"""
+        if self.mainBoxFrame is None: return
+        for item in self.mainBoxFrame["items"]:
+            item.element.reparentTo(self.poolRoot)
+        self.mainBoxFrame["items"] = []
+        self.shownSets = []
+
+    def clearPool(self):
+        """Destroys all pooled editor sets, e.g. if they don't fit the panels
+        size anymore"""
+        self.clear()
+        for pool in self.editorPool.values():
+            for editorSet in pool:
+                if editorSet.section is not None:
+                    self.ignore(editorSet.section.getCollapsedEvent())
+                    self.ignore(editorSet.section.getExtendedEvent())
+                for widget in editorSet.widgets:
+                    widget.destroy()
+        self.editorPool = {}
 
     def __createInbetweenHeader(self, description):
         l = DirectLabel(
@@ -371,9 +613,9 @@ class PropertiesPanel(DirectObject):
             state=DGG.NORMAL)
         l.bind(DGG.MWDOWN, self.scroll, [self.scrollSpeedDown])
         l.bind(DGG.MWUP, self.scroll, [self.scrollSpeedUp])
-        self.mainBoxFrame.addItem(l, skipRefresh=True)
+        return l
 
-    def __createPropertyHeader(self, description):
+    def __createPropertyHeader(self, description, editorSet):
         l = DirectLabel(
             text=description,
             text_scale=12,
@@ -384,12 +626,55 @@ class PropertiesPanel(DirectObject):
             state=DGG.NORMAL)
         l.bind(DGG.MWDOWN, self.scroll, [self.scrollSpeedDown])
         l.bind(DGG.MWUP, self.scroll, [self.scrollSpeedUp])
-        self.boxFrame.addItem(l, skipRefresh=True)
+        editorSet.boxFrame.addItem(l, skipRefresh=True)
+        return l
+
+    def __setMixed(self, header, definition, mixed):
+        """Marks the property header if the value differs between the edited
+        objects"""
+        text = definition.visiblename
+        if mixed:
+            text += " (mixed)"
+        if header["text"] != text:
+            header["text"] = text
+
+    def __getAllValues(self, definition, editorSet):
+        return [PropertyHelper.getValues(definition, obj) for obj in editorSet.objs]
+
+    def __isMixed(self, values):
+        for value in values[1:]:
+            if value != values[0]:
+                return True
+        return False
 
     def __addToKillRing(self, obj, definition, oldValue, newValue):
         base.messenger.send("addToKillRing",
             [obj, "set", definition.internalName, oldValue, newValue])
 
+    def __setValues(self, definition, objs, values, addToKillRing=True):
+        """Sets one value per object, all values get stored in one entry of the
+        kill ring so they can be undone together"""
+        if addToKillRing:
+            try:
+                oldValues = [PropertyHelper.getValues(definition, obj) for obj in objs]
+                if len(objs) == 1:
+                    self.__addToKillRing(objs[0], definition, oldValues[0], values[0])
+                elif len(objs) > 1:
+                    base.messenger.send("addToKillRing",
+                        [objs, "set_batch", definition.internalName, oldValues, values])
+            except Exception:
+                logging.exception(f"{definition.internalName} not supported by undo/redo yet")
+
+        for obj, value in zip(objs, values):
+            PropertyHelper.setValue(definition, obj, value)
+
+    def __setEntryText(self, entry, text):
+        # don't overwrite what the user is currently typing
+        if entry.guiItem.getFocus():
+            return
+        if entry.get() != text:
+            entry.set(text)
+
     def __createTextEntry(self, text, width, command, commandArgs=[]):
         def focusOut():
             base.messenger.send("reregisterKeyboardEvents")
@@ -413,66 +698,102 @@ class PropertiesPanel(DirectObject):
     #
     # General input elements
     #
-    def __createBaseNInput(self, definition, obj, n, numberType=float):
+    def __createBaseNInput(self, definition, editorSet, n, numberType=float):
         entryList = []
 
-        def update(text, obj):
+        def getComponents(value):
+            if type(value) is int or type(value) is float:
+                return [value] * n
+            if value is None:
+                return [""] * n
+            return list(value)
+
+        def update(text):
             base.messenger.send("setDirtyFlag")
-            values = []
+            entryValues = []
             for value in entryList:
+                if value.get(True) == MIXED_VALUE_TEXT:
+                    # keep the objects own values for this component
+                    entryValues.append(MIXED_VALUE_TEXT)
+                    continue
                 try:
-                    values.append(numberType(value.get(True)))
+                    entryValues.append(numberType(value.get(True)))
                 except Exception:
                     if value.get(True) == "":
-                        values.append(None)
+                        entryValues.append(None)
                     else:
                         logging.exception("ERROR: NAN", value.get(True))
-                        values.append(numberType(0))
-            try:
+                        entryValues.append(numberType(0))
+
+            setObjs = []
+            setValues = []
+            differ = False
+            for obj in editorSet.objs:
                 oldValue = PropertyHelper.getValues(definition, obj)
-                differ = False
+                oldComponents = getComponents(oldValue)
+                values = []
+                for i in range(n):
+                    if entryValues[i] is MIXED_VALUE_TEXT:
+                        values.append(oldComponents[i])
+                    else:
+                        values.append(entryValues[i])
                 if oldValue is not None:
                     for i in range(n):
-                        if oldValue[i] != values[i]:
+                        if oldComponents[i] != values[i]:
                             differ = True
                             break
                 elif values is not None and values != []:
                     differ = True
-                if differ:
-                    self.__addToKillRing(obj, definition, oldValue, values)
-            except Exception as e:
-                logging.exception(f"{definition.internalName} not supported by undo/redo yet")
-            allValuesSet = True
-            allValuesNone = True
-            for value in values:
-                if value is None:
-                    allValuesSet = False
-                if value is not None:
-                    allValuesNone = False
-            if allValuesNone:
-                values = None
-            elif allValuesSet:
-                values = tuple(values)
-            if allValuesNone or allValuesSet:
-                PropertyHelper.setValue(definition, obj, values)
-        self.__createPropertyHeader(definition.visiblename)
-        values = PropertyHelper.getValues(definition, obj)
-        if type(values) is int or type(values) is float:
-            values = [values] * n
-        if definition.nullable:
-            if values is None:
-                values = [""] * n
-        width = (DGH.getRealWidth(self.boxFrame) - 2*SCROLLBARWIDTH) / n
+
+                allValuesSet = True
+                allValuesNone = True
+                for value in values:
+                    if value is None or value == "":
+                        allValuesSet = False
+                    else:
+                        allValuesNone = False
+                if allValuesNone:
+                    values = None
+                elif allValuesSet:
+                    values = tuple(values)
+                if allValuesNone or allValuesSet:
+                    setObjs.append(obj)
+                    setValues.append(values)
+            self.__setValues(definition, setObjs, setValues, differ)
+
+        def bind():
+            allComponents = [
+                getComponents(value)
+                for value in self.__getAllValues(definition, editorSet)]
+            mixed = False
+            for i in range(n):
+                texts = set()
+                for components in allComponents:
+                    texts.add(str(PropertyHelper.getFormated(components[i])))
+                if len(texts) > 1:
+                    mixed = True
+                    self.__setEntryText(entryList[i], MIXED_VALUE_TEXT)
+                else:
+                    self.__setEntryText(entryList[i], texts.pop())
+            self.__setMixed(header, definition, mixed)
+
+        header = self.__createPropertyHeader(definition.visiblename, editorSet)
+        width = (DGH.getRealWidth(editorSet.boxFrame) - 2*SCROLLBARWIDTH) / n
         entryBox = DirectBoxSizer()
         for i in range(n):
-            value = PropertyHelper.getFormated(values[i])
-            entry = self.__createTextEntry(str(value), width, update, [obj])
+            entry = self.__createTextEntry("", width, update)
             entryList.append(entry)
             entryBox.addItem(entry)
-        self.boxFrame.addItem(entryBox, skipRefresh=True)
+        editorSet.boxFrame.addItem(entryBox, skipRefresh=True)
+        bind()
+        editorSet.binders.append(bind)
+
+    def __createNumberInput(self, definition, editorSet, numberType):
+        state = {"mixed": False}
 
-    def __createNumberInput(self, definition, obj, numberType):
-        def update(text, obj):
+        def update(text):
+            if state["mixed"] and text == MIXED_VALUE_TEXT:
+                return
             base.messenger.send("setDirtyFlag")
             value = numberType(0)
             try:
@@ -483,101 +804,116 @@ class PropertiesPanel(DirectObject):
                 else:
                     logging.exception("ERROR: NAN", value)
                     value = numberType(0)
-            try:
-                oldValue = PropertyHelper.getValues(definition, obj)
-                self.__addToKillRing(obj, definition, oldValue, value)
-            except Exception:
-                logging.exception(f"{definition.internalName} not supported by undo/redo yet")
-            PropertyHelper.setValue(definition, obj, value)
-        self.__createPropertyHeader(definition.visiblename)
-        valueA = PropertyHelper.getValues(definition, obj)
-        if valueA is None and not definition.nullable:
-            logging.error(f"Got None value for not nullable element {definition.internalName}")
-        if valueA is not None:
-            valueA = PropertyHelper.getFormated(valueA, numberType is int)
-        width = DGH.getRealWidth(self.boxFrame)
-        entry = self.__createTextEntry(str(valueA), width, update, [obj])
-        self.boxFrame.addItem(entry, skipRefresh=True)
-
-    def __createTextProperty(self, definition, obj):
-        def update(text, obj):
-            base.messenger.send("setDirtyFlag")
-            try:
-                oldValue = PropertyHelper.getValues(definition, obj)
-                self.__addToKillRing(obj, definition, oldValue, text)
-            except:
-                logging.exception(f"{definition.internalName} not supported by undo/redo yet")
+            self.__setValues(definition, editorSet.objs, [value] * len(editorSet.objs))
+
+        def getEntryValue(valueA):
+            if valueA is None and not definition.nullable:
+                logging.error(f"Got None value for not nullable element {definition.internalName}")
+            if valueA is not None:
+                valueA = PropertyHelper.getFormated(valueA, numberType is int)
+            return str(valueA)
+
+        def bind():
+            texts = [
+                getEntryValue(value)
+                for value in self.__getAllValues(definition, editorSet)]
+            state["mixed"] = self.__isMixed(texts)
+            self.__setEntryText(entry, MIXED_VALUE_TEXT if state["mixed"] else texts[0])
+            self.__setMixed(header, definition, state["mixed"])
+
+        header = self.__createPropertyHeader(definition.visiblename, editorSet)
+        width = DGH.getRealWidth(editorSet.boxFrame)
+        entry = self.__createTextEntry("", width, update)
+        editorSet.boxFrame.addItem(entry, skipRefresh=True)
+        bind()
+        editorSet.binders.append(bind)
+
+    def __createTextProperty(self, definition, editorSet):
+        state = {"mixed": False}
 
-            PropertyHelper.setValue(definition, obj, text)
-        self.__createPropertyHeader(definition.visiblename)
-        text = PropertyHelper.getValues(definition, obj)
-        width = DGH.getRealWidth(self.boxFrame)
-        entry = self.__createTextEntry(text, width, update, [obj])
-        self.boxFrame.addItem(entry, skipRefresh=True)
-
-    def __createBoolProperty(self, definition, obj):
+        def update(text):
+            if state["mixed"] and text == MIXED_VALUE_TEXT:
+                return
+            base.messenger.send("setDirtyFlag")
+            self.__setValues(definition, editorSet.objs, [text] * len(editorSet.objs))
+
+        def bind():
+            texts = self.__getAllValues(definition, editorSet)
+            state["mixed"] = self.__isMixed(texts)
+            text = MIXED_VALUE_TEXT if state["mixed"] else texts[0]
+            if text is None:
+                text = ""
+            self.__setEntryText(entry, text)
+            self.__setMixed(header, definition, state["mixed"])
+
+        header = self.__createPropertyHeader(definition.visiblename, editorSet)
+        width = DGH.getRealWidth(editorSet.boxFrame)
+        entry = self.__createTextEntry("", width, update)
+        editorSet.boxFrame.addItem(entry, skipRefresh=True)
+        bind()
+        editorSet.binders.append(bind)
+
+    def __createBoolProperty(self, definition, editorSet):
         def update(value):
             base.messenger.send("setDirtyFlag")
-            try:
-                oldValue = PropertyHelper.getValues(definition, obj)
-                self.__addToKillRing(obj, definition, oldValue, value)
-            except:
-                logging.exception(f"{definition.internalName} not supported by undo/redo yet")
-            PropertyHelper.setValue(definition, obj, value)
-        self.__createPropertyHeader(definition.visiblename)
-        valueA = PropertyHelper.getValues(definition, obj)
+            self.__setValues(definition, editorSet.objs, [value] * len(editorSet.objs))
+
+        def bind():
+            values = self.__getAllValues(definition, editorSet)
+            if btn["indicatorValue"] != values[0]:
+                btn["indicatorValue"] = values[0]
+                btn.setIndicatorValue()
+            self.__setMixed(header, definition, self.__isMixed(values))
+
+        header = self.__createPropertyHeader(definition.visiblename, editorSet)
         btn = DirectCheckButton(
-            indicatorValue=valueA,
+            indicatorValue=False,
             scale=24,
             frameSize=(-.5,.5,-.5,.5),
             text_align=TextNode.ALeft,
             command=update)
         btn.bind(DGG.MWDOWN, self.scroll, [self.scrollSpeedDown])
         btn.bind(DGG.MWUP, self.scroll, [self.scrollSpeedUp])
-        self.boxFrame.addItem(btn, skipRefresh=True)
-
-    def __createListProperty(self, definition, obj):
-        def update(text, obj, entries):
-            base.messenger.send("setDirtyFlag")
-            value = []
-
-            for entry in entries:
-                #if entry.get() != "":
-                value.append(entry.get())
-
-            try:
-                oldValue = PropertyHelper.getValues(definition, obj)
-                self.__addToKillRing(obj, definition, oldValue, value)
-            except Exception:
-                logging.exception(f"{definition.internalName} not supported by undo/redo yet")
-
-            PropertyHelper.setValue(definition, obj, value)
+        editorSet.boxFrame.addItem(btn, skipRefresh=True)
+        bind()
+        editorSet.binders.append(bind)
+
+    def __createEntriesBox(self, definition, editorSet, update, entryValues, width, header):
+        """Creates a box with one text entry per value and a button to add
+        further entries. Returns the function to rebind the entries to the
+        values of the currently bound objects."""
+        entries = []
 
-        def addEntry(text="", updateEntries=True, updateMainBox=True):
-            entry = self.__createTextEntry(text, width, update, [obj])
+        def addEntry(text="", updateMainBox=True):
+            entry = self.__createTextEntry(text, width, update, [entries])
             entriesBox.addItem(entry, skipRefresh=True)
             entries.append(entry)
 
-            if updateEntries:
-                for entry in entries:
-                    oldArgs = entry["extraArgs"]
-                    if len(oldArgs) > 1:
-                        oldArgs = oldArgs[:-1]
-                    entry["extraArgs"] = oldArgs + [entries]
-
             if updateMainBox:
                 entriesBox.refresh()
-                self.boxFrame.refresh(id(entriesBox))
-                self.resizeFrame()
-
-        self.__createPropertyHeader(definition.visiblename)
-        listItems = PropertyHelper.getValues(definition, obj)
-
-        # make sure we have a list
-        if listItems is None or isinstance(listItems, str):
-            listItems = [listItems]
+                self.updateSection(editorSet)
+                self.updateCanvasSize()
+
+        def bind():
+            # all entries show the values of the first object
+            allValues = [entryValues(obj) for obj in editorSet.objs]
+            self.__setMixed(header, definition, self.__isMixed(allValues))
+            listItems = allValues[0]
+            if len(listItems) != len(entries):
+                # the amount of entries differs between objects
+                editorSet.layoutChanged = True
+                for entry in entries:
+                    entry.destroy()
+                entries.clear()
+                entriesBox["items"] = []
+                for text in listItems:
+                    addEntry(text, False)
+                entriesBox.refresh()
+            else:
+                for i in range(len(listItems)):
+                    text = listItems[i]
+                    self.__setEntryText(entries[i], "" if text is None else text)
 
-        width = DGH.getRealWidth(self.boxFrame)
         entriesBox = DirectBoxSizer(
             orientation=DGG.VERTICAL,
             itemAlign=DirectBoxSizer.A_Left,
@@ -586,11 +922,9 @@ class PropertiesPanel(DirectObject):
             state=DGG.NORMAL)
         entriesBox.bind(DGG.MWDOWN, self.scroll, [self.scrollSpeedDown])
         entriesBox.bind(DGG.MWUP, self.scroll, [self.scrollSpeedUp])
-        self.boxFrame.addItem(entriesBox, skipRefresh=True)
-        entries = []
-        for i in range(len(listItems)):
-            text = listItems[i]
-            addEntry(text, i == len(listItems)-1, i == len(listItems)-1)
+        editorSet.boxFrame.addItem(entriesBox, skipRefresh=True)
+        bind()
+
         btn = DirectButton(
             text="Add entry",
             pad=(0.25,0.25),
@@ -599,101 +933,100 @@ class PropertiesPanel(DirectObject):
             )
         btn.bind(DGG.MWDOWN, self.scroll, [self.scrollSpeedDown])
         btn.bind(DGG.MWUP, self.scroll, [self.scrollSpeedUp])
-        self.boxFrame.addItem(btn, skipRefresh=True)
+        editorSet.boxFrame.addItem(btn, skipRefresh=True)
+        return bind
 
-    def __createTupleProperty(self, definition, obj):
-        def update(text, obj, entries):
+    def __createListProperty(self, definition, editorSet):
+        def update(text, entries):
             base.messenger.send("setDirtyFlag")
             value = []
 
             for entry in entries:
-                if entry.get() != "":
-                    value.append(entry.get())
+                #if entry.get() != "":
+                value.append(entry.get())
 
-            value = tuple(value)
+            # each object gets its own copy of the list
+            self.__setValues(
+                definition, editorSet.objs,
+                [list(value) for obj in editorSet.objs])
 
-            try:
-                oldValue = PropertyHelper.getValues(definition, obj)
-                self.__addToKillRing(obj, definition, oldValue, value)
-            except Exception:
-                logging.exception(f"{definition.internalName} not supported by undo/redo yet")
+        def entryValues(obj):
+            listItems = PropertyHelper.getValues(definition, obj)
 
-            PropertyHelper.setValue(definition, obj, value)
+            # make sure we have a list
+            if listItems is None or isinstance(listItems, str):
+                listItems = [listItems]
+            return listItems
 
-        def addEntry(text="", updateEntries=True, updateMainBox=True):
-            entry = self.__createTextEntry(text, width, update, [obj])
-            entriesBox.addItem(entry, skipRefresh=True)
-            entries.append(entry)
+        header = self.__createPropertyHeader(definition.visiblename, editorSet)
+        width = DGH.getRealWidth(editorSet.boxFrame)
+        editorSet.binders.append(
+            self.__createEntriesBox(
+                definition, editorSet, update, entryValues, width, header))
 
-            if updateEntries:
-                for entry in entries:
-                    oldArgs = entry["extraArgs"]
-                    if len(oldArgs) > 1:
-                        oldArgs = oldArgs[:-1]
-                    entry["extraArgs"] = oldArgs + [entries]
+    def __createTupleProperty(self, definition, editorSet):
+        def update(text, entries):
+            base.messenger.send("setDirtyFlag")
+            value = []
 
-            if updateMainBox:
-                entriesBox.refresh()
-                self.boxFrame.refresh()
-                self.resizeFrame()
+            for entry in entries:
+                if entry.get() != "":
+                    value.append(entry.get())
 
-        self.__createPropertyHeader(definition.visiblename)
-        listItems = PropertyHelper.getValues(definition, obj)
-        width = DGH.getRealWidth(self.boxFrame) - SCROLLBARWIDTH
-        entriesBox = DirectBoxSizer(
-            orientation=DGG.VERTICAL,
-            itemAlign=DirectBoxSizer.A_Left,
-            frameColor=VBase4(0,0,0,0),
-            suppressMouse=True,
-            state=DGG.NORMAL)
-        entriesBox.bind(DGG.MWDOWN, self.scroll, [self.scrollSpeedDown])
-        entriesBox.bind(DGG.MWUP, self.scroll, [self.scrollSpeedUp])
-        self.boxFrame.addItem(entriesBox, skipRefresh=True)
-        entries = []
-        for i in range(len(listItems)):
-            text = listItems[i]
-            addEntry(text, i==len(listItems)-1, i==len(listItems)-1)
-        btn = DirectButton(
-            text="Add entry",
-            pad=(0.25,0.25),
-            scale=12,
-            command=addEntry
-            )
-        btn.bind(DGG.MWDOWN, self.scroll, [self.scrollSpeedDown])
-        btn.bind(DGG.MWUP, self.scroll, [self.scrollSpeedUp])
-        self.boxFrame.addItem(btn, skipRefresh=True)
+            value = tuple(value)
+
+            self.__setValues(
+                definition, editorSet.objs, [value] * len(editorSet.objs))
 
-    def __createPathProperty(self, definition, obj):
+        def entryValues(obj):
+            return PropertyHelper.getValues(definition, obj)
+
+        header = self.__createPropertyHeader(definition.visiblename, editorSet)
+        width = DGH.getRealWidth(editorSet.boxFrame) - SCROLLBARWIDTH
+        editorSet.binders.append(
+            self.__createEntriesBox(
+                definition, editorSet, update, entryValues, width, header))
+
+    def __createPathProperty(self, definition, editorSet):
+        state = {"mixed": False}
 
         def update(text):
-            value = text
-            if text == "" and definition.nullable:
-                value = None
-            elif definition.loaderFunc is not None:
+            if state["mixed"] and text == MIXED_VALUE_TEXT:
+                return
+            base.messenger.send("setDirtyFlag")
+            for obj in editorSet.objs:
+                value = text
+                if text == "" and definition.nullable:
+                    value = None
+                elif definition.loaderFunc is not None:
+                    try:
+                        if type(definition.loaderFunc) is str:
+                            value = eval(definition.loaderFunc)
+                        else:
+                            value = definition.loaderFunc(value)
+                    except Exception:
+                        logging.exception("Couldn't load path with loader function")
+                        value = text
                 try:
-                    if type(definition.loaderFunc) is str:
-                        value = eval(definition.loaderFunc)
-                    else:
-                        value = definition.loaderFunc(value)
+                    PropertyHelper.setValue(definition, obj, value, text)
                 except Exception:
-                    logging.exception("Couldn't load path with loader function")
-                    value = text
-            base.messenger.send("setDirtyFlag")
-            try:
-                PropertyHelper.setValue(definition, obj, value, text)
-            except Exception:
-                logging.exception("Couldn't load font: {}".format(text))
-                updateElement[updateAttribute] = None
-
-        def setPath(path):
-            update(path)
+                    logging.exception("Couldn't load font: {}".format(text))
 
+        def bind():
             # make sure to take the actual value to write it to the textbox in
             # case something hapened while updating the value
-            v = PropertyHelper.getValues(definition, obj)
-            if v is None:
-                v = ""
-            entry.set(v)
+            paths = []
+            for v in self.__getAllValues(definition, editorSet):
+                if type(v) is not str:
+                    v = ""
+                paths.append(v)
+            state["mixed"] = self.__isMixed(paths)
+            self.__setEntryText(entry, MIXED_VALUE_TEXT if state["mixed"] else paths[0])
+            self.__setMixed(header, definition, state["mixed"])
+
+        def setPath(path):
+            update(path)
+            bind()
 
         def selectPath(confirm):
             if confirm:
@@ -708,13 +1041,10 @@ class PropertiesPanel(DirectObject):
                 "",
                 tooltip=self.tooltip)
             self.browser.show()
-        self.__createPropertyHeader(definition.visiblename)
-        path = PropertyHelper.getValues(definition, obj)
-        if type(path) is not str:
-            path = ""
-        width = DGH.getRealWidth(self.boxFrame) - SCROLLBARWIDTH
-        entry = self.__createTextEntry(path, width, update)
-        self.boxFrame.addItem(entry, skipRefresh=True)
+        header = self.__createPropertyHeader(definition.visiblename, editorSet)
+        width = DGH.getRealWidth(editorSet.boxFrame) - SCROLLBARWIDTH
+        entry = self.__createTextEntry("", width, update)
+        editorSet.boxFrame.addItem(entry, skipRefresh=True)
 
         btn = DirectButton(
             text="Browse",
@@ -725,49 +1055,66 @@ class PropertiesPanel(DirectObject):
             )
         btn.bind(DGG.MWDOWN, self.scroll, [self.scrollSpeedDown])
         btn.bind(DGG.MWUP, self.scroll, [self.scrollSpeedUp])
-        self.boxFrame.addItem(btn, skipRefresh=True)
+        editorSet.boxFrame.addItem(btn, skipRefresh=True)
+        bind()
+        editorSet.binders.append(bind)
 
-    def __createOptionMenuProperty(self, definition, obj):
+    def __createOptionMenuProperty(self, definition, editorSet):
         def update(selection):
-            oldValue = PropertyHelper.getValues(definition, obj)
             value = definition.valueOptions[selection]
-            # Undo/Redo setup
-            try:
-                if oldValue != value:
-                    self.__addToKillRing(obj, definition, oldValue, value)
-            except Exception as e:
-                logging.exception(f"{definition.internalName} not supported by undo/redo yet")
-
-            # actually set the value on the element
-            PropertyHelper.setValue(definition, obj, value)
-
-        self.__createPropertyHeader(definition.visiblename)
+            # only set the value on elements which don't have it already, so
+            # selecting the current value again doesn't add an undo step
+            objs = [
+                obj for obj, oldValue in zip(
+                    editorSet.objs, self.__getAllValues(definition, editorSet))
+                if oldValue != value]
+            if len(objs) == 0:
+                return
+            # actually set the value on the elements
+            self.__setValues(definition, objs, [value] * len(objs))
+
+        def getSelectedElement(value):
+            selectedElement = list(definition.valueOptions.keys())[0]
+            for k, v in definition.valueOptions.items():
+                if v == value:
+                    selectedElement = k
+                    break
+            return selectedElement
+
+        def bind():
+            values = self.__getAllValues(definition, editorSet)
+            selectedElement = getSelectedElement(values[0])
+            if menu.get() != selectedElement:
+                menu.set(selectedElement, fCommand=0)
+            self.__setMixed(header, definition, self.__isMixed(values))
+
+        header = self.__createPropertyHeader(definition.visiblename, editorSet)
         if definition.valueOptions is None:
             return
-        value = PropertyHelper.getValues(definition, obj)
-        selectedElement = list(definition.valueOptions.keys())[0]
-        for k, v in definition.valueOptions.items():
-            if v == value:
-                selectedElement = k
-                break
         menu = DirectOptionMenu(
             items=list(definition.valueOptions.keys()),
             scale=12,
             popupMenuLocation=DGG.BELOW,
-            initialitem=selectedElement,
+            initialitem=0,
             command=update)
         menu.bind(DGG.MWDOWN, self.scroll, [self.scrollSpeedDown])
         menu.bind(DGG.MWUP, self.scroll, [self.scrollSpeedUp])
-        self.boxFrame.addItem(menu, skipRefresh=True)
+        editorSet.boxFrame.addItem(menu, skipRefresh=True)
+        bind()
+        editorSet.binders.append(bind)
+
+    def __createCustomCommand(self, definition, editorSet):
+        def runCommand():
+            for obj in editorSet.objs:
+                getattr(obj, definition.valueOptions)()
 
-    def __createCustomCommand(self, definition, obj):
-        self.__createPropertyHeader(definition.visiblename)
+        self.__createPropertyHeader(definition.visiblename, editorSet)
         btn = DirectButton(
             text="Run Command",
             pad=(0.25,0.25),
             scale=12,
-            command=getattr(obj, definition.valueOptions)
+            command=runCommand
             )
         btn.bind(DGG.MWDOWN, self.scroll, [self.scrollSpeedDown])
         btn.bind(DGG.MWUP, self.scroll, [self.scrollSpeedUp])
-        self.boxFrame.addItem(btn, skipRefresh=True)
+        editorSet.boxFrame.addItem(btn, skipRefresh=True)
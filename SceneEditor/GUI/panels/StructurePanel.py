@@ -18,6 +18,8 @@ from DirectGuiExtension import DirectGuiHelper as DGH
 from DirectGuiExtension.DirectBoxSizer import DirectBoxSizer
 from DirectGuiExtension.DirectAutoSizer import DirectAutoSizer
 
+from SceneEditor.tools.Instrumentation import timed
+
 class StructurePanel():
     def __init__(self, parent):
         height = DGH.getRealHeight(parent)
@@ -79,7 +81,7 @@ class StructurePanel():
         self.structureFrame.bind(DGG.MWUP, self.scroll, [-0.01])
         self.maxWidth = parent["frameSize"][1]-20
 
-        self.skipped_nodes = ["DirectGrid", "selection_highlight_marker", "show_collisions", "Pivot Point"]
+        self.skipped_nodes = ["DirectGrid", "selection_highlight_marker", "show_collisions", "Pivot Point", "proxy_bounds"]
 
     def scroll(self, scrollStep, event):
         self.structureFrame.verticalScroll.scrollStep(scrollStep)
@@ -106,6 +108,7 @@ class StructurePanel():
 
             self.recalcScrollSize()
 
+    @timed("Panels:Structure")
     def refreshStructureTree(self, objects, selected_objects):
         self.objects = objects
         self.selected_objects = selected_objects
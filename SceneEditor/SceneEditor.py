@@ -1,6 +1,7 @@
 import sys
 import os
 import logging
+from datetime import datetime
 from importlib.machinery import SourceFileLoader
 
 from panda3d.core import (
@@ -10,18 +11,27 @@ from panda3d.core import (
     ConfigVariableBool,
     ConfigVariableString,
     AntialiasAttrib,
-    Filename
+    Filename,
+    GraphicsWindow
     )
 
 from direct.showbase.DirectObject import DirectObject
 
 from SceneEditor.core.CameraController import CameraController
+from SceneEditor.core.IdleController import IdleController
 from SceneEditor.core.Core import Core
 from SceneEditor.export.ExportPy import ExporterPy
 from SceneEditor.export.ExportProject import ExporterProject
 from SceneEditor.export.ExportBam import ExporterBam
+from SceneEditor.export.ExportBamCells import ExporterBamCells
+from SceneEditor.export.ExportCache import ExportCache
 from SceneEditor.loader.LoadProject import ProjectLoader
 from SceneEditor.GUI.MainView import MainView
+from SceneEditor.GUI.PerformanceHUD import PerformanceHUD
+from SceneEditor.tools import Instrumentation
+from SceneEditor.tools.InputReplay import InputRecorder
+from SceneEditor.tools.Profiler import SessionProfiler
+from SceneEditor.tools.MemoryReport import MemoryReport
 
 from direct.gui import DirectGuiGlobals as DGG
 from direct.gui.DirectFrame import DirectFrame
@@ -54,12 +64,27 @@ class SceneEditor(DirectObject):
         # setup core
         self.core = Core()
 
+        # exported objects of this session reused by later BAM exports
+        self.export_cache = ExportCache()
+
         # setup 3D scene camera movements
         self.camcontroller = CameraController()
 
+        # lower the frame rate while nobody works with the editor
+        self.idle_controller = IdleController()
+
         # setup Editor UI
         self.setup_gui()
 
+        # show the timings of the instrumented editor functions
+        self.performance_hud = None
+        if Instrumentation.ENABLED:
+            self.performance_hud = PerformanceHUD()
+            self.performance_hud.show()
+
+        # profiles the editor while toggled on by the user
+        self.profiler = SessionProfiler()
+
         # enable engines collision system
         base.cTrav = CollisionTraverser("base traverser")
 
@@ -154,6 +179,9 @@ class SceneEditor(DirectObject):
             # SCENE GRAPH STRUCTURE
             "page_up": [self.core.move_element_in_structure, [1]],
             "page_down": [self.core.move_element_in_structure, [-1]],
+
+            # PROFILING
+            "shift-control-p": [self.profiler.toggle],
         }
 
         # saving/loading path
@@ -161,9 +189,20 @@ class SceneEditor(DirectObject):
         self.lastFileNameWOExtension = "scene"
 
         self.enable_events()
+        self.idle_controller.enable()
+
+        # record the input to replay it for latency measurements
+        self.input_recorder = None
+        self.input_recording_path = ConfigVariableString(
+            "scene-editor-input-recording", "").getValue()
+        if self.input_recording_path != "":
+            self.input_recorder = InputRecorder(self)
+            self.input_recorder.start()
 
         sys.excepthook = self.excHandler
-        base.win.setCloseRequestEvent("SceneEditor_quit_app")
+        # offscreen buffers as used for headless runs have no close request
+        if isinstance(base.win, GraphicsWindow):
+            base.win.setCloseRequestEvent("SceneEditor_quit_app")
 
         # setup custom exporters
         self.custom_exporters = {}
@@ -182,6 +221,7 @@ class SceneEditor(DirectObject):
         self.mainView.update_3d_display_region()
 
         self.camcontroller.enable_cam_controller()
+        self.idle_controller.enable()
 
     def disable_editor(self):
         self.ignore_keyboard_and_mouse_events()
@@ -189,6 +229,7 @@ class SceneEditor(DirectObject):
         self.disable_events()
 
         self.camcontroller.disable_cam_controller()
+        self.idle_controller.disable()
 
         # reset the display region
         dr = base.cam.node().get_display_region(0)
@@ -243,11 +284,18 @@ class SceneEditor(DirectObject):
         self.accept("saveProject", self.save)
         self.accept("exportProject_python", self.export_python)
         self.accept("exportProject_bam", self.export_bam)
+        self.accept("exportProject_bam_cells", self.export_bam_cells)
         self.accept("custom_export", self.custom_export)
         self.accept("loadModel", self.load_model_browser)
         self.accept("loadPanda", self.core.load_model, ["models/panda"])
         self.accept("quit_app", self.quit_app)
         self.accept("toggleGrid", self.core.toggle_grid)
+        self.accept("toggleHelpers", self.core.toggle_helpers)
+        self.accept("toggleProfiler", self.profiler.toggle)
+        self.accept("writeMemoryReport", self.write_memory_report)
+        self.accept("purgeRemovedObjects", self.core.purge_removed_objects)
+        self.accept("logAssetCacheStats", self.core.asset_cache.log_stats)
+        self.accept("SceneEditor_lens_changed", self.core.apply_view_distance)
         self.accept("zoom-in", self.camcontroller.zoom, [True])
         self.accept("zoom-out", self.camcontroller.zoom, [False])
         self.accept("zoom-reset", self.camcontroller.reset_zoom)
@@ -270,6 +318,7 @@ class SceneEditor(DirectObject):
 
         self.accept("update_structure", self.update_structure_panel)
         self.accept("update_properties", self.update_properties_panel)
+        self.accept("update_property_values", self.mainView.propertiesPanel.requestValueUpdate)
         self.accept("collapse_structure", self.collapse_structure)
 
         # UI ELEMENT EDITING
@@ -279,6 +328,7 @@ class SceneEditor(DirectObject):
         self.accept("moveElementInStructure", self.core.move_element_in_structure)
 
         self.accept("3d_display_region_changed", self.core.update_selection_mouse_watcher)
+        self.accept("window-event", self.core.update_axis_position)
 
         self.accept("unregisterKeyboardEvents", self.ignore_keyboard_events)
         self.accept("reregisterKeyboardEvents", self.register_keyboard_events)
@@ -476,6 +526,8 @@ class SceneEditor(DirectObject):
         self.browser = None
 
     def update_structure_panel(self):
+        # removed objects don't need their exported copies anymore
+        self.export_cache.prune_removed(self.core.scene_model_parent)
         self.mainView.structurePanel.refreshStructureTree(
             self.core.scene_objects,
             self.core.selected_objects)
@@ -485,6 +537,10 @@ class SceneEditor(DirectObject):
 
 
     def update_properties_panel(self):
+        if self.mainView.propertiesPanel.isShowing(self.core.selected_objects):
+            # the selection is the same, only update the changed values
+            self.mainView.propertiesPanel.requestValueUpdate()
+            return
         self.mainView.propertiesPanel.clear()
         self.mainView.propertiesPanel.setupProperties(self.core.selected_objects)
 
@@ -521,6 +577,7 @@ class SceneEditor(DirectObject):
     def __newProject(self, selection):
         if selection == 1:
             self.core.new_project()
+            self.export_cache.clear()
             base.messenger.send("clearDirtyFlag")
         if self.dlg_new_project is not None:
             self.dlg_new_project.destroy()
@@ -530,6 +587,7 @@ class SceneEditor(DirectObject):
 
     def setLastPath(self, path):
         self.lastDirPath = os.path.dirname(path)
+        self.core.asset_cache.set_project_path(path)
         fn = os.path.splitext(os.path.basename(path))[0]
         if fn != "":
             self.lastFileNameWOExtension = os.path.splitext(os.path.basename(path))[0]
@@ -556,7 +614,17 @@ class SceneEditor(DirectObject):
             self.lastFileNameWOExtension + ".bam",
             self.core.scene_model_parent,
             self.core.scene_objects,
-            self.tt)
+            self.tt,
+            export_cache=self.export_cache)
+
+    def export_bam_cells(self):
+        ExporterBamCells(
+            self.lastDirPath,
+            self.lastFileNameWOExtension + ".bam",
+            self.core.scene_model_parent,
+            self.core.scene_objects,
+            self.tt,
+            export_cache=self.export_cache)
 
     def add_custom_exporters(self):
         # get the custom exporter modules path
@@ -625,8 +693,28 @@ class SceneEditor(DirectObject):
         print("Try to save project after unhandled exception. Please restart the app to automatically load the exception save file!")
         self.do_exception_save()
 
+    def write_memory_report(self):
+        report_path = os.path.expanduser(ConfigVariableString(
+            "scene-editor-report-path",
+            os.path.join("~", ".SceneEditor", "reports")).getValue())
+        if not os.path.exists(report_path):
+            os.makedirs(report_path)
+        file_name = datetime.now().strftime("memory_%Y-%m-%d_%H-%M-%S.json")
+        MemoryReport(self.core).write(os.path.join(report_path, file_name))
+
+    def write_input_recording(self):
+        if self.input_recorder is None:
+            return
+        self.input_recorder.stop()
+        path = os.path.expanduser(self.input_recording_path)
+        self.input_recorder.write(path)
+        logging.info(f"Input recording written to {path}")
+
     def __quit(self, selection):
         if selection == 1:
+            self.write_input_recording()
+            self.profiler.stop()
+            self.core.asset_cache.flush()
             self.userExit()
         else:
             self.dlg_quit.destroy()
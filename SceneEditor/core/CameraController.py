@@ -1,6 +1,8 @@
 import math
 from panda3d.core import Point2, Vec3, PerspectiveLens, OrthographicLens
 
+from SceneEditor.tools.Instrumentation import timer
+
 class CameraController:
     def __init__(self):
         #
@@ -33,6 +35,8 @@ class CameraController:
         # this variable will be used to determine the distance from the player to
         # the camera
         self.camDistance = 15.0
+        # the distance the camera has been placed at, None forces an update
+        self.appliedCamDistance = None
         # min and maximal distance between player and camera
         self.maxCamDistance = 1000.0
         self.minCamDistance = 1.5
@@ -77,6 +81,7 @@ class CameraController:
         base.cam.node().set_lens(lens)
         base.camLens = lens
         self.is_orthographic = not self.is_orthographic
+        base.messenger.send("SceneEditor_lens_changed")
 
     def setPivot(self, h, p):
         interval = self.pivot.hprInterval(0.5, Vec3(h, p, 0))
@@ -184,38 +189,45 @@ class CameraController:
         self.camDistance = 75.0
 
     def updateCam(self, task):
-        # variables to store the mouses current x and y position
-        x = 0.0
-        y = 0.0
-        if base.mouseWatcherNode.hasMouse():
-            # get the mouse position
-            x = base.mouseWatcherNode.getMouseX()
-            y = base.mouseWatcherNode.getMouseY()
+        # only do work if the camera actually has to be moved, the camera is
+        # parented to the pivot so it follows any pivot changes by itself
         if base.mouseWatcherNode.hasMouse() \
         and self.mousePos is not None \
         and self.startCameraMovement:
-            # Move the camera if the left mouse key is pressed and the mouse moved
-            mouseMoveX = (self.mousePos.getX() - x) * (self.mouseSpeed + globalClock.getDt())
-            mouseMoveY = (self.mousePos.getY() - y) * (self.mouseSpeed + globalClock.getDt())
-            self.mousePos = Point2(x, y)
-
-            if not self.movePivot:
-                # Rotate the pivot point
-                preP = self.pivot.getP()
-                self.pivot.setP(0)
-                self.pivot.setH(self.pivot, mouseMoveX)
-                self.pivot.setP(preP)
-                self.pivot.setP(self.pivot, mouseMoveY)
-            else:
-                # Move the pivot point
-                self.pivot.setX(self.pivot, -mouseMoveX)
-                self.pivot.setZ(self.pivot, mouseMoveY)
+            # get the mouse position
+            x = base.mouseWatcherNode.getMouseX()
+            y = base.mouseWatcherNode.getMouseY()
+            if x != self.mousePos.getX() or y != self.mousePos.getY():
+                with timer("Camera:Move"):
+                    self.moveCam(x, y)
+                base.messenger.send("SceneEditor_request_render")
 
-        # set the cameras zoom
-        camera.setY(self.camDistance)
+        if self.camDistance != self.appliedCamDistance:
+            # set the cameras zoom
+            camera.setY(self.camDistance)
 
-        # always look at the pivot point
-        camera.lookAt(self.pivot)
+            # always look at the pivot point
+            camera.lookAt(self.pivot)
+            self.appliedCamDistance = self.camDistance
+            base.messenger.send("SceneEditor_request_render")
 
         # continue the task until it got manually stopped
         return task.cont
+
+    def moveCam(self, x, y):
+        # Move the camera if the left mouse key is pressed and the mouse moved
+        mouseMoveX = (self.mousePos.getX() - x) * (self.mouseSpeed + globalClock.getDt())
+        mouseMoveY = (self.mousePos.getY() - y) * (self.mouseSpeed + globalClock.getDt())
+        self.mousePos = Point2(x, y)
+
+        if not self.movePivot:
+            # Rotate the pivot point
+            preP = self.pivot.getP()
+            self.pivot.setP(0)
+            self.pivot.setH(self.pivot, mouseMoveX)
+            self.pivot.setP(preP)
+            self.pivot.setP(self.pivot, mouseMoveY)
+        else:
+            # Move the pivot point
+            self.pivot.setX(self.pivot, -mouseMoveX)
+            self.pivot.setZ(self.pivot, mouseMoveY)
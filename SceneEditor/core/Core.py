@@ -3,10 +3,20 @@ from uuid import uuid4
 
 #from direct.directtools.DirectGrid import DirectGrid
 from SceneEditor.directtoolsOverrides.DirectGrid import DirectGrid
+from SceneEditor.directtoolsOverrides.ShaderGrid import ShaderGrid
 
 from SceneEditor.core.TransformationHandler import TransformationHandler
 from SceneEditor.core.SelectionHandler import SelectionHandler
 from SceneEditor.core.CoreKillRingHandler import CoreKillRingHandler
+from SceneEditor.core.ViewportHandler import ViewportHandler
+from SceneEditor.core.LightHandler import LightHandler
+from SceneEditor.core.ShaderCache import ShaderCache
+from SceneEditor.loader.AssetCache import AssetCache
+from SceneEditor.tools.EditedProperties import (
+    set_edited,
+    remove_edited,
+    is_edited,
+    copy_edited_properties)
 
 from panda3d.physics import ActorNode
 
@@ -17,9 +27,7 @@ from panda3d.core import (
     Point3,
     NodePath,
     DrawMask,
-
-    # Shaders
-    Shader,
+    ConfigVariableString,
 
     # Collision solids
     CollisionNode,
@@ -47,7 +55,7 @@ from panda3d.core import (
     GeomNode,
     )
 
-class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
+class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler, ViewportHandler, LightHandler):
     def __init__(self):
         self.shading_mask = DrawMask(0x0000ffff)
 
@@ -62,11 +70,20 @@ class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
 
         self.dirty = False
 
-        self.grid = DirectGrid(gridSize=1000.0, gridSpacing=1, parent=render)
-        # usual scene editor setup
-        self.prepare_for_editor(self.grid)
-        self.grid.flatten_strong()
-        self.grid.set_shader_off(1)
+        self.shader_cache = ShaderCache()
+        self.asset_cache = AssetCache()
+
+        grid_type = ConfigVariableString("scene-editor-grid", "shader").getValue()
+        if grid_type == "shader" and ShaderGrid.isSupported():
+            self.grid = ShaderGrid(gridSize=1000.0, gridSpacing=1, parent=render)
+            # usual scene editor setup
+            self.prepare_for_editor(self.grid)
+        else:
+            self.grid = DirectGrid(gridSize=1000.0, gridSpacing=1, parent=render)
+            # usual scene editor setup
+            self.prepare_for_editor(self.grid)
+            self.grid.flatten_strong()
+            self.grid.set_shader_off(1)
 
         self.scene_root = render.attach_new_node("scene_root")
         self.scene_model_parent = self.scene_root.attach_new_node("scene_model_parent")
@@ -77,6 +94,8 @@ class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
 
         TransformationHandler.__init__(self)
         SelectionHandler.__init__(self)
+        ViewportHandler.__init__(self)
+        LightHandler.__init__(self)
 
     def disable(self):
         self.scene_root.hide()
@@ -92,6 +111,7 @@ class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
     # PROJECT HANDLING
     #
     def new_project(self):
+        self.asset_cache.clear_session()
         self.limiting_x = False
         self.limiting_y = False
         self.limiting_z = False
@@ -103,6 +123,9 @@ class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
         self.scene_model_parent.clearLight()
 
         self.scene_objects = []
+        # the shaders stay cached, only the objects using them are gone
+        for users in self.shader_cache.users.values():
+            users.clear()
         self.limit_line.reset()
         self.limit_line_np.stash()
         base.messenger.send("update_structure")
@@ -125,18 +148,25 @@ class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
         self.axis.set_scale(0.02)
         self.axis.reparent_to(aspect2d)
 
-        ws = base.win.get_size()
-
         self.axis_z = 0.55
+        self.update_axis_position()
+
+        # the camera rotation the axis has last been updated for
+        self.axis_cam_quat = None
 
         base.task_mgr.add(self.axis_updater_task, "axis_updater_task")
 
     def axis_updater_task(self, task):
-        self.axis.set_hpr(self.compas_node.get_hpr(base.cam))
+        cam_quat = base.cam.get_quat(render)
+        if cam_quat != self.axis_cam_quat:
+            self.axis.set_hpr(self.compas_node.get_hpr(base.cam))
+            self.axis_cam_quat = cam_quat
+        return task.cont
 
+    def update_axis_position(self, window=None):
+        # this only needs to be called if the windows size changed
         ws = base.win.get_size()
         self.axis.set_pos((ws.x / ws.y) - 0.3, 0, self.axis_z)
-        return task.cont
 
     def toggle_grid(self):
         if self.grid.is_hidden():
@@ -148,7 +178,7 @@ class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
     # SCENE GRAPH HANDLING
     #
     def load_model(self, path):
-        model = loader.loadModel(path)
+        model = self.asset_cache.load_model(path)
         model.set_tag("filepath", str(path))
         model.set_tag("object_type", "model")
         model.set_tag("scene_object_id", str(uuid4()))
@@ -165,7 +195,7 @@ class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
         return model
 
     def add_empty(self):
-        model = loader.loadModel("models/misc/xyzAxis")
+        model = self.load_helper_model("empty")
         model.set_tag("object_type", "empty")
         model.set_tag("scene_object_id", str(uuid4()))
         model.reparent_to(self.scene_model_parent)
@@ -173,6 +203,7 @@ class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
 
         # usual scene editor setup
         self.prepare_for_editor(model)
+        self.prepare_helper(model, "empty")
 
         base.messenger.send("addToKillRing",
             [model, "add", "empty", None, None])
@@ -295,6 +326,7 @@ class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
 
         # usual scene editor setup
         self.prepare_for_editor(col_np)
+        self.prepare_helper(col_np, "collision")
 
         self.scene_objects.append(col_np)
 
@@ -357,11 +389,11 @@ class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
             light_name = f"{light_type}_{i}"
 
         if light_type == "PointLight":
-            light_model_np = loader.loadModel("models/misc/Pointlight")
+            light_model_np = self.load_helper_model(light_type)
             light = PointLight('Point Light')
 
         elif light_type == "DirectionalLight":
-            light_model_np = loader.loadModel("models/misc/Dirlight")
+            light_model_np = self.load_helper_model(light_type)
             light = DirectionalLight('Directional Light')
 
             light.camera_mask = self.shading_mask
@@ -374,7 +406,7 @@ class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
             light = AmbientLight('Ambient Light')
 
         elif light_type == "Spotlight":
-            light_model_np = loader.loadModel("models/misc/Spotlight")
+            light_model_np = self.load_helper_model(light_type)
             light = Spotlight('Spotlight')
 
             lens = PerspectiveLens()
@@ -398,6 +430,7 @@ class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
 
         # usual scene editor setup
         self.prepare_for_editor(light_model_np)
+        self.prepare_helper(light_model_np, "light")
 
         self.scene_objects.append(light_model_np)
 
@@ -408,7 +441,7 @@ class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
         return light_model_np
 
     def add_camera(self, cam_type, cam_info):
-        model = loader.loadModel("models/misc/camera")
+        model = self.load_helper_model("camera")
         model.set_tag("object_type", "camera")
         model.set_tag("scene_object_id", str(uuid4()))
         model.set_tag("camera_type", cam_type)
@@ -438,6 +471,7 @@ class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
 
         # usual scene editor setup
         self.prepare_for_editor(model)
+        self.prepare_helper(model, "camera")
 
         base.messenger.send("addToKillRing",
             [model, "add", "camera", None, None])
@@ -463,18 +497,7 @@ class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
         base.messenger.send("update_structure")
 
     def add_shader(self, shader_details):
-        for obj in self.selected_objects:
-            shader = Shader.load(
-                shader_details.shader_language,
-                vertex=shader_details.vertex_path,
-                fragment=shader_details.fragment_path,
-                geometry=shader_details.geometry_path,
-                tess_control=shader_details.tessellation_ctrl_path,
-                tess_evaluation=shader_details.tessellation_eval_path)
-
-            for name, value in shader_details.input_dict.items():
-                obj.set_shader_input(name, value)
-            obj.setShader(shader)
+        self.shader_cache.request(shader_details, self.selected_objects)
 
     def prepare_for_editor(self, nodepath, cast_shadow=False, disable_lighting=True):
         if not cast_shadow:
@@ -489,32 +512,13 @@ class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
     # OBJECT TAG HANDLING
     #
     def set_edited_tag(self, obj, tag):
-        tag_string = ""
-        if obj.has_tag("edited_properties"):
-            tag_string = obj.get_tag("edited_properties")
-
-        tag_values = tag_string.split(",")
-        if tag not in tag_values:
-            tag_values.append(tag)
-            obj.set_tag("edited_properties", ",".join(tag_values))
+        set_edited(obj, tag)
 
     def remove_edited_tag(self, obj, tag):
-        tag_string = ""
-        if obj.has_tag("edited_properties"):
-            tag_string = obj.get_tag("edited_properties")
-
-        tag_values = tag_string.split(",")
-        if tag not in tag_values:
-            tag_values.remove(tag)
-            obj.set_tag("edited_properties", tag_values)
+        remove_edited(obj, tag)
 
     def is_edited_property(self, obj, tag):
-        tag_string = ""
-        if obj.has_tag("edited_properties"):
-            tag_string = obj.get_tag("edited_properties")
-
-        tag_values = tag_string.split(",")
-        return tag in tag_values
+        return is_edited(obj, tag)
 
     #
     # COLLISION HANDLING
@@ -575,11 +579,10 @@ class Core(TransformationHandler, SelectionHandler, CoreKillRingHandler):
 
             for obj in self.copied_objects:
                 new_obj = obj.copy_to(parent)
+                # copying duplicates the shared helper models
+                self.share_helper_model(new_obj)
                 new_obj.set_tag("scene_object_id", str(uuid4()))
-                if obj.has_tag("edited_properties"):
-                    new_obj.set_tag(
-                        "edited_properties",
-                        obj.get_tag("edited_properties"))
+                copy_edited_properties(obj, new_obj)
                 if obj.get_tag("object_type") == "collision":
                     solid_type = obj.get_tag("collision_solid_type")
                     src_solid = obj.node().get_solid(0)
@@ -1,9 +1,14 @@
 import logging
+
+from panda3d.core import ConfigVariableInt, NodePath
+
 from SceneEditor.core.KillRing import KillRing
 
 class CoreKillRingHandler:
     def __init__(self):
-        self.killRing = KillRing()
+        # number of steps that can be undone, 0 keeps the whole history
+        undo_limit = ConfigVariableInt("scene-editor-undo-limit", 0).getValue()
+        self.killRing = KillRing(undo_limit)
 
     #
     # KILL RING HANDLING
@@ -13,7 +18,10 @@ class CoreKillRingHandler:
             logging.debug(f"action={action}, type={objectType} was not added to killring, reason: old={oldValue} equals new={newValue}")
             return
         logging.debug(f"Add to killring action={action}, type={objectType}, old={oldValue}, new={newValue}")
-        self.killRing.push(obj, action, objectType, oldValue, newValue)
+        evicted = self.killRing.push(obj, action, objectType, oldValue, newValue)
+        if len(evicted) > 0:
+            # removed objects of the dropped steps can't be restored anymore
+            self.purge_removed_objects(self.get_node_paths(evicted))
 
     def undo(self):
         # undo this action
@@ -23,15 +31,16 @@ class CoreKillRingHandler:
             return
 
         if workOn.action == "set":
-            if workOn.objectType == "pos":
-                logging.debug(f"undo Position to {workOn.oldValue}")
-                workOn.editObject.set_pos(workOn.oldValue)
-            elif workOn.objectType == "hpr":
-                logging.debug(f"undo Rotation to {workOn.oldValue}")
-                workOn.editObject.set_hpr(workOn.oldValue)
-            elif workOn.objectType == "scale":
-                logging.debug(f"undo Scale to {workOn.oldValue}")
-                workOn.editObject.set_scale(workOn.oldValue)
+            logging.debug(f"undo {workOn.objectType} to {workOn.oldValue}")
+            self.set_kill_ring_value(
+                workOn.editObject, workOn.objectType, workOn.oldValue)
+
+        elif workOn.action == "set_batch":
+            # a value which has been set on multiple objects at once
+            logging.debug(f"undo {workOn.objectType} of {len(workOn.editObject)} objects")
+            for obj, value in zip(workOn.editObject, workOn.oldValue):
+                self.set_kill_ring_value(obj, workOn.objectType, value)
+
         elif workOn.action == "add":
             logging.debug(f"undo remove added element {workOn.editObject}")
             self.remove([workOn.editObject], False)
@@ -56,6 +65,7 @@ class CoreKillRingHandler:
         if len(self.selected_objects):
             base.messenger.send("update_selection_highlight_marker")
 
+        base.messenger.send("update_property_values")
         base.messenger.send("setDirtyFlag")
 
     def redo(self):
@@ -67,21 +77,12 @@ class CoreKillRingHandler:
             return
 
         if workOn.action == "set":
-            if workOn.objectType == "pos":
-                if type(workOn.newValue) is list:
-                    workOn.editObject.set_pos(*workOn.newValue)
-                else:
-                    workOn.editObject.set_pos(workOn.newValue)
-            elif workOn.objectType == "hpr":
-                if type(workOn.newValue) is list:
-                    workOn.editObject.set_hpr(*workOn.newValue)
-                else:
-                    workOn.editObject.set_hpr(workOn.newValue)
-            elif workOn.objectType == "scale":
-                if type(workOn.newValue) is list:
-                    workOn.editObject.set_scale(*workOn.newValue)
-                else:
-                    workOn.editObject.set_scale(workOn.newValue)
+            self.set_kill_ring_value(
+                workOn.editObject, workOn.objectType, workOn.newValue)
+
+        elif workOn.action == "set_batch":
+            for obj, value in zip(workOn.editObject, workOn.newValue):
+                self.set_kill_ring_value(obj, workOn.objectType, value)
 
         elif workOn.action == "add":
             workOn.editObject.unstash()
@@ -108,8 +109,93 @@ class CoreKillRingHandler:
         if len(self.selected_objects):
             base.messenger.send("update_selection_highlight_marker")
 
+        base.messenger.send("update_property_values")
         base.messenger.send("setDirtyFlag")
 
+    def set_kill_ring_value(self, obj, objectType, value):
+        if objectType == "pos":
+            if type(value) is list:
+                obj.set_pos(*value)
+            else:
+                obj.set_pos(value)
+        elif objectType == "hpr":
+            if type(value) is list:
+                obj.set_hpr(*value)
+            else:
+                obj.set_hpr(value)
+        elif objectType == "scale":
+            if type(value) is list:
+                obj.set_scale(*value)
+            else:
+                obj.set_scale(value)
+
+    def get_node_paths(self, values):
+        """Returns the node paths in the given kill ring values"""
+        objects = []
+        for value in values:
+            if isinstance(value, list):
+                objects += [obj for obj in value if isinstance(obj, NodePath)]
+            elif isinstance(value, NodePath):
+                objects.append(value)
+        return [obj for obj in objects if not obj.is_empty()]
+
+    def get_kill_ring_objects(self):
+        """Returns all node paths the undo history refers to"""
+        values = []
+        for entry in self.killRing.getEntries():
+            values += [entry.editObject, entry.oldValue, entry.newValue]
+        return self.get_node_paths(values)
+
+    def purge_removed_objects(self, candidates=None):
+        """Frees all removed objects which can't be restored by undo anymore.
+        Removing objects only stashes them, so they stay in memory and in the
+        scene objects list until they get purged here. If candidates are
+        given, only those objects are checked instead of the whole scene."""
+        if candidates is None:
+            candidates = self.scene_objects
+        referenced = self.get_kill_ring_objects()
+        referenced_keys = set(obj.get_key() for obj in referenced)
+
+        purge = []
+        for obj in candidates:
+            if obj.is_empty() \
+            or not obj.is_stashed() \
+            or obj.get_key() in referenced_keys:
+                continue
+            # objects parented to it may still be restored on their own
+            if any(obj.is_ancestor_of(ref) for ref in referenced):
+                continue
+            purge.append(obj)
+        if len(purge) == 0:
+            return
+
+        # the purged objects and all objects that were parented to them
+        purged_objects = []
+        for obj in purge:
+            purged_objects.append(obj)
+            purged_objects += list(obj.find_all_matches("**/=scene_object_id"))
+        purged_keys = set(obj.get_key() for obj in purged_objects)
+
+        self.shader_cache.remove_users(purged_objects)
+        for key in purged_keys:
+            self.assigned_lights.pop(key, None)
+
+        for obj in purge:
+            self.deselect(obj)
+            obj.remove_node()
+
+        # drop them from every list referring to scene objects
+        def is_alive(obj):
+            return not obj.is_empty() and obj.get_key() not in purged_keys
+        self.scene_objects = [obj for obj in self.scene_objects if is_alive(obj)]
+        self.copied_objects = [obj for obj in self.copied_objects if is_alive(obj)]
+        self.cut_objects = [obj for obj in self.cut_objects if is_alive(obj)]
+        self.proxied_objects = set(
+            obj for obj in self.proxied_objects if is_alive(obj))
+
+        logging.info(f"Purged {len(purge)} removed objects")
+        base.messenger.send("update_structure")
+
     def cycleKillRing(self):
         """Cycles through the redo branches at the current depth of the kill ring"""
         self.undo()
@@ -0,0 +1,122 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+from array import array
+
+from panda3d.core import (
+    GeomEnums,
+    OmniBoundingVolume,
+    Shader,
+    Texture)
+
+HELPER_VERTEX_SHADER = """
+#version 140
+
+uniform mat4 p3d_ModelViewProjectionMatrix;
+uniform samplerBuffer instance_data;
+
+in vec4 p3d_Vertex;
+in vec4 p3d_Color;
+in vec2 p3d_MultiTexCoord0;
+
+out vec4 color;
+out vec2 texcoord;
+
+void main() {
+    // each instance has its transformation rows and color scale in the buffer
+    int offset = gl_InstanceID * 5;
+    mat4 transform = mat4(
+        texelFetch(instance_data, offset),
+        texelFetch(instance_data, offset + 1),
+        texelFetch(instance_data, offset + 2),
+        texelFetch(instance_data, offset + 3));
+
+    color = p3d_Color * texelFetch(instance_data, offset + 4);
+    texcoord = p3d_MultiTexCoord0;
+    gl_Position = p3d_ModelViewProjectionMatrix * (transform * p3d_Vertex);
+}
+"""
+
+HELPER_FRAGMENT_SHADER = """
+#version 140
+
+uniform sampler2D p3d_Texture0;
+
+in vec4 color;
+in vec2 texcoord;
+
+out vec4 fragment_color;
+
+void main() {
+    fragment_color = color * texture(p3d_Texture0, texcoord);
+}
+"""
+
+# texels of the instance data buffer used per instance
+TEXELS_PER_INSTANCE = 5
+
+class HelperBatch:
+    """Draws the shared helper model of all objects of one kind in a single
+    hardware instanced draw call"""
+
+    @staticmethod
+    def isSupported():
+        gsg = base.win.get_gsg()
+        return gsg is not None \
+            and gsg.get_supports_glsl() \
+            and gsg.get_supports_buffer_texture() \
+            and gsg.get_supports_geometry_instancing()
+
+    def __init__(self, name, helper_np, parent):
+        self.np = parent.attach_new_node(f"helper_batch_{name}")
+        self.geometry = helper_np.copy_to(self.np)
+        # the shared model itself may be hidden in the viewport
+        self.geometry.show()
+        self.geometry.set_shader(Shader.make(
+            Shader.SL_GLSL, HELPER_VERTEX_SHADER, HELPER_FRAGMENT_SHADER))
+        # an instance count of 0 draws the model once without instancing
+        self.geometry.stash()
+
+        # the instances are placed in the shader, so the batch may never get
+        # culled by the bounds of the single model
+        self.np.node().set_bounds(OmniBoundingVolume())
+        self.np.node().set_final(True)
+
+        self.capacity = 0
+        self.instance_data = Texture(f"helper_batch_{name}_instances")
+        self.geometry.set_shader_input("instance_data", self.instance_data)
+
+    def update(self, objects):
+        """Places an instance at each of the given objects"""
+        data = array('f')
+        for obj in objects:
+            mat = obj.get_mat(self.np)
+            for row in range(4):
+                data.extend(mat.get_row(row))
+            data.extend(obj.get_color_scale())
+
+        num_instances = len(objects)
+        if num_instances > self.capacity:
+            # grow in steps to not resize the buffer while adding objects
+            self.capacity = max(num_instances, self.capacity * 2, 64)
+            self.instance_data.setup_buffer_texture(
+                self.capacity * TEXELS_PER_INSTANCE,
+                Texture.T_float,
+                Texture.F_rgba32,
+                GeomEnums.UH_dynamic)
+
+        if num_instances == 0:
+            self.geometry.stash()
+            return
+        ram_image = memoryview(self.instance_data.modify_ram_image())
+        ram_image.cast("B").cast("f")[:len(data)] = data
+        self.geometry.set_instance_count(num_instances)
+        self.geometry.unstash()
+
+    def remove(self):
+        self.np.remove_node()
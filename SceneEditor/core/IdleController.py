@@ -0,0 +1,164 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import logging
+
+from panda3d.core import (
+    ClockObject,
+    ConfigVariableBool,
+    ConfigVariableDouble)
+
+from direct.showbase.DirectObject import DirectObject
+from direct.interval.IntervalGlobal import ivalMgr
+
+# generic event sent by the button thrower for every pressed key or button
+BUTTON_DOWN_EVENT = "SceneEditor_button_down"
+
+# events after which the viewport needs to be rendered again
+RENDER_REQUEST_EVENTS = [
+    "SceneEditor_request_render",
+    "update_structure",
+    "update_properties",
+    "update_property_values",
+    "setDirtyFlag",
+    "3d_display_region_changed",
+]
+
+# seconds to keep rendering after the last change, this covers short
+# animations and GUI feedback like button highlights
+RENDER_HOLD_TIME = 0.5
+
+# frame rate at which input is still checked while no frames are rendered
+POLL_FRAME_RATE = 30.0
+
+class IdleController(DirectObject):
+    """Caps the frame rate while the editor doesn't get any input and, if
+    render on demand is enabled, stops rendering the window until something
+    changed, so the editor doesn't keep the CPU and GPU busy while nobody is
+    working with it."""
+
+    def __init__(self):
+        DirectObject.__init__(self)
+
+        # the frame rate to run at while idle, 0 disables the cap
+        self.idle_frame_rate = ConfigVariableDouble(
+            "scene-editor-idle-frame-rate", 0.0).getValue()
+        # seconds without any input after which the editor is idle
+        self.idle_timeout = ConfigVariableDouble(
+            "scene-editor-idle-timeout", 2.0).getValue()
+        # only render frames after input or changes to the scene
+        self.render_on_demand = ConfigVariableBool(
+            "scene-editor-render-on-demand", False).getValue()
+
+        self.clock = ClockObject.get_global_clock()
+        self.default_clock_mode = self.clock.get_mode()
+
+        self.idle = False
+        self.rendering = True
+        self.last_activity = self.clock.get_real_time()
+        self.render_until = self.last_activity + RENDER_HOLD_TIME
+        self.last_mouse_pos = None
+
+    def is_enabled(self):
+        return self.idle_frame_rate > 0 or self.render_on_demand
+
+    def enable(self):
+        if not self.is_enabled() \
+        or base.taskMgr.hasTaskNamed("SceneEditor_task_idleCheck"):
+            return
+
+        if base.buttonThrowers:
+            button_thrower = base.buttonThrowers[0].node()
+            if button_thrower.get_button_down_event() == "":
+                button_thrower.set_button_down_event(BUTTON_DOWN_EVENT)
+            if button_thrower.get_button_down_event() == BUTTON_DOWN_EVENT:
+                self.accept(BUTTON_DOWN_EVENT, self.wake)
+        self.accept("window-event", self.wake)
+        self.accept("SceneEditor_wake", self.wake)
+        for event in RENDER_REQUEST_EVENTS:
+            self.accept(event, self.request_render)
+
+        # run after the events of the frame have been handled but before the
+        # frame gets rendered
+        base.taskMgr.add(
+            self.idle_check_task, "SceneEditor_task_idleCheck", sort=40)
+
+    def disable(self):
+        base.taskMgr.remove("SceneEditor_task_idleCheck")
+        self.ignore_all()
+        self.idle = False
+        self.set_rendering(True)
+        self.update_clock()
+
+    def wake(self, *args):
+        self.last_activity = self.clock.get_real_time()
+        if self.idle:
+            self.set_idle(False)
+        self.request_render()
+
+    def request_render(self, *args):
+        self.render_until = self.clock.get_real_time() + RENDER_HOLD_TIME
+        if not self.rendering:
+            self.set_rendering(True)
+            self.update_clock()
+
+    def set_idle(self, idle):
+        if idle == self.idle:
+            return
+        self.idle = idle
+        if idle:
+            logging.debug("Editor idle")
+        self.update_clock()
+        base.messenger.send("SceneEditor_idle_changed", [idle])
+
+    def set_rendering(self, rendering):
+        if rendering == self.rendering:
+            return
+        self.rendering = rendering
+        # inactive windows are skipped by the graphics engine but still
+        # process their events
+        base.win.set_active(rendering)
+
+    def update_clock(self):
+        frame_rate = 0
+        if self.idle and self.idle_frame_rate > 0:
+            frame_rate = self.idle_frame_rate
+        if not self.rendering:
+            # keep the loop from spinning without the video sync of rendering
+            if frame_rate == 0 or frame_rate > POLL_FRAME_RATE:
+                frame_rate = POLL_FRAME_RATE
+
+        if frame_rate > 0:
+            self.clock.set_mode(ClockObject.M_limited)
+            self.clock.set_frame_rate(frame_rate)
+        else:
+            self.clock.set_mode(self.default_clock_mode)
+
+    def idle_check_task(self, task):
+        mouse_pos = None
+        if base.mouseWatcherNode.has_mouse():
+            mouse_pos = base.mouseWatcherNode.get_mouse()
+            mouse_pos = (mouse_pos.x, mouse_pos.y)
+        if mouse_pos != self.last_mouse_pos:
+            self.last_mouse_pos = mouse_pos
+            self.wake()
+            return task.cont
+
+        now = self.clock.get_real_time()
+        if not self.idle \
+        and self.idle_frame_rate > 0 \
+        and now - self.last_activity > self.idle_timeout:
+            self.set_idle(True)
+
+        if self.render_on_demand \
+        and self.rendering \
+        and now > self.render_until \
+        and ivalMgr.getNumIntervals() == 0:
+            self.set_rendering(False)
+            self.update_clock()
+        return task.cont
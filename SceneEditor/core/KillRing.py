@@ -24,29 +24,81 @@ class KillRingEntry():
         self.activeChild = self.children[-1]
 
 class KillRing():
-    def __init__(self):
+    def __init__(self, limit=0):
         self.currentRoot = KillRingEntry()
         self.currentRoot.setParent(self.currentRoot)
+        # maximum number of steps that can be undone, 0 for no limit
+        self.limit = limit
+        # number of steps that can currently be undone
+        self.depth = 0
 
     def push(self, editObject, action, objectType, oldValue, newValue):
+        """Adds a new entry and returns the values referenced by the entries
+        which had to be evicted to stay within the limit"""
         newKill = KillRingEntry(editObject, action, objectType, oldValue, newValue)
         self.currentRoot.addChild(newKill)
         newKill.setParent(self.currentRoot)
         self.currentRoot = newKill
+        self.depth += 1
+
+        evicted = []
+        while self.limit > 0 and self.depth > self.limit:
+            evicted += self.evictOldest()
+        return evicted
+
+    def evictOldest(self):
+        """Drops the oldest step of the current undo path together with all
+        redo branches starting before it and returns the edited objects and
+        values these entries referenced"""
+        root = self.currentRoot
+        while root.parent is not root:
+            root = root.parent
+        oldest = root.activeChild
+
+        # the oldest entry becomes the new root, which can't be undone
+        root.children.remove(oldest)
+        evicted = []
+        for entry in [oldest] + self.getSubtreeEntries(root):
+            evicted += [entry.editObject, entry.oldValue, entry.newValue]
+        oldest.setParent(oldest)
+        # don't keep the objects of the dropped step alive
+        oldest.editObject = None
+        oldest.oldValue = None
+        oldest.newValue = None
+        self.depth -= 1
+        return evicted
+
+    def getSubtreeEntries(self, root):
+        entries = []
+        to_visit = list(root.children)
+        while to_visit:
+            entry = to_visit.pop()
+            entries.append(entry)
+            to_visit += entry.children
+        return entries
 
     def pop(self):
         # revert last push
         if self.currentRoot.parent is self.currentRoot: return None
         root = self.currentRoot
         self.currentRoot = self.currentRoot.parent
+        self.depth -= 1
         return root
 
     def pull(self):
         # revert last pop
         if self.currentRoot.activeChild is None: return
         self.currentRoot = self.currentRoot.activeChild
+        self.depth += 1
         return self.currentRoot
 
     def cycleChildren(self):
         # change the active child to the next one in the active kill ring entry
         self.currentRoot.cycleChildren()
+
+    def getEntries(self):
+        """Returns all entries of the kill ring including the redo branches"""
+        root = self.currentRoot
+        while root.parent is not root:
+            root = root.parent
+        return self.getSubtreeEntries(root)
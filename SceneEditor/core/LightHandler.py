@@ -0,0 +1,225 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import math
+import logging
+from collections import defaultdict
+
+from panda3d.core import (
+    ConfigVariableDouble,
+    ConfigVariableInt,
+    LightAttrib)
+
+from direct.showbase.DirectObject import DirectObject
+
+# number of local lights per model, 0 lets all lights affect all models
+MAX_LIGHTS = ConfigVariableInt("scene-editor-max-lights", 0)
+
+# lights which reach every object no matter where it is
+GLOBAL_LIGHT_TYPES = ["AmbientLight", "DirectionalLight"]
+
+# minimum time in seconds between two updates of the light assignment
+LIGHT_UPDATE_INTERVAL = 0.25
+
+# lights reaching more cells than this are checked for every object instead
+# of being added to each cell
+MAX_LIGHT_CELLS = 512
+
+def get_export_state(obj):
+    """Returns the render state of the given object without the lights the
+    viewport assigned to it"""
+    state = obj.get_state()
+    if MAX_LIGHTS.getValue() > 0 and obj.get_tag("object_type") == "model":
+        state = state.remove_attrib(LightAttrib)
+    return state
+
+class LightIndex:
+    """A uniform grid of the cells the influence of each light reaches, used
+    to only check lights near an object"""
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        # lights with an unlimited or very large radius
+        self.unbounded = []
+
+    def get_cell_range(self, center, radius):
+        return [
+            range(
+                math.floor((center[axis] - radius) / self.cell_size),
+                math.floor((center[axis] + radius) / self.cell_size) + 1)
+            for axis in range(3)]
+
+    def add(self, entry):
+        if math.isinf(entry.radius):
+            self.unbounded.append(entry)
+            return
+        x_range, y_range, z_range = self.get_cell_range(entry.pos, entry.radius)
+        if len(x_range) * len(y_range) * len(z_range) > MAX_LIGHT_CELLS:
+            self.unbounded.append(entry)
+            return
+        for x in x_range:
+            for y in y_range:
+                for z in z_range:
+                    self.cells[(x, y, z)].append(entry)
+
+    def query(self, center, radius):
+        """Returns all lights which may reach the given sphere"""
+        found = set(self.unbounded)
+        x_range, y_range, z_range = self.get_cell_range(center, radius)
+        if len(x_range) * len(y_range) * len(z_range) > len(self.cells):
+            # the sphere is larger than the filled part of the grid
+            for cell in self.cells.values():
+                found.update(cell)
+            return found
+        for x in x_range:
+            for y in y_range:
+                for z in z_range:
+                    found.update(self.cells.get((x, y, z), []))
+        return found
+
+class LightEntry:
+    def __init__(self, light_np, pos, radius):
+        self.light_np = light_np
+        self.pos = pos
+        self.radius = radius
+        light = light_np.node()
+        self.brightness = max(light.get_color()[:3])
+        self.attenuation = light.get_attenuation()
+
+    def get_influence(self, distance):
+        """Returns the brightness of the light at the given distance"""
+        constant, linear, quadratic = self.attenuation
+        falloff = constant + linear * distance + quadratic * distance * distance
+        if falloff <= 0:
+            return self.brightness
+        return self.brightness / falloff
+
+class LightHandler:
+    """Limits the number of point and spot lights affecting each model in the
+    viewport. Every light is still set on the scene root, so saved and
+    exported scenes are lit the same way. For the viewport only, each model
+    gets the strongest lights reaching its bounds set explicitly, which keeps
+    the generated shaders small in scenes with hundreds of lights."""
+
+    def __init__(self):
+        self.max_lights = MAX_LIGHTS.getValue()
+        # brightness below which a light doesn't reach a model anymore
+        self.light_cutoff = ConfigVariableDouble(
+            "scene-editor-light-cutoff", 0.05).getValue()
+        self.light_cell_size = ConfigVariableDouble(
+            "scene-editor-light-cell-size", 50.0).getValue()
+
+        # the lights each model got assigned, keyed by the models node key
+        self.assigned_lights = {}
+        self.lights_dirty = False
+        self.last_light_update = 0
+
+        if self.max_lights > 0:
+            # any change to the scene may move lights or models
+            self.light_listener = DirectObject()
+            for event in ["update_structure", "update_properties",
+                          "update_property_values", "setDirtyFlag"]:
+                self.light_listener.accept(event, self.invalidate_lights)
+            base.task_mgr.add(self.light_update_task, "light_update_task")
+
+    def invalidate_lights(self):
+        self.lights_dirty = True
+
+    def light_update_task(self, task):
+        if self.lights_dirty \
+        and task.time - self.last_light_update >= LIGHT_UPDATE_INTERVAL:
+            self.last_light_update = task.time
+            self.update_light_assignment()
+        return task.cont
+
+    def get_light_radius(self, light):
+        """Returns the distance at which the light falls below the cutoff
+        brightness or its max distance if that is closer"""
+        radius = light.get_max_distance()
+        brightness = max(light.get_color()[:3])
+        if brightness <= 0:
+            return 0
+        constant, linear, quadratic = light.get_attenuation()
+        # solve constant + linear * d + quadratic * d^2 = brightness / cutoff
+        target = brightness / self.light_cutoff
+        if quadratic > 0:
+            discriminant = linear * linear - 4 * quadratic * (constant - target)
+            distance = (-linear + math.sqrt(max(discriminant, 0))) / (2 * quadratic)
+        elif linear > 0:
+            distance = (target - constant) / linear
+        else:
+            distance = math.inf
+        return max(0, min(radius, distance))
+
+    def get_scene_lights(self):
+        """Returns the global lights and an index of all other lights in the
+        scene"""
+        global_lights = []
+        index = LightIndex(self.light_cell_size)
+        for obj in self.scene_objects:
+            if obj.get_tag("object_type") != "light" \
+            or not self.is_in_scene(obj):
+                continue
+            light_np = obj.find("+Light")
+            if light_np.is_empty():
+                continue
+            if obj.get_tag("light_type") in GLOBAL_LIGHT_TYPES:
+                global_lights.append(light_np)
+            else:
+                index.add(LightEntry(
+                    light_np,
+                    light_np.get_pos(render),
+                    self.get_light_radius(light_np.node())))
+        return global_lights, index
+
+    def get_model_lights(self, obj, index):
+        """Returns the strongest local lights reaching the bounds of the
+        given model"""
+        bounds = self.get_world_bounds(obj)
+        if bounds is None:
+            return []
+        center = bounds.get_center()
+        radius = bounds.get_radius()
+
+        candidates = []
+        for entry in index.query(center, radius):
+            distance = max(0, (entry.pos - center).length() - radius)
+            if distance > entry.radius:
+                continue
+            candidates.append((-entry.get_influence(distance), distance, entry))
+        candidates.sort(key=lambda candidate: candidate[:2])
+        return [entry.light_np for _, _, entry in candidates[:self.max_lights]]
+
+    def update_light_assignment(self):
+        """Sets the global lights and the strongest local lights on each
+        model, overriding the lights inherited from the scene root"""
+        self.lights_dirty = False
+        global_lights, index = self.get_scene_lights()
+
+        assigned_lights = {}
+        for obj in self.scene_objects:
+            if obj.get_tag("object_type") != "model" \
+            or not self.is_in_scene(obj):
+                continue
+            lights = global_lights + self.get_model_lights(obj, index)
+            key = obj.get_key()
+            light_keys = tuple(light_np.get_key() for light_np in lights)
+            assigned_lights[key] = light_keys
+            if self.assigned_lights.get(key) == light_keys:
+                continue
+
+            attrib = LightAttrib.make_all_off()
+            for light_np in lights:
+                attrib = attrib.add_on_light(light_np)
+            obj.set_attrib(attrib)
+
+        self.assigned_lights = assigned_lights
+        logging.debug(
+            f"Assigned lights to {len(assigned_lights)} models, "
+            f"{len(global_lights)} global lights")
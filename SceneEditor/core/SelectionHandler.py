@@ -8,6 +8,8 @@ from panda3d.core import (
     Point3,
     BitMask32)
 
+from SceneEditor.tools.Instrumentation import timed
+
 class SelectionHandler:
     def __init__(self):
         # new mouse watcher to handle display region changes correct
@@ -44,6 +46,7 @@ class SelectionHandler:
         dr = base.cam.node().get_display_region(0)
         self.selction_mouse_watcher.setDisplayRegion(dr)
 
+    @timed("Picking")
     def handle_pick(self, multiselect):
         if self.selction_mouse_watcher.hasMouse():
             mpos = self.selction_mouse_watcher.getMouse()
@@ -54,7 +57,9 @@ class SelectionHandler:
                 self.pick_handler.sortEntries()
                 picked_obj = self.pick_handler.getEntry(0).getIntoNodePath()
                 picked_obj = picked_obj.findNetTag("scene_object_id")
-                if not picked_obj.is_empty() and not picked_obj.is_hidden():
+                if not picked_obj.is_empty() \
+                and not picked_obj.is_hidden() \
+                and self.is_helper_shown(picked_obj):
                     base.messenger.send("pickObject", [picked_obj, multiselect])
 
     def update_selection_highlight_marker(self):
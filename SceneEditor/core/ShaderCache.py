@@ -0,0 +1,212 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from panda3d.core import (
+    ConfigVariableBool,
+    Filename,
+    Shader,
+    VirtualFileSystem,
+    getModelPath)
+
+# seconds between two checks of the shader files for changes
+HOT_RELOAD_INTERVAL = 1.0
+
+def get_stage_paths(shader_details):
+    return (
+        shader_details.vertex_path,
+        shader_details.fragment_path,
+        shader_details.geometry_path,
+        shader_details.tessellation_ctrl_path,
+        shader_details.tessellation_eval_path)
+
+def get_file_timestamp(path):
+    """Returns the modification time of the file at the given path, looked up
+    on the model path like the shader loader does, or 0 if it can't be found"""
+    if path == "":
+        return 0
+    vfs = VirtualFileSystem.get_global_ptr()
+    filename = Filename.from_os_specific(path)
+    if not vfs.resolve_filename(filename, getModelPath().get_value()):
+        return 0
+    vfile = vfs.get_file(filename, True)
+    if vfile is None:
+        return 0
+    return vfile.get_timestamp()
+
+def load_shader(language, stage_paths):
+    vertex, fragment, geometry, tess_control, tess_evaluation = stage_paths
+    return Shader.load(
+        language,
+        vertex=vertex,
+        fragment=fragment,
+        geometry=geometry,
+        tess_control=tess_control,
+        tess_evaluation=tess_evaluation)
+
+class ShaderCache:
+    """Loads each shader only once, keyed by its language, the paths of its
+    stages and their modification times, and applies it to all objects of a
+    request at once. Optionally the shader files are read and parsed in a
+    background thread and reloaded when they change. The compilation itself
+    can't be moved to another thread, background loaded shaders get compiled
+    in the frame they finished loading rather than the one first drawing
+    them."""
+
+    def __init__(self):
+        # (language, stage paths) -> [timestamps, Shader]
+        self.shaders = {}
+        # (language, stage paths) -> objects the shader has been set on
+        self.users = {}
+
+        self.hits = 0
+        self.misses = 0
+
+        self.async_load = ConfigVariableBool(
+            "scene-editor-shader-async", False).getValue()
+        self.hot_reload = ConfigVariableBool(
+            "scene-editor-shader-hot-reload", False).getValue()
+
+        # (language, stage paths) -> (future, timestamps, list of requests
+        # as (input dict, objects)) of the shaders loaded in the background
+        self.pending = {}
+        self.executor = None
+        if self.async_load:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+            base.task_mgr.add(self.pending_task, "shader_cache_pending_task")
+
+        if self.hot_reload:
+            base.task_mgr.do_method_later(
+                HOT_RELOAD_INTERVAL,
+                self.hot_reload_task,
+                "shader_cache_hot_reload_task")
+
+    def get_key(self, shader_details):
+        return (shader_details.shader_language, get_stage_paths(shader_details))
+
+    def get_timestamps(self, key):
+        return tuple(get_file_timestamp(path) for path in key[1])
+
+    def get(self, key):
+        """Returns the cached shader of the given key if its files didn't
+        change since it was loaded"""
+        if key in self.shaders \
+        and self.shaders[key][0] == self.get_timestamps(key):
+            self.hits += 1
+            return self.shaders[key][1]
+        self.misses += 1
+        return None
+
+    def load(self, key):
+        """Loads the shader of the given key, which wasn't found in the cache"""
+        timestamps = self.get_timestamps(key)
+        shader = load_shader(*key)
+        self.shaders[key] = [timestamps, shader]
+        return shader
+
+    def precompile(self, shader):
+        """Compiles the shader for the window right away instead of on the
+        first frame it gets drawn in"""
+        if base.win is None:
+            return
+        gsg = base.win.get_gsg()
+        if gsg is None:
+            return
+        shader.prepare_now(gsg.get_prepared_objects(), gsg)
+
+    def apply(self, key, shader, input_dict, objects):
+        for obj in objects:
+            for name, value in input_dict.items():
+                obj.set_shader_input(name, value)
+            obj.set_shader(shader)
+
+        # objects only keep the shader they got last
+        object_keys = set(obj.get_key() for obj in objects)
+        for users in self.users.values():
+            users[:] = [obj for obj in users if obj.get_key() not in object_keys]
+        self.users.setdefault(key, []).extend(objects)
+
+    def remove_users(self, objects):
+        """Forgets the given objects, e.g. once they have been removed"""
+        object_keys = set(obj.get_key() for obj in objects)
+        for users in self.users.values():
+            users[:] = [
+                obj for obj in users
+                if not obj.is_empty() and obj.get_key() not in object_keys]
+
+    def request(self, shader_details, objects):
+        """Sets the shader of the given details on all given objects, loading
+        it first if necessary"""
+        objects = list(objects)
+        key = self.get_key(shader_details)
+        input_dict = dict(shader_details.input_dict)
+        shader = self.get(key)
+        if shader is not None:
+            self.apply(key, shader, input_dict, objects)
+            return
+
+        if not self.async_load:
+            self.apply(key, self.load(key), input_dict, objects)
+            return
+
+        # the shader files are read in the background, the shader gets set
+        # on the objects by the pending task once it's done
+        if key in self.pending:
+            # the same shader is already being loaded
+            self.pending[key][2].append((input_dict, objects))
+            return
+        timestamps = self.get_timestamps(key)
+        future = self.executor.submit(load_shader, *key)
+        self.pending[key] = (future, timestamps, [(input_dict, objects)])
+
+    def pending_task(self, task):
+        for key, (future, timestamps, requests) in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[key]
+            try:
+                shader = future.result()
+            except Exception:
+                logging.exception(f"Couldn't load shader {key[1]}")
+                continue
+            self.shaders[key] = [timestamps, shader]
+            # the source is only read and parsed in the background, the
+            # compilation has to happen here on the main thread
+            self.precompile(shader)
+            for input_dict, objects in requests:
+                self.apply(
+                    key,
+                    shader,
+                    input_dict,
+                    [obj for obj in objects if not obj.is_empty()])
+        return task.cont
+
+    def hot_reload_task(self, task):
+        for key, (timestamps, shader) in list(self.shaders.items()):
+            new_timestamps = self.get_timestamps(key)
+            if new_timestamps == timestamps:
+                continue
+            logging.info(f"Reloading changed shader {key[1]}")
+            try:
+                shader = load_shader(*key)
+            except Exception:
+                logging.exception(f"Couldn't reload shader {key[1]}")
+                continue
+            self.shaders[key] = [new_timestamps, shader]
+            self.precompile(shader)
+            users = [obj for obj in self.users.get(key, []) if not obj.is_empty()]
+            self.users[key] = users
+            for obj in users:
+                obj.set_shader(shader)
+        return task.again
+
+    def clear(self):
+        self.shaders = {}
+        self.users = {}
@@ -8,6 +8,8 @@ from panda3d.core import (
     LRotation,
     VBase4)
 
+from SceneEditor.tools.Instrumentation import timed
+
 class TransformationHandler:
     def __init__(self):
         self.limiting_x = False
@@ -121,12 +123,14 @@ class TransformationHandler:
         t.has_moved = False
         t.last_mouse_pos = mpos
 
+    @timed("Transform:Move")
     def move_objects_task(self, t):
         mwn = base.mouseWatcherNode
         if mwn.hasMouse():
 
             mpos = base.mouseWatcherNode.getMouse()
 
+            moved = False
             for obj in t.object_infos.keys():
 
                 # check if the mouse has moved far enough from it's initial position
@@ -169,6 +173,10 @@ class TransformationHandler:
                 if oldPos != obj.get_pos():
                     # model has moved, notice everyone interested about it
                     t.has_moved = True
+                    moved = True
+
+            if moved:
+                base.messenger.send("update_property_values")
 
             # store the mouse position for the next frame
             t.last_mouse_pos = Point2(mpos)
@@ -201,6 +209,8 @@ class TransformationHandler:
 
         self.clear_limit()
 
+        base.messenger.send("update_property_values")
+
         taskMgr.remove("move_objects_task")
 
 
@@ -257,12 +267,14 @@ class TransformationHandler:
         t.last_mouse_pos = mpos
         t.middle = Point2((min_x + max_x)/2, (min_y + max_y)/2)
 
+    @timed("Transform:Rotate")
     def rotate_objects_task(self, t):
         mwn = base.mouseWatcherNode
         if mwn.hasMouse():
 
             mpos = base.mouseWatcherNode.getMouse()
 
+            moved = False
             for obj in t.object_infos.keys():
 
                 # check if the mouse has moved far enough from it's initial position
@@ -323,6 +335,10 @@ class TransformationHandler:
                 if old_hpr != obj.get_hpr():
                     # model has moved, notice everyone interested about it
                     t.has_rotated = True
+                    moved = True
+
+            if moved:
+                base.messenger.send("update_property_values")
 
             # store the mouse position for the next frame
             t.last_mouse_pos = Point2(mpos)
@@ -353,6 +369,8 @@ class TransformationHandler:
 
         self.clear_limit()
 
+        base.messenger.send("update_property_values")
+
         taskMgr.remove("rotate_objects_task")
 
 
@@ -400,6 +418,7 @@ class TransformationHandler:
         t.middle = Point2((min_x + max_x)/2, (min_y + max_y)/2)
         t.start_distance = (t.middle - mpos).length()
 
+    @timed("Transform:Scale")
     def scale_objects_task(self, t):
         mwn = base.mouseWatcherNode
         if mwn.hasMouse():
@@ -409,6 +428,7 @@ class TransformationHandler:
             scale_diff = (t.middle - mpos).length() - t.start_distance
             scale_diff *= 1.2
 
+            moved = False
             for obj in t.object_infos.keys():
 
                 # check if the mouse has moved far enough from it's initial position
@@ -441,6 +461,10 @@ class TransformationHandler:
                 if old_scale != obj.get_scale():
                     # model has moved, notice everyone interested about it
                     t.has_scaled = True
+                    moved = True
+
+            if moved:
+                base.messenger.send("update_property_values")
 
         return t.cont
 
@@ -469,5 +493,7 @@ class TransformationHandler:
 
         self.clear_limit()
 
+        base.messenger.send("update_property_values")
+
         taskMgr.remove("scale_objects_task")
 
@@ -0,0 +1,372 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import logging
+from array import array
+
+from panda3d.core import (
+    ConfigVariableBool,
+    ConfigVariableDouble,
+    DrawMask,
+    Fog,
+    Geom,
+    GeomLines,
+    GeomNode,
+    GeomVertexData,
+    GeomVertexFormat,
+    ModelRoot,
+    NodePath)
+
+from direct.showbase.DirectObject import DirectObject
+
+from SceneEditor.core.HelperBatch import HelperBatch
+
+# The editors viewport camera only sees the bits below. Everything in the
+# scene is visible to the viewport bit, helper models are hidden from it and
+# only shown through the bit of their object type, so a whole type can be
+# hidden by removing its bit from the camera mask.
+VIEWPORT_MASK = DrawMask.bit(20)
+HELPER_MASKS = {
+    "empty": DrawMask.bit(21),
+    "light": DrawMask.bit(22),
+    "camera": DrawMask.bit(23),
+    "collision": DrawMask.bit(24),
+}
+EDITOR_VIEW_MASK = VIEWPORT_MASK
+for helper_mask in HELPER_MASKS.values():
+    EDITOR_VIEW_MASK = EDITOR_VIEW_MASK | helper_mask
+
+# the model and helper type of each kind of helper model, keyed by the object
+# type or the light type for lights
+HELPER_MODELS = {
+    "empty": ("models/misc/xyzAxis", "empty"),
+    "camera": ("models/misc/camera", "camera"),
+    "PointLight": ("models/misc/Pointlight", "light"),
+    "DirectionalLight": ("models/misc/Dirlight", "light"),
+    "Spotlight": ("models/misc/Spotlight", "light"),
+}
+
+# the proxies get updated after the camera moved this part of the proxy
+# distance
+PROXY_UPDATE_STEP = 0.25
+
+# the 12 edges of a box given as pairs of corners, each corner as index into
+# (min x, max x), (min y, max y) and (min z, max z)
+BOX_EDGES = [
+    ((0, 0, 0), (1, 0, 0)), ((0, 1, 0), (1, 1, 0)),
+    ((0, 0, 1), (1, 0, 1)), ((0, 1, 1), (1, 1, 1)),
+    ((0, 0, 0), (0, 1, 0)), ((1, 0, 0), (1, 1, 0)),
+    ((0, 0, 1), (0, 1, 1)), ((1, 0, 1), (1, 1, 1)),
+    ((0, 0, 0), (0, 0, 1)), ((1, 0, 0), (1, 0, 1)),
+    ((0, 1, 0), (0, 1, 1)), ((1, 1, 0), (1, 1, 1)),
+]
+
+class ViewportHandler:
+    def __init__(self):
+        # distance at which models get cut off, 0 keeps the lens far plane
+        self.view_distance = ConfigVariableDouble(
+            "scene-editor-view-distance", 0.0).getValue()
+        # part of the view distance over which models fade into the background
+        self.view_fade = ConfigVariableDouble(
+            "scene-editor-view-fade", 0.2).getValue()
+        # distance beyond which models are only shown as boxes, 0 disables it
+        self.proxy_distance = ConfigVariableDouble(
+            "scene-editor-proxy-distance", 0.0).getValue()
+
+        # object types whose helper models are currently hidden
+        self.hidden_helpers = set()
+        base.cam.node().set_camera_mask(self.get_viewport_camera_mask())
+
+        self.apply_view_distance()
+
+        # one shared node per helper model, instanced below each object
+        self.helper_models = {}
+        # draw all helpers of a kind in one hardware instanced draw call
+        self.instanced_helpers = ConfigVariableBool(
+            "scene-editor-instanced-helpers", False).getValue()
+        if self.instanced_helpers and not HelperBatch.isSupported():
+            logging.warning("Instanced helpers are not supported, drawing them one by one")
+            self.instanced_helpers = False
+        self.helper_batches = {}
+        self.helper_batches_dirty = False
+        if self.instanced_helpers:
+            self.helper_listener = DirectObject()
+            for event in ["update_structure", "update_properties", "update_property_values"]:
+                self.helper_listener.accept(event, self.invalidate_helper_batches)
+            base.task_mgr.add(self.helper_batch_task, "helper_batch_task")
+
+        # all proxy boxes are drawn as one GeomLines
+        self.proxy_node = GeomNode("proxy_bounds")
+        self.proxy_np = render.attach_new_node(self.proxy_node)
+        self.proxy_np.set_color(0.7, 0.7, 0.7, 1)
+        self.prepare_for_editor(self.proxy_np)
+        # objects that are currently shown as proxy
+        self.proxied_objects = set()
+        # world space bounding spheres of all models as (model, center,
+        # radius), only recalculated after the scene changed
+        self.proxy_spheres = []
+        self.proxy_cam_pos = None
+        self.proxies_dirty = True
+
+        if self.proxy_distance > 0:
+            # any change to the scene may move objects in or out of range
+            self.proxy_listener = DirectObject()
+            self.proxy_listener.accept(
+                "update_structure", self.invalidate_proxies)
+            self.proxy_listener.accept(
+                "update_property_values", self.invalidate_proxies)
+            base.task_mgr.add(self.proxy_update_task, "proxy_update_task")
+
+    #
+    # VIEW DISTANCE
+    #
+    def apply_view_distance(self):
+        if self.view_distance <= 0:
+            return
+        base.cam.node().get_lens().set_far(self.view_distance)
+
+        fog = Fog("view_distance_fog")
+        fog.set_color(base.win.get_clear_color())
+        fog.set_linear_range(
+            self.view_distance * (1 - self.view_fade), self.view_distance)
+        # the fog is set above the scene content, so it doesn't end up in
+        # exported copies of the scene model parent
+        self.scene_root.set_fog(fog)
+
+    #
+    # HELPER VISIBILITY
+    #
+    def prepare_helper(self, obj, object_type):
+        """Hides the helper geometry of the given object from the viewport
+        camera unless the helpers of its type are shown"""
+        hide_mask = EDITOR_VIEW_MASK & ~HELPER_MASKS[object_type]
+        if object_type == "collision":
+            # the collision node itself is what gets displayed
+            obj.hide(hide_mask)
+            return
+        for child in obj.get_children():
+            if not child.has_tag("scene_object_id"):
+                child.hide(hide_mask)
+
+    def get_helper_key(self, obj):
+        if obj.get_tag("object_type") == "light":
+            return obj.get_tag("light_type")
+        return obj.get_tag("object_type")
+
+    def get_viewport_camera_mask(self):
+        camera_mask = VIEWPORT_MASK
+        for object_type, helper_mask in HELPER_MASKS.items():
+            if object_type not in self.hidden_helpers:
+                camera_mask = camera_mask | helper_mask
+        return camera_mask
+
+    def toggle_helpers(self, object_type):
+        self.set_helpers_shown(object_type, object_type in self.hidden_helpers)
+
+    def set_helpers_shown(self, object_type, shown):
+        if shown:
+            self.hidden_helpers.discard(object_type)
+        else:
+            self.hidden_helpers.add(object_type)
+        base.cam.node().set_camera_mask(self.get_viewport_camera_mask())
+        base.messenger.send("SceneEditor_request_render")
+
+    def is_helper_shown(self, obj):
+        return obj.get_tag("object_type") not in self.hidden_helpers
+
+    #
+    # SHARED HELPER MODELS
+    #
+    def get_shared_helper(self, key):
+        if key in self.helper_models:
+            return self.helper_models[key]
+
+        model_path, helper_type = HELPER_MODELS[key]
+        model = loader.load_model(model_path)
+        # merge the whole model into a single GeomNode
+        model.clear_model_nodes()
+        model.flatten_strong()
+        helper = model.find("**/+GeomNode")
+        helper.detach_node()
+        helper.set_name(model.get_name())
+        self.helper_models[key] = helper
+
+        if self.instanced_helpers:
+            batch = HelperBatch(key, helper, self.scene_root)
+            self.prepare_for_editor(batch.np)
+            batch.np.hide(EDITOR_VIEW_MASK & ~HELPER_MASKS[helper_type])
+            self.helper_batches[key] = batch
+            # the batch draws the instances below the objects
+            helper.hide(EDITOR_VIEW_MASK)
+        return helper
+
+    def load_helper_model(self, key):
+        """Returns a new object node with the shared helper model of the given
+        kind instanced as its first child"""
+        helper = self.get_shared_helper(key)
+        model = NodePath(ModelRoot(helper.get_name()))
+        helper.instance_to(model)
+        return model
+
+    def share_helper_model(self, obj):
+        """Replaces the helper model of a copied object with an instance of
+        the shared one"""
+        key = self.get_helper_key(obj)
+        if key not in HELPER_MODELS:
+            return
+        children = list(obj.get_children())
+        # keep the order of the children, the helper is always the first one
+        children[0].remove_node()
+        for child in children[1:]:
+            child.detach_node()
+        self.get_shared_helper(key).instance_to(obj)
+        for child in children[1:]:
+            child.reparent_to(obj, child.get_sort())
+
+    def invalidate_helper_batches(self):
+        self.helper_batches_dirty = True
+
+    def helper_batch_task(self, task):
+        if self.helper_batches_dirty:
+            self.update_helper_batches()
+        return task.cont
+
+    def is_in_scene(self, obj):
+        if obj.is_empty() or obj.get_top() != render:
+            return False
+        np = obj
+        while np != self.scene_model_parent and np.has_parent():
+            if np.is_stashed():
+                return False
+            np = np.get_parent()
+        return True
+
+    def update_helper_batches(self):
+        self.helper_batches_dirty = False
+        batch_objects = {key: [] for key in self.helper_batches}
+        for obj in self.scene_objects:
+            key = self.get_helper_key(obj)
+            if key in batch_objects \
+            and self.is_in_scene(obj) \
+            and not obj.is_hidden():
+                batch_objects[key].append(obj)
+        for key, batch in self.helper_batches.items():
+            batch.update(batch_objects[key])
+
+    #
+    # PROXY BOUNDS
+    #
+    def invalidate_proxies(self):
+        self.proxies_dirty = True
+
+    def proxy_update_task(self, task):
+        cam_pos = base.cam.get_pos(render)
+        if not self.proxies_dirty \
+        and self.proxy_cam_pos is not None \
+        and (cam_pos - self.proxy_cam_pos).length() \
+            < self.proxy_distance * PROXY_UPDATE_STEP:
+            return task.cont
+        self.update_proxies(cam_pos)
+        return task.cont
+
+    def get_world_bounds(self, obj):
+        """Returns the bounding volume of the given object and everything
+        below it in world space or None if it has no finite bounds"""
+        # the bounds of a node are given in its own coordinate space
+        volume = obj.get_bounds()
+        if volume.is_empty() or volume.is_infinite():
+            return None
+        volume = volume.make_copy()
+        volume.xform(obj.get_net_transform().get_mat())
+        return volume
+
+    def update_proxy_spheres(self):
+        self.proxy_spheres = []
+        for obj in self.scene_objects:
+            if obj.get_tag("object_type") != "model" or obj.is_stashed():
+                continue
+            volume = self.get_world_bounds(obj)
+            if volume is None:
+                continue
+            self.proxy_spheres.append(
+                (obj, volume.get_center(), volume.get_radius()))
+
+    def update_proxies(self, cam_pos):
+        """Shows all models further away from the camera than the proxy
+        distance as box and hides their geometry"""
+        self.proxy_cam_pos = cam_pos
+        scene_changed = self.proxies_dirty
+        if scene_changed:
+            self.proxies_dirty = False
+            self.update_proxy_spheres()
+
+        far_objects = set()
+        bounds = [[], [], [], [], [], []]
+        for obj, center, radius in self.proxy_spheres:
+            if (center - cam_pos).length() < self.proxy_distance:
+                continue
+            far_objects.add(obj)
+
+            # a box around the bounding sphere in world space
+            bounds[0].append(center.x - radius)
+            bounds[1].append(center.x + radius)
+            bounds[2].append(center.y - radius)
+            bounds[3].append(center.y + radius)
+            bounds[4].append(center.z - radius)
+            bounds[5].append(center.z + radius)
+
+        if not scene_changed and far_objects == self.proxied_objects:
+            # neither the boxes nor the proxied models changed
+            return
+
+        for obj in far_objects - self.proxied_objects:
+            self.set_proxied(obj, True)
+        for obj in self.proxied_objects - far_objects:
+            if not obj.is_empty():
+                self.set_proxied(obj, False)
+        self.proxied_objects = far_objects
+
+        self.proxy_node.remove_all_geoms()
+        if len(far_objects) > 0:
+            self.proxy_node.add_geom(self.create_proxy_geom(bounds))
+        logging.debug(f"Showing {len(far_objects)} models as proxy bounds")
+
+    def set_proxied(self, obj, proxied):
+        for child in obj.get_children():
+            if child.has_tag("scene_object_id"):
+                continue
+            if proxied:
+                child.hide(EDITOR_VIEW_MASK)
+            else:
+                child.node().adjust_draw_mask(
+                    DrawMask.all_off(), DrawMask.all_off(), EDITOR_VIEW_MASK)
+
+    def create_proxy_geom(self, bounds):
+        # each edge vertex is filled for all boxes at once by strided slices
+        num_boxes = len(bounds[0])
+        bounds = [array('f', values) for values in bounds]
+        step = len(BOX_EDGES) * 2 * 3
+        data = array('f', [0.0]) * (step * num_boxes)
+        offset = 0
+        for edge in BOX_EDGES:
+            for corner in edge:
+                for axis in range(3):
+                    data[offset::step] = bounds[axis * 2 + corner[axis]]
+                    offset += 1
+
+        num_vertices = num_boxes * len(BOX_EDGES) * 2
+        vdata = GeomVertexData(
+            "proxy_bounds", GeomVertexFormat.get_v3(), Geom.UH_static)
+        vdata.unclean_set_num_rows(num_vertices)
+        memoryview(vdata.modify_array(0)).cast("B").cast("f")[:] = data
+
+        lines = GeomLines(Geom.UH_static)
+        lines.add_consecutive_vertices(0, num_vertices)
+        geom = Geom(vdata)
+        geom.add_primitive(lines)
+        return geom
@@ -15,11 +15,15 @@ from direct.gui.DirectDialog import YesNoDialog
 from panda3d.core import LVecBase2f, LVecBase3f, LVecBase4f, LPoint2f, LPoint3f, LPoint4f, LVector3f
 from panda3d.core import LVecBase2, LVecBase3, LVecBase4, LPoint2, LPoint3, LPoint4
 from panda3d.core import LPlane
-from panda3d.core import NodePath
+from panda3d.core import NodePath, DrawMask
 from panda3d.core import Camera, OrthographicLens, PerspectiveLens
 
 from DirectFolderBrowser.DirectFolderBrowser import DirectFolderBrowser
 
+from SceneEditor.tools.EditedProperties import write_edited_tag
+from SceneEditor.core.ViewportHandler import EDITOR_VIEW_MASK
+from SceneEditor.core.LightHandler import get_export_state
+
 def get_name():
     return "Custom Bam Exporter"
 
@@ -31,11 +35,13 @@ class Exporter:
         # create a new NP which will be written out to the bam file
         self.export_scene_np = NodePath("export_root")
 
-        # copy the existing scene to our new NP
-        scene_root.copy_to(self.export_scene_np)
+        # copy the scene root itself, its children are added one by one
+        export_model_parent = self.export_scene_np.attach_new_node(
+            scene_root.node().make_copy())
 
-        # clean up the copied scene from parts it shouldn't export
-        self.cleanup_np(self.export_scene_np)
+        # copy the scene without the parts it shouldn't export
+        for obj in scene_root.get_children():
+            self.copy_filtered(obj, export_model_parent)
 
         self.browser = DirectFolderBrowser(
             self.save,
@@ -46,46 +52,66 @@ class Exporter:
             tooltip)
         self.browser.show()
 
-    def cleanup_np(self, root_np):
-        if root_np.get_tag("object_type") == "empty":
+    def copy_filtered(self, obj, parent_np):
+        """Copies obj and its children below parent_np node by node, leaving
+        out the editors helper geometry"""
+        object_type = obj.get_tag("object_type")
+        children = list(obj.get_children())
+
+        if object_type == "empty":
             # replace the visible axis with an empty NodePath
-            name = root_np.get_name()
-            pos = root_np.get_pos()
-            hpr = root_np.get_hpr()
-            parent = root_np.get_parent()
-
-            empty = NodePath(name)
-            empty.set_pos(pos)
-            empty.set_hpr(hpr)
-            empty.reparent_to(parent)
-
-            for child in list(root_np.get_children())[1:]:
-                child.reparent_to(empty)
-
-            root_np.remove_node()
-            root_np = empty
-
-        elif root_np.get_tag("object_type") == "collision":
-            root_np.hide()
-
-        elif root_np.get_tag("object_type") == "light":
-            # remove the light representation model
-            root_np.get_children()[0].remove_node()
-
-        elif root_np.get_tag("object_type") == "camera":
-            # create a camera and remove the dummy camera in the scene
-            lens = None
-            if root_np.get_tag("camera_type") == "PerspectiveLens":
-                lens = PerspectiveLens()
-            else:
-                lens = OrthographicLens()
-            cam = Camera(root_np.get_name(), lens)
-            cam_np = root_np.get_parent().attach_new_node(cam)
-            root_np.remove_node()
-            root_np = cam_np
-
-        for child in root_np.get_children():
-            self.cleanup_np(child)
+            copy_np = parent_np.attach_new_node(obj.get_name())
+            self.copy_node_properties(obj, copy_np)
+            children = children[1:]
+
+        elif object_type == "light":
+            copy_np = parent_np.attach_new_node(obj.node().make_copy())
+            # skip the light representation model
+            children = [
+                c for c in children
+                if c.node().as_light() is not None
+                or c.has_tag("scene_object_id")]
+
+        elif object_type == "camera":
+            # create a camera instead of the dummy camera in the scene
+            copy_np = parent_np.attach_new_node(self.create_camera(obj))
+            self.copy_node_properties(obj, copy_np)
+            # only keep scene objects parented to the camera
+            children = [c for c in children if c.has_tag("scene_object_id")]
+
+        else:
+            copy_np = parent_np.attach_new_node(obj.node().make_copy())
+            # the lights of models are only limited for the viewport
+            copy_np.set_state(get_export_state(obj))
+            if object_type == "collision":
+                copy_np.hide()
+
+        # drop the masks the editor uses to control the viewport display
+        copy_np.node().adjust_draw_mask(
+            DrawMask.all_off(), DrawMask.all_off(), EDITOR_VIEW_MASK)
+
+        if obj.has_tag("scene_object_id"):
+            # edited properties are only stored as string tag for the export
+            write_edited_tag(obj, copy_np)
+
+        for child in children:
+            self.copy_filtered(child, copy_np)
+        return copy_np
+
+    def copy_node_properties(self, obj, copy_np):
+        copy_np.set_transform(obj.get_transform())
+        for key in obj.get_tag_keys():
+            copy_np.set_tag(key, obj.get_tag(key))
+
+    def create_camera(self, obj):
+        cam_np = obj.find("+Camera")
+        if not cam_np.is_empty():
+            lens = cam_np.node().get_lens().make_copy()
+        elif obj.get_tag("camera_type") == "PerspectiveLens":
+            lens = PerspectiveLens()
+        else:
+            lens = OrthographicLens()
+        return Camera(obj.get_name(), lens)
 
     def save(self, doSave):
         if doSave:
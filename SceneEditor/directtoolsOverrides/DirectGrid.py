@@ -4,6 +4,43 @@ from direct.showbase.DirectObject import DirectObject
 from direct.directtools.DirectUtil import *
 from direct.directtools.DirectGeometry import *
 
+from array import array
+
+GRID_X_AXIS_COLOR = (1.0, 0.0, 0.0, 0.0)
+GRID_Y_AXIS_COLOR = (0.0, 1.0, 0.0, 0.0)
+
+# floats per vertex, three for the position and four for the color
+GRID_VERTEX_SIZE = 7
+gridVertexFormat = None
+
+def getGridVertexFormat():
+    # colors are stored as floats too so the vertices can be written as one
+    # flat float array
+    global gridVertexFormat
+    if gridVertexFormat is None:
+        arrayFormat = GeomVertexArrayFormat()
+        arrayFormat.addColumn(
+            InternalName.getVertex(), 3, Geom.NTFloat32, Geom.CPoint)
+        arrayFormat.addColumn(
+            InternalName.getColor(), 4, Geom.NTFloat32, Geom.CColor)
+        gridVertexFormat = GeomVertexFormat.registerFormat(arrayFormat)
+    return gridVertexFormat
+
+def getLineData(positions, size, yColor, xColor):
+    """Returns the vertices of a line along the y and one along the x axis
+    for each of the given positions. The vertices of one position are
+    repeated and only the position columns are replaced by strided slices."""
+    template = array('f',
+        (0, -size, 0) + yColor + (0, size, 0) + yColor
+        + (-size, 0, 0) + xColor + (size, 0, 0) + xColor)
+    data = template * len(positions)
+    positions = array('f', positions)
+    step = len(template)
+    data[0::step] = positions
+    data[GRID_VERTEX_SIZE::step] = positions
+    data[2 * GRID_VERTEX_SIZE + 1::step] = positions
+    data[3 * GRID_VERTEX_SIZE + 1::step] = positions
+    return data
 
 class DirectGrid(NodePath, DirectObject):
     def __init__(self,gridSize=100.0,gridSpacing=5.0,planeColor=(0.5,0.5,0.5,0.5),parent = None):
@@ -20,20 +57,10 @@ class DirectGrid(NodePath, DirectObject):
 
         # Grid Lines
         self.lines = self.attachNewNode('gridLines')
-        self.minorLines = LineNodePath(self.lines)
-        self.minorLines.lineNode.setName('minorLines')
-        self.minorLines.setColor(VBase4(0.3, 0.55, 1, 1))
-        self.minorLines.setThickness(1)
-
-        self.majorLines = LineNodePath(self.lines)
-        self.majorLines.lineNode.setName('majorLines')
-        self.majorLines.setColor(VBase4(0.3, 0.55, 1, 1))
-        self.majorLines.setThickness(5)
-
-        self.centerLines = LineNodePath(self.lines)
-        self.centerLines.lineNode.setName('centerLines')
-        self.centerLines.setColor(VBase4(1, 0, 0, 0))
-        self.centerLines.setThickness(3)
+        self.lineNode = GeomNode('gridLines')
+        self.lines.attachNewNode(self.lineNode)
+        self.minorColor = VBase4(0.3, 0.55, 1, 1)
+        self.majorColor = VBase4(0.3, 0.55, 1, 1)
 
         # Small marker to hilight snap-to-grid point
         self.snapMarker = base.loader.loadModel('models/misc/sphere')
@@ -75,44 +102,51 @@ class DirectGrid(NodePath, DirectObject):
 
     def updateGrid(self):
         # Update grid lines based upon current grid spacing and grid size
-        # First reset existing grid lines
-        self.minorLines.reset()
-        self.majorLines.reset()
-        self.centerLines.reset()
+        # All vertices are collected in flat float arrays and copied into
+        # the vertex data at once, one GeomLines per line thickness
+        self.lineNode.removeAllGeoms()
 
-        # Now redraw lines
         numLines = int(math.ceil(self.gridSize/self.gridSpacing))
         scaledSize = numLines * self.gridSpacing
 
-        center = self.centerLines
-        minor = self.minorLines
-        major = self.majorLines
+        minor = []
+        major = []
         for i in range(-numLines, numLines + 1):
             if i == 0:
-                center.setColor(VBase4(0, 1, 0, 0))
-                center.moveTo(i * self.gridSpacing, -scaledSize, 0)
-                center.drawTo(i * self.gridSpacing, scaledSize, 0)
-                center.setColor(VBase4(1, 0, 0, 0))
-                center.moveTo(-scaledSize, i * self.gridSpacing, 0)
-                center.drawTo(scaledSize, i * self.gridSpacing, 0)
+                continue
+            if (i % 5) == 0:
+                major.append(i * self.gridSpacing)
             else:
-                if (i % 5) == 0:
-                    major.moveTo(i * self.gridSpacing, -scaledSize, 0)
-                    major.drawTo(i * self.gridSpacing, scaledSize, 0)
-                    major.moveTo(-scaledSize, i * self.gridSpacing, 0)
-                    major.drawTo(scaledSize, i * self.gridSpacing, 0)
-                else:
-                    minor.moveTo(i * self.gridSpacing, -scaledSize, 0)
-                    minor.drawTo(i * self.gridSpacing, scaledSize, 0)
-                    minor.moveTo(-scaledSize, i * self.gridSpacing, 0)
-                    minor.drawTo(scaledSize, i * self.gridSpacing, 0)
-
-        center.create()
-        minor.create()
-        major.create()
+                minor.append(i * self.gridSpacing)
+
+        minorColor = tuple(self.minorColor)
+        majorColor = tuple(self.majorColor)
+        minor = getLineData(minor, scaledSize, minorColor, minorColor)
+        major = getLineData(major, scaledSize, majorColor, majorColor)
+        center = getLineData(
+            [0], scaledSize, GRID_Y_AXIS_COLOR, GRID_X_AXIS_COLOR)
+
+        self.addLines('minorLines', minor, 1)
+        self.addLines('majorLines', major, 5)
+        self.addLines('centerLines', center, 3)
         if self.gridBack:
             self.gridBack.setScale(scaledSize)
 
+    def addLines(self, name, data, thickness):
+        numVertices = len(data) // GRID_VERTEX_SIZE
+        if numVertices == 0:
+            return
+        vdata = GeomVertexData(name, getGridVertexFormat(), Geom.UHStatic)
+        vdata.uncleanSetNumRows(numVertices)
+        memoryview(vdata.modifyArray(0)).cast('B').cast('f')[:] = data
+
+        lines = GeomLines(Geom.UHStatic)
+        lines.addConsecutiveVertices(0, numVertices)
+        geom = Geom(vdata)
+        geom.addPrimitive(lines)
+        self.lineNode.addGeom(geom, RenderState.make(
+            RenderModeAttrib.make(RenderModeAttrib.MUnchanged, thickness)))
+
     def setXyzSnap(self, fSnap):
         self.fXyzSnap = fSnap
 
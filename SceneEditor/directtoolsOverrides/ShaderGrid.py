@@ -0,0 +1,144 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+from panda3d.core import (
+    CardMaker,
+    OmniBoundingVolume,
+    Shader,
+    TransparencyAttrib)
+
+from SceneEditor.directtoolsOverrides.DirectGrid import DirectGrid
+
+GRID_VERTEX_SHADER = """
+#version 120
+
+uniform mat4 p3d_ModelViewProjectionMatrix;
+uniform mat4 p3d_ModelViewMatrix;
+uniform mat4 p3d_ModelViewMatrixInverse;
+uniform float grid_size;
+
+attribute vec4 p3d_Vertex;
+
+varying vec2 grid_pos;
+varying float view_distance;
+
+void main() {
+    // keep the quad centered below the camera so the grid never ends
+    vec4 vertex = p3d_Vertex;
+    vertex.xy = vertex.xy * grid_size + p3d_ModelViewMatrixInverse[3].xy;
+
+    grid_pos = vertex.xy;
+    view_distance = length((p3d_ModelViewMatrix * vertex).xyz);
+    gl_Position = p3d_ModelViewProjectionMatrix * vertex;
+}
+"""
+
+GRID_FRAGMENT_SHADER = """
+#version 120
+
+uniform float grid_spacing;
+uniform float grid_fade_distance;
+uniform float grid_min_cell_pixels;
+uniform vec4 grid_line_color;
+uniform vec4 grid_plane_color;
+
+varying vec2 grid_pos;
+varying float view_distance;
+
+// coverage of the lines of the given spacing at this fragment, width in pixels
+float grid_line(vec2 pos, float spacing, float width) {
+    vec2 coord = pos / spacing;
+    vec2 pixels = abs(fract(coord - 0.5) - 0.5) / fwidth(coord);
+    return 1.0 - min(min(pixels.x, pixels.y) / width, 1.0);
+}
+
+float axis_line(float pos, float width) {
+    return 1.0 - min(abs(pos) / fwidth(pos) / width, 1.0);
+}
+
+void main() {
+    // pick the finest spacing which still leaves the cells wide enough on
+    // screen, each level has five times the spacing of the one below
+    float units_per_pixel = max(length(fwidth(grid_pos)), 1e-6);
+    float lod = max(0.0, log(
+        units_per_pixel * grid_min_cell_pixels / grid_spacing) / log(5.0));
+    float minor_spacing = grid_spacing * pow(5.0, floor(lod));
+    float major_spacing = minor_spacing * 5.0;
+
+    // fade out the minor lines before they get replaced by the next level
+    float lines = max(
+        grid_line(grid_pos, minor_spacing, 1.0) * (1.0 - fract(lod)),
+        grid_line(grid_pos, major_spacing, 2.0));
+
+    vec4 color = mix(grid_plane_color, grid_line_color, lines);
+    color = mix(color, vec4(1.0, 0.0, 0.0, 1.0), axis_line(grid_pos.y, 2.0));
+    color = mix(color, vec4(0.0, 1.0, 0.0, 1.0), axis_line(grid_pos.x, 2.0));
+    color.a *= 1.0 - smoothstep(
+        grid_fade_distance * 0.5, grid_fade_distance, view_distance);
+
+    gl_FragColor = color;
+}
+"""
+
+class ShaderGrid(DirectGrid):
+    """A grid drawn by a fragment shader on a single quad instead of line
+    geometry. The lines density adapts to the distance of the camera and the
+    grid fades out at gridSize units away from it."""
+
+    def __init__(self,
+            gridSize=100.0,
+            gridSpacing=5.0,
+            planeColor=(0.5,0.5,0.5,0.5),
+            lineColor=(0.3,0.55,1,1),
+            minCellPixels=8.0,
+            parent=None):
+        self.gridQuad = None
+        self.planeColor = planeColor
+        self.lineColor = lineColor
+        self.minCellPixels = minCellPixels
+        DirectGrid.__init__(self, gridSize, gridSpacing, planeColor, parent)
+
+        # the shader draws the plane itself
+        self.gridBack.remove_node()
+        self.gridBack = None
+
+    @staticmethod
+    def isSupported():
+        gsg = base.win.get_gsg()
+        return gsg is not None and gsg.get_supports_glsl()
+
+    def createQuad(self):
+        cm = CardMaker("gridQuad")
+        cm.set_frame(-1, 1, -1, 1)
+        self.gridQuad = self.attach_new_node(cm.generate())
+        # lay the card flat on the XY plane facing upwards
+        self.gridQuad.set_p(-90)
+        self.gridQuad.flatten_light()
+
+        # the quad is moved in the vertex shader, so it may never get culled
+        self.gridQuad.node().set_bounds(OmniBoundingVolume())
+        self.gridQuad.node().set_final(True)
+
+        self.gridQuad.set_two_sided(True)
+        self.gridQuad.set_transparency(TransparencyAttrib.M_alpha)
+        self.gridQuad.set_depth_write(False)
+        self.gridQuad.set_shader(Shader.make(
+            Shader.SL_GLSL, GRID_VERTEX_SHADER, GRID_FRAGMENT_SHADER))
+        self.gridQuad.set_shader_input("grid_line_color", self.lineColor)
+        self.gridQuad.set_shader_input("grid_plane_color", self.planeColor)
+        self.gridQuad.set_shader_input(
+            "grid_min_cell_pixels", self.minCellPixels)
+
+    def updateGrid(self):
+        # Only the shader inputs change, no geometry has to be rebuilt
+        if self.gridQuad is None:
+            self.createQuad()
+        self.gridQuad.set_shader_input("grid_size", float(self.gridSize))
+        self.gridQuad.set_shader_input("grid_spacing", float(self.gridSpacing))
+        self.gridQuad.set_shader_input(
+            "grid_fade_distance", float(self.gridSize))
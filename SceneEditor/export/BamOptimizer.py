@@ -0,0 +1,158 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import math
+import logging
+
+from panda3d.core import (
+    ConfigVariableString,
+    ConfigVariableDouble)
+
+# Tags the editor sets on its scene objects. Models that don't carry any other
+# tags are considered plain level geometry which may be merged on export.
+EDITOR_TAGS = [
+    "object_type",
+    "scene_object_id",
+    "filepath",
+    "edited_properties",
+    "collision_solid_type",
+    "collision_solid_info",
+    "light_type",
+    "camera_type",
+]
+
+FLATTEN_MODES = ["light", "medium", "strong"]
+
+def get_cell_key(pos, cell_size, cell_height=0):
+    """Returns the grid cell a position falls into. A cell size of 0 will put
+    everything into one cell, a cell height of 0 disables vertical splitting"""
+    if cell_size <= 0:
+        return (0, 0, 0)
+    z = 0
+    if cell_height > 0:
+        z = math.floor(pos.z / cell_height)
+    return (
+        math.floor(pos.x / cell_size),
+        math.floor(pos.y / cell_size),
+        z)
+
+def get_scene_stats(root_np):
+    """Returns the amount of nodes and Geoms below (and including) the given
+    NodePath"""
+    num_nodes = root_np.find_all_matches("**").get_num_paths()
+    num_geoms = 0
+    for geom_np in root_np.find_all_matches("**/+GeomNode"):
+        num_geoms += geom_np.node().get_num_geoms()
+    return {"nodes": num_nodes, "geoms": num_geoms}
+
+class BamOptimizer:
+    def __init__(self, mode=None, chunk_size=None):
+        # the flatten operation to run on the merged models
+        if mode is None:
+            mode = ConfigVariableString(
+                "scene-editor-bam-optimize", "none").getValue()
+        self.mode = mode
+
+        # size of the regions models will be grouped in, 0 disables chunking
+        if chunk_size is None:
+            chunk_size = ConfigVariableDouble(
+                "scene-editor-bam-chunk-size", 0.0).getValue()
+        self.chunk_size = chunk_size
+
+        self.report = {}
+
+    def is_enabled(self):
+        return self.mode in FLATTEN_MODES
+
+    def optimize(self, root_np):
+        """Merges all static models below root_np into one node per chunk and
+        flattens them so Geoms sharing the same render state (material) get
+        combined. Returns a report with node and Geom counts before and after
+        the optimization."""
+        stats_before = get_scene_stats(root_np)
+
+        chunks = {}
+        for model in self.get_static_models(root_np):
+            key = get_cell_key(model.get_pos(root_np), self.chunk_size)
+            if key not in chunks:
+                chunks[key] = []
+            chunks[key].append(model)
+
+        num_models = 0
+        for key, models in chunks.items():
+            self.merge_models(root_np, key, models)
+            num_models += len(models)
+
+        self.report = {
+            "mode": self.mode,
+            "chunk_size": self.chunk_size,
+            "chunks": len(chunks),
+            "merged_models": num_models,
+            "before": stats_before,
+            "after": get_scene_stats(root_np),
+        }
+
+        logging.info(
+            f"Optimized BAM export ({self.mode}): merged {num_models} models "
+            f"into {len(chunks)} chunks, "
+            f"nodes {stats_before['nodes']} -> {self.report['after']['nodes']}, "
+            f"geoms {stats_before['geoms']} -> {self.report['after']['geoms']}")
+        return self.report
+
+    def get_static_models(self, root_np):
+        """Returns the static models directly below root_np. Models parented
+        to other scene objects stay in place, merging would move them out of
+        the hierarchy the game may rely on."""
+        models = []
+        for model in root_np.get_children():
+            if model.get_tag("object_type") == "model" \
+            and self.is_static_model(model):
+                models.append(model)
+        return models
+
+    def is_static_model(self, model):
+        if model.is_hidden():
+            return False
+
+        # models tagged with anything else than the editors own tags are
+        # probably looked up by the game and have to stay separate nodes
+        for key in model.get_tag_keys():
+            if key not in EDITOR_TAGS:
+                return False
+
+        # other scene objects parented to this model need it as a node
+        if not model.find("*/**/=scene_object_id").is_empty():
+            return False
+
+        # merging would defeat the level switching
+        if not model.find("**/+LODNode").is_empty():
+            return False
+
+        # animated models need to keep their own character node
+        if not model.find("**/+Character").is_empty():
+            return False
+
+        return True
+
+    def merge_models(self, root_np, key, models):
+        chunk_np = root_np.attach_new_node("static_chunk_{}_{}_{}".format(*key))
+        for model in models:
+            for tag in EDITOR_TAGS:
+                model.clear_tag(tag)
+            model.wrt_reparent_to(chunk_np)
+
+        # let the flatten remove the model root nodes too
+        chunk_np.clear_model_nodes()
+
+        if self.mode == "light":
+            chunk_np.flatten_light()
+        elif self.mode == "medium":
+            chunk_np.flatten_medium()
+        else:
+            chunk_np.flatten_strong()
+        return chunk_np
@@ -0,0 +1,154 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import os
+import json
+import logging
+from panda3d.core import ConfigVariableDouble
+from panda3d.core import NodePath
+
+from SceneEditor.export.ExportBam import ExporterBam
+from SceneEditor.export.BamOptimizer import get_cell_key
+from SceneEditor.core.LightHandler import GLOBAL_LIGHT_TYPES
+from SceneEditor.tools.Instrumentation import timed
+
+# objects which affect the whole level and hence can't be streamed by
+# position, besides the lights reaching every object
+GLOBAL_SOLID_TYPES = ["CollisionPlane", "CollisionInvSphere"]
+
+class ExporterBamCells(ExporterBam):
+    """Exports the scene as a set of BAM files, one for each cell of a grid
+    laid over the scene, plus one for objects that can't be streamed and an
+    index file describing the cells bounds."""
+
+    modifies_scene = True
+
+    def prepare_export(self):
+        self.cell_size = ConfigVariableDouble(
+            "scene-editor-bam-cell-size", 100.0).getValue()
+        self.cell_height = ConfigVariableDouble(
+            "scene-editor-bam-cell-height", 0.0).getValue()
+
+        self.global_np = NodePath("global")
+        self.cells = {}
+
+        for obj in self.export_model_parent.get_children():
+            if self.is_global_object(obj):
+                obj.wrt_reparent_to(self.global_np)
+                continue
+
+            bounds = obj.get_tight_bounds(self.export_model_parent)
+            if bounds is None:
+                # objects without geometry only have their position
+                pos = obj.get_pos(self.export_model_parent)
+                bounds = (pos, pos)
+            center = (bounds[0] + bounds[1]) / 2
+
+            key = get_cell_key(center, self.cell_size, self.cell_height)
+            if key not in self.cells:
+                self.cells[key] = {
+                    "np": NodePath("cell_{}_{}_{}".format(*key)),
+                    "min": bounds[0],
+                    "max": bounds[1],
+                    "objects": 0,
+                }
+            cell = self.cells[key]
+            cell["min"] = cell["min"].fmin(bounds[0])
+            cell["max"] = cell["max"].fmax(bounds[1])
+            cell["objects"] += 1
+            obj.wrt_reparent_to(cell["np"])
+
+        # merge static geometry per cell so no merged chunk spans cells
+        if self.optimizer.is_enabled():
+            for cell in self.cells.values():
+                self.optimizer.optimize(cell["np"])
+
+    def is_global_object(self, obj):
+        if obj.get_tag("light_type") in GLOBAL_LIGHT_TYPES:
+            return True
+        if obj.get_tag("collision_solid_type") in GLOBAL_SOLID_TYPES:
+            return True
+        return False
+
+    def get_index_path(self, path):
+        return os.path.splitext(path)[0] + ".json"
+
+    def export_exists(self, path):
+        # the chosen .bam file itself is never written, the index and global
+        # file are what an earlier export left behind
+        base_path = os.path.splitext(path)[0]
+        return os.path.exists(self.get_index_path(path)) \
+            or os.path.exists(base_path + "_global.bam")
+
+    @timed("Export:BamCellsWrite")
+    def write(self, path):
+        base_path = os.path.splitext(path)[0]
+        base_name = os.path.basename(base_path)
+        index_path = self.get_index_path(path)
+
+        self.remove_old_cells(index_path, base_name)
+
+        index = {
+            "cell_size": self.cell_size,
+            "cell_height": self.cell_height,
+            "global": f"{base_name}_global.bam",
+            "cells": [],
+        }
+        self.global_np.writeBamFile(base_path + "_global.bam")
+
+        for key, cell in self.cells.items():
+            cell_file = "{}_{}_{}_{}.bam".format(base_name, *key)
+            cell["np"].writeBamFile(
+                os.path.join(os.path.dirname(path), cell_file))
+            index["cells"].append({
+                "file": cell_file,
+                "cell": list(key),
+                "min": list(cell["min"]),
+                "max": list(cell["max"]),
+                "objects": cell["objects"],
+            })
+
+        with open(index_path, 'w') as outfile:
+            json.dump(index, outfile, indent=2)
+        logging.info(f"Wrote {len(self.cells)} scene cells to {index_path}")
+
+    def remove_old_cells(self, index_path, base_name):
+        """Removes the cells of a previous export to the same index, so no
+        stale cells stay around"""
+        if not os.path.exists(index_path):
+            return
+        try:
+            with open(index_path, 'r') as infile:
+                old_index = json.load(infile)
+        except Exception:
+            logging.exception(f"Couldn't read old cell index {index_path}")
+            return
+
+        # only touch files listed in an index written by this exporter
+        if not isinstance(old_index, dict) \
+        or "cell_size" not in old_index \
+        or "global" not in old_index \
+        or not isinstance(old_index.get("cells"), list):
+            logging.warning(f"{index_path} is no cell index, keeping its files")
+            return
+
+        dir_name = os.path.dirname(index_path)
+        for cell in old_index["cells"]:
+            cell_file = cell.get("file", "") if isinstance(cell, dict) else ""
+            # cell files are always written next to the index
+            if os.path.basename(cell_file) != cell_file \
+            or not cell_file.startswith(f"{base_name}_") \
+            or not cell_file.endswith(".bam"):
+                logging.warning(f"Keeping {cell_file}, it's not a cell of {base_name}")
+                continue
+            cell_path = os.path.join(dir_name, cell_file)
+            if os.path.exists(cell_path):
+                try:
+                    os.remove(cell_path)
+                except OSError:
+                    logging.exception(f"Couldn't remove old cell {cell_path}")
@@ -0,0 +1,100 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import hashlib
+import logging
+
+from SceneEditor.GUI.panels.ObjectPropertiesDefinition import DEFINITIONS
+from SceneEditor.GUI.panels.PropertiesPanel import PropertyHelper
+from SceneEditor.tools.EditedProperties import get_edited_properties
+from SceneEditor.core.LightHandler import get_export_state
+
+class ExportCache:
+    """Keeps the exported version of each top level scene object together with
+    a hash of the objects state, so objects which didn't change since the last
+    export don't need to be copied and cleaned up again."""
+
+    def __init__(self):
+        # scene object id -> [state hash, exported NodePath]
+        self.entries = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_object_hash(self, obj):
+        """Returns a hash over the state of the given object and all scene
+        objects below it"""
+        state_hash = hashlib.sha1()
+        for scene_object in [obj] + list(obj.find_all_matches("*/**/=scene_object_id")):
+            state_hash.update(self.get_object_state(scene_object).encode())
+        return state_hash.hexdigest()
+
+    def get_object_state(self, obj):
+        state = [
+            obj.get_name(),
+            str(obj.get_transform()),
+            str(get_export_state(obj)),
+            str(obj.is_hidden()),
+        ]
+
+        for key in sorted(obj.get_tag_keys()):
+            state.append(f"{key}={obj.get_tag(key)}")
+
+        # add all edited properties
+        object_type = obj.get_tag("object_type")
+        if object_type == "light":
+            object_type = obj.get_tag("light_type")
+        elif object_type == "collision":
+            object_type = obj.get_tag("collision_solid_type")
+        elif object_type == "camera":
+            object_type = obj.get_tag("camera_type")
+
+        edit_list = get_edited_properties(obj)
+        for definition in DEFINITIONS.get(object_type, []):
+            if definition.internalName == "" \
+            or definition.internalName not in edit_list:
+                continue
+            value = PropertyHelper.getValues(definition, obj)
+            state.append(f"{definition.internalName}={value}")
+
+        return "|".join(state)
+
+    def get(self, object_id, state_hash):
+        if object_id in self.entries \
+        and self.entries[object_id][0] == state_hash:
+            self.hits += 1
+            return self.entries[object_id][1]
+        self.misses += 1
+        return None
+
+    def store(self, object_id, state_hash, export_np):
+        self.entries[object_id] = [state_hash, export_np]
+
+    def prune(self, object_ids):
+        """Drops the entries of all objects not in the given list of ids"""
+        object_ids = set(object_ids)
+        for object_id in list(self.entries.keys()):
+            if object_id not in object_ids:
+                self.entries[object_id][1].remove_node()
+                del self.entries[object_id]
+
+    def prune_removed(self, scene_root):
+        """Drops the entries of all objects no longer in the scene"""
+        if len(self.entries) == 0:
+            return
+        self.prune([obj.get_tag("scene_object_id") for obj in scene_root.get_children()])
+
+    def clear(self):
+        self.prune([])
+
+    def log_stats(self):
+        logging.info(
+            f"Export cache reused {self.hits} objects, "
+            f"exported {self.misses} changed objects")
+        self.hits = 0
+        self.misses = 0
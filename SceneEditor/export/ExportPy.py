@@ -18,7 +18,10 @@ from panda3d.core import LPlane
 
 from DirectFolderBrowser.DirectFolderBrowser import DirectFolderBrowser
 
+from SceneEditor.tools.Instrumentation import timed
+
 class ExporterPy:
+    @timed("Export:Python")
     def __init__(self, save_path, save_file, scene_root, scene_objects, tooltip):
         self.objects = scene_objects
 
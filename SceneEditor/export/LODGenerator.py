@@ -0,0 +1,232 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import os
+import math
+import hashlib
+import logging
+
+from panda3d.core import (
+    ConfigVariableBool,
+    ConfigVariableDouble,
+    ConfigVariableString,
+    VirtualFileSystem,
+    Filename,
+    NodePath,
+    ModelRoot,
+    LODNode,
+    Geom,
+    GeomTriangles,
+    GeomVertexData,
+    GeomVertexReader,
+    Thread,
+    LPoint3f,
+    getModelPath)
+
+class LODGenerator:
+    def __init__(self):
+        self.enabled = ConfigVariableBool(
+            "scene-editor-bam-generate-lod", False).getValue()
+
+        # the ratio of vertices each additional level should keep
+        ratios = ConfigVariableDouble("scene-editor-lod-ratios", "0.5 0.2")
+        self.ratios = [ratios[i] for i in range(ratios.get_num_words())]
+
+        # the distances at which each level gets switched out, this needs one
+        # entry more than the ratios for the full detail level
+        distances = ConfigVariableDouble(
+            "scene-editor-lod-distances", "50 150 400")
+        self.distances = [
+            distances[i] for i in range(distances.get_num_words())]
+
+        cache_path = ConfigVariableString(
+            "scene-editor-lod-cache-path",
+            os.path.join("~", ".SceneEditor", "lod_cache")).getValue()
+        self.cache_path = os.path.expanduser(cache_path)
+
+        # LOD trees generated during this export, keyed by model file
+        self.lod_nps = {}
+
+    def is_enabled(self):
+        if not self.enabled:
+            return False
+        if len(self.distances) != len(self.ratios) + 1:
+            logging.warning(
+                "LOD generation disabled, scene-editor-lod-distances needs "
+                "one entry more than scene-editor-lod-ratios")
+            return False
+        return True
+
+    def generate(self, root_np):
+        """Replaces the geometry of all models below root_np with a LODNode
+        shared by all models loaded from the same file"""
+        for model in root_np.find_all_matches("**/=object_type=model"):
+            # animated models can't be decimated this simple way
+            if not model.find("**/+Character").is_empty():
+                continue
+
+            filepath = model.get_tag("filepath")
+            if filepath not in self.lod_nps:
+                self.lod_nps[filepath] = self.get_lod_np(model)
+            lod_np = self.lod_nps[filepath]
+            if lod_np is None:
+                continue
+
+            # swap the geometry while keeping objects parented to the model
+            for child in model.get_children():
+                if not child.has_tag("scene_object_id"):
+                    child.remove_node()
+            lod_np.instance_to(model)
+
+    def get_lod_np(self, model):
+        source_hash = self.get_source_hash(model)
+        if source_hash is None:
+            return None
+
+        cache_file = os.path.join(self.cache_path, f"{source_hash}.bam")
+        if os.path.exists(cache_file):
+            logging.debug(f"Load LOD for {model.get_tag('filepath')} from cache")
+            return loader.load_model(
+                Filename.from_os_specific(cache_file), noCache=True)
+
+        lod_np = self.create_lod_np(model)
+
+        if not os.path.exists(self.cache_path):
+            os.makedirs(self.cache_path)
+        lod_np.write_bam_file(Filename.from_os_specific(cache_file))
+        return lod_np
+
+    def get_source_hash(self, model):
+        vfs = VirtualFileSystem.get_global_ptr()
+        fullpath = Filename()
+        if isinstance(model.node(), ModelRoot):
+            fullpath = model.node().get_fullpath()
+        if fullpath.empty():
+            fullpath = Filename(model.get_tag("filepath"))
+            vfs.resolve_filename(fullpath, getModelPath().get_value())
+        if not vfs.exists(fullpath):
+            logging.warning(f"Can't create LOD, file {fullpath} not found")
+            return None
+
+        # the settings are part of the key as they change the generated levels
+        source_hash = hashlib.sha1(vfs.read_file(fullpath, True))
+        source_hash.update(str(self.ratios).encode())
+        source_hash.update(str(self.distances).encode())
+        return source_hash.hexdigest()
+
+    def create_lod_np(self, model):
+        lod_np = NodePath(LODNode(f"{model.get_name()}_lod"))
+
+        # the first level is the full detail model
+        level_np = lod_np.attach_new_node("level_0")
+        for child in model.get_children():
+            if not child.has_tag("scene_object_id"):
+                child.copy_to(level_np)
+        lod_np.node().add_switch(self.distances[0], 0)
+
+        for i, ratio in enumerate(self.ratios):
+            decimated_np = level_np.copy_to(lod_np)
+            decimated_np.set_name(f"level_{i + 1}")
+            for geom_np in decimated_np.find_all_matches("**/+GeomNode"):
+                self.decimate_geom_node(geom_np.node(), ratio)
+            lod_np.node().add_switch(self.distances[i + 1], self.distances[i])
+
+        return lod_np
+
+    def decimate_geom_node(self, geom_node, ratio):
+        for i in reversed(range(geom_node.get_num_geoms())):
+            geom = self.decimate_geom(geom_node.get_geom(i), ratio)
+            if geom is None:
+                geom_node.remove_geom(i)
+            else:
+                geom_node.set_geom(i, geom)
+
+    def decimate_geom(self, geom, ratio):
+        """Simplifies the given geom by vertex clustering. All vertices falling
+        into the same cell of a grid laid over the geom are merged and
+        triangles which collapse this way are dropped."""
+        vdata = geom.get_vertex_data()
+        if not vdata.has_column("vertex") \
+        or vdata.get_transform_blend_table() is not None:
+            return geom
+
+        num_rows = vdata.get_num_rows()
+        reader = GeomVertexReader(vdata, "vertex")
+        positions = []
+        while not reader.is_at_end():
+            positions.append(reader.get_data3())
+        if num_rows < 4:
+            return geom
+
+        min_point = LPoint3f(positions[0])
+        max_point = LPoint3f(positions[0])
+        for pos in positions:
+            min_point = min_point.fmin(pos)
+            max_point = max_point.fmax(pos)
+
+        # vertices of surfaces roughly scale with the square of the resolution
+        resolution = max(1, int(math.sqrt(num_rows * ratio)))
+        extent = max_point - min_point
+        cell_size = max(extent.x, extent.y, extent.z) / resolution
+        if cell_size <= 0:
+            return geom
+
+        # map each vertex to the first vertex found in its cell
+        clusters = {}
+        vertex_map = []
+        for row, pos in enumerate(positions):
+            key = (
+                int((pos.x - min_point.x) / cell_size),
+                int((pos.y - min_point.y) / cell_size),
+                int((pos.z - min_point.z) / cell_size))
+            if key not in clusters:
+                clusters[key] = row
+            vertex_map.append(clusters[key])
+
+        polygon_prims = []
+        for prim in geom.get_primitives():
+            if prim.get_primitive_type() == Geom.PT_polygons:
+                polygon_prims.append(prim)
+        if len(polygon_prims) == 0:
+            # lines and points are kept as they are
+            return geom
+
+        triangles = []
+        for prim in polygon_prims:
+            prim = prim.decompose()
+            for j in range(prim.get_num_primitives()):
+                start = prim.get_primitive_start(j)
+                triangle = [
+                    vertex_map[prim.get_vertex(start + k)] for k in range(3)]
+                if len(set(triangle)) == 3:
+                    triangles.append(triangle)
+
+        if len(triangles) == 0:
+            return None
+
+        # only copy the vertices still in use to the new vertex data
+        new_rows = {}
+        for triangle in triangles:
+            for row in triangle:
+                if row not in new_rows:
+                    new_rows[row] = len(new_rows)
+
+        new_vdata = GeomVertexData(
+            vdata.get_name(), vdata.get_format(), Geom.UH_static)
+        new_vdata.set_num_rows(len(new_rows))
+        thread = Thread.get_current_thread()
+        for row, new_row in new_rows.items():
+            new_vdata.copy_row_from(new_row, vdata, row, thread)
+
+        new_prim = GeomTriangles(Geom.UH_static)
+        for triangle in triangles:
+            new_prim.add_vertices(*[new_rows[row] for row in triangle])
+
+        new_geom = Geom(new_vdata)
+        new_geom.add_primitive(new_prim)
+        return new_geom
@@ -0,0 +1,258 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+
+from panda3d.core import (
+    ConfigVariableBool,
+    ConfigVariableInt,
+    ConfigVariableString,
+    VirtualFileSystem,
+    Filename,
+    BamFile,
+    BamWriter,
+    ModelRoot,
+    NodePath,
+    getModelPath)
+
+# files which are loaded as they are, converting them wouldn't be faster
+BAM_EXTENSIONS = [".bam", ".bam.pz"]
+
+INDEX_FILE = "index.json"
+
+# folder next to the project file the cache is kept in
+PROJECT_CACHE_FOLDER = ".scene_editor_cache"
+
+def get_timestamp(fullpath):
+    vfile = VirtualFileSystem.get_global_ptr().get_file(fullpath, True)
+    if vfile is None:
+        return 0
+    return vfile.get_timestamp()
+
+class AssetCache:
+    """Stores models loaded from source files like egg or gltf as BAM files,
+    keyed by the path and content of the source, so later sessions can load
+    the BAM instead of parsing the source again. The least recently used
+    files get removed once the cache grows above its size limit.
+
+    The cache lies in a folder next to the project file. Until a project has
+    been saved or loaded, the global fallback folder in the users home is
+    used, as new scenes don't have a folder yet."""
+
+    def __init__(self):
+        self.enabled = ConfigVariableBool(
+            "scene-editor-asset-cache", False).getValue()
+        # a fixed folder for all projects, empty keeps the cache per project
+        self.fixed_cache_path = os.path.expanduser(ConfigVariableString(
+            "scene-editor-asset-cache-path", "").getValue())
+        self.cache_path = self.fixed_cache_path
+        if self.cache_path == "":
+            self.cache_path = os.path.expanduser(
+                os.path.join("~", ".SceneEditor", "asset_cache"))
+        # the size limit is given in megabytes
+        self.max_size = ConfigVariableInt(
+            "scene-editor-asset-cache-size", 1024).getValue() * 1024 * 1024
+
+        # cache key -> {"source", "size", "last_used"}
+        self.entries = {}
+        # the index only gets written once per load, not on every hit
+        self.index_dirty = False
+
+        # model path -> (source file, timestamp, model) of the models loaded
+        # in this session, further loads of the unchanged source get a copy
+        self.models = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.session_hits = 0
+        self.evictions = 0
+
+        if self.enabled:
+            self.read_index()
+
+    def set_project_path(self, project_file):
+        """Moves the cache to the folder of the given project file unless a
+        fixed cache folder is configured"""
+        if not self.enabled or self.fixed_cache_path != "":
+            return
+        project_path = os.path.dirname(os.path.abspath(project_file))
+        if project_path == tempfile.gettempdir():
+            # exception and auto saves aren't projects of their own
+            return
+        cache_path = os.path.join(project_path, PROJECT_CACHE_FOLDER)
+        if cache_path == self.cache_path:
+            return
+        self.flush()
+        self.cache_path = cache_path
+        self.entries = {}
+        self.models = {}
+        self.read_index()
+
+    def clear_session(self):
+        """Drops the models kept for reuse, e.g. when a new project starts"""
+        self.models = {}
+
+    def get_index_path(self):
+        return os.path.join(self.cache_path, INDEX_FILE)
+
+    def get_cache_file(self, key):
+        return os.path.join(self.cache_path, f"{key}.bam")
+
+    def read_index(self):
+        index_path = self.get_index_path()
+        if not os.path.exists(index_path):
+            return
+        try:
+            with open(index_path, "r") as index_file:
+                entries = json.load(index_file)
+        except Exception:
+            logging.exception("Couldn't read the asset cache index, starting with an empty cache")
+            return
+        # drop entries whose files have been removed by hand
+        self.entries = {
+            key: entry for key, entry in entries.items()
+            if os.path.exists(self.get_cache_file(key))}
+
+    def write_index(self):
+        if not os.path.exists(self.cache_path):
+            os.makedirs(self.cache_path)
+        with open(self.get_index_path(), "w") as index_file:
+            json.dump(self.entries, index_file, indent=4)
+        self.index_dirty = False
+
+    def flush(self):
+        """Writes the index if it changed since it was last written"""
+        if self.index_dirty:
+            self.write_index()
+
+    def get_source_key(self, path):
+        """Returns the resolved source file and the cache key of the given
+        model path or None if the model can't be cached"""
+        vfs = VirtualFileSystem.get_global_ptr()
+        fullpath = Filename(path)
+        vfs.resolve_filename(fullpath, getModelPath().get_value())
+        if not vfs.exists(fullpath):
+            return None, None
+        for extension in BAM_EXTENSIONS:
+            if str(fullpath).lower().endswith(extension):
+                return None, None
+
+        source_hash = hashlib.sha1(str(fullpath).encode())
+        source_hash.update(vfs.read_file(fullpath, True))
+        return fullpath, source_hash.hexdigest()
+
+    def load_model(self, path):
+        """Loads the model at the given path, from the cache if possible"""
+        if not self.enabled:
+            return loader.load_model(path)
+
+        if path in self.models:
+            fullpath, timestamp, model = self.models[path]
+            if get_timestamp(fullpath) == timestamp:
+                self.session_hits += 1
+                return model.copy_to(NodePath())
+            # the source changed on disk, load it again
+            del self.models[path]
+
+        fullpath, key = self.get_source_key(path)
+        if key is None:
+            return loader.load_model(path)
+
+        if key in self.entries:
+            self.hits += 1
+            model = loader.load_model(
+                Filename.from_os_specific(self.get_cache_file(key)))
+            if isinstance(model.node(), ModelRoot):
+                # keep pointing to the source, e.g. for the LOD generation
+                model.node().set_fullpath(fullpath)
+            self.entries[key]["last_used"] = time.time()
+            self.index_dirty = True
+        else:
+            self.misses += 1
+            model = loader.load_model(path)
+            self.store(key, fullpath, model)
+
+        # keep an untouched copy, the returned model gets edited in the scene
+        self.models[path] = (
+            fullpath, get_timestamp(fullpath), model.copy_to(NodePath()))
+        return model
+
+    def store(self, key, fullpath, model):
+        if not os.path.exists(self.cache_path):
+            os.makedirs(self.cache_path)
+        cache_file = self.get_cache_file(key)
+
+        bam_file = BamFile()
+        if not bam_file.open_write(Filename.from_os_specific(cache_file)):
+            logging.warning(f"Couldn't write {cache_file} to the asset cache")
+            return
+        # textures are referenced by their full path, the cache doesn't lie
+        # next to the source file
+        bam_file.get_writer().set_file_texture_mode(BamWriter.BTM_fullpath)
+        written = bam_file.write_object(model.node())
+        bam_file.close()
+        if not written:
+            logging.warning(f"Couldn't write {cache_file} to the asset cache")
+            if os.path.exists(cache_file):
+                os.remove(cache_file)
+            return
+
+        self.entries[key] = {
+            "source": str(fullpath),
+            "size": os.path.getsize(cache_file),
+            "last_used": time.time(),
+        }
+        self.evict()
+        self.index_dirty = True
+
+    def get_size(self):
+        return sum(entry["size"] for entry in self.entries.values())
+
+    def evict(self):
+        """Removes the least recently used files until the cache fits into
+        its size limit"""
+        size = self.get_size()
+        by_last_use = sorted(
+            self.entries.items(), key=lambda item: item[1]["last_used"])
+        for key, entry in by_last_use:
+            if size <= self.max_size:
+                break
+            cache_file = self.get_cache_file(key)
+            if os.path.exists(cache_file):
+                os.remove(cache_file)
+            del self.entries[key]
+            size -= entry["size"]
+            self.evictions += 1
+
+    def get_stats(self):
+        return {
+            "enabled": self.enabled,
+            "path": self.cache_path,
+            "entries": len(self.entries),
+            "size": self.get_size(),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "session_hits": self.session_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def log_stats(self):
+        stats = self.get_stats()
+        logging.info(
+            f"Asset cache {stats['path']}: {stats['entries']} models, "
+            f"{stats['size'] / (1024 * 1024):.1f} of "
+            f"{stats['max_size'] / (1024 * 1024):.0f} MB, "
+            f"{stats['hits']} hits, {stats['session_hits']} reused, "
+            f"{stats['misses']} misses, "
+            f"{stats['evictions']} evictions this session")
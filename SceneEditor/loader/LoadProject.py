@@ -25,6 +25,8 @@ from DirectFolderBrowser.DirectFolderBrowser import DirectFolderBrowser
 
 from SceneEditor.GUI.panels.ObjectPropertiesDefinition import DEFINITIONS, PropertyEditTypes
 from SceneEditor.GUI.panels.PropertiesPanel import PropertyHelper
+from SceneEditor.tools.EditedProperties import set_edited_properties
+from SceneEditor.tools.Instrumentation import timed
 
 
 class ProjectLoader(DirectObject):
@@ -61,6 +63,7 @@ class ProjectLoader(DirectObject):
                 base.messenger.send("showWarning", ["File \"{}\" does not exist.".format(path)])
                 return
 
+            self.core.asset_cache.set_project_path(path)
             if self.newProjectCall():
                 self.__executeLoad(path)
             else:
@@ -69,6 +72,7 @@ class ProjectLoader(DirectObject):
         self.browser.destroy()
         del self.browser
 
+    @timed("Load:Project")
     def __executeLoad(self, path):
         fileContent = None
         with open(path, 'r') as infile:
@@ -90,6 +94,7 @@ class ProjectLoader(DirectObject):
 
         for name, info in fileContent["Scene"].items():
             self.__createElement(name.split("|")[1], info)
+        self.core.asset_cache.flush()
 
         if self.hasErrors:
             base.messenger.send("showWarning", ["Errors occured while loading the project!\nProject may not be fully loaded\nSee output log for more information."])
@@ -154,7 +159,7 @@ class ProjectLoader(DirectObject):
                 value = info[definition.internalName]
                 PropertyHelper.setValue(definition, model, value)
 
-        model.set_tag("edited_properties", ",".join(edit_list))
+        set_edited_properties(model, edit_list)
 
         parent_name = info["parent"]
         if parent_name != "scene_model_parent":
@@ -0,0 +1,55 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+# The names of the properties edited on a scene object are kept as a set in a
+# python tag while editing and only written to a string tag for export.
+EDITED_PROPERTIES_TAG = "edited_properties"
+
+def get_edited_properties(obj):
+    """Returns the set of edited property names of the given object"""
+    if obj.has_python_tag(EDITED_PROPERTIES_TAG):
+        return obj.get_python_tag(EDITED_PROPERTIES_TAG)
+
+    # take over the list of objects which have been tagged the old way
+    edited = set()
+    if obj.has_tag(EDITED_PROPERTIES_TAG):
+        edited = set(obj.get_tag(EDITED_PROPERTIES_TAG).split(","))
+        edited.discard("")
+    obj.set_python_tag(EDITED_PROPERTIES_TAG, edited)
+    return edited
+
+def set_edited_properties(obj, names):
+    obj.set_python_tag(EDITED_PROPERTIES_TAG, set(names))
+
+def set_edited(obj, name):
+    get_edited_properties(obj).add(name)
+
+def remove_edited(obj, name):
+    get_edited_properties(obj).discard(name)
+
+def is_edited(obj, name):
+    return name in get_edited_properties(obj)
+
+def copy_edited_properties(source_obj, target_obj):
+    """Gives target_obj, a copy of source_obj, and all scene objects below it
+    their own sets of edited properties"""
+    # copied nodes share the python tag, so give each copy its own set
+    set_edited_properties(target_obj, get_edited_properties(source_obj))
+    for obj in target_obj.find_all_matches("**/=scene_object_id"):
+        set_edited_properties(obj, get_edited_properties(obj))
+
+def write_edited_tag(obj, target_obj=None):
+    """Stores the edited properties of obj as comma separated string tag on
+    target_obj or obj itself, e.g. for objects that get written to BAM files"""
+    if target_obj is None:
+        target_obj = obj
+    edited = get_edited_properties(obj)
+    if len(edited) == 0:
+        target_obj.clear_tag(EDITED_PROPERTIES_TAG)
+    else:
+        target_obj.set_tag(EDITED_PROPERTIES_TAG, ",".join(sorted(edited)))
@@ -0,0 +1,269 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import json
+import time
+import logging
+
+from panda3d.core import NodePath, Point2, Thread
+
+# version of the recording files written by the recorder
+RECORDING_VERSION = 1
+
+# name of the task manager task dispatching the queued input and GUI events
+EVENT_MANAGER_TASK = "eventManager"
+
+def percentile(sorted_values, part):
+    """Returns the value below which the given part (0-1) of the sorted
+    values lie, using the nearest rank"""
+    if len(sorted_values) == 0:
+        return 0.0
+    index = max(0, int(round(part * len(sorted_values))) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+def get_statistics(durations):
+    durations = sorted(durations)
+    return {
+        "count": len(durations),
+        "p50": percentile(durations, 0.5),
+        "p90": percentile(durations, 0.9),
+        "p99": percentile(durations, 0.99),
+        "max": durations[-1] if durations else 0.0}
+
+class ScriptedMouse:
+    """Replaces the mouse watchers while replaying, so the recorded mouse
+    positions get used without any window or real mouse"""
+    def __init__(self):
+        self.pos = None
+        self.buttons = set()
+
+    def set_mouse(self, pos):
+        self.pos = None if pos is None else Point2(*pos)
+
+    def update_buttons(self, event):
+        parts = event.split("-")
+        if parts[-1] == "up":
+            if len(parts) > 1:
+                self.buttons.discard(parts[-2])
+        else:
+            self.buttons.update(parts)
+
+    def hasMouse(self):
+        return self.pos is not None
+    has_mouse = hasMouse
+
+    def getMouse(self):
+        return Point2(self.pos)
+    get_mouse = getMouse
+
+    def getMouseX(self):
+        return self.pos.x
+    get_mouse_x = getMouseX
+
+    def getMouseY(self):
+        return self.pos.y
+    get_mouse_y = getMouseY
+
+    def isButtonDown(self, button):
+        return str(button) in self.buttons
+    is_button_down = isButtonDown
+
+    def setDisplayRegion(self, display_region):
+        # the recorded positions already are relative to the display region
+        pass
+
+class InputRecorder:
+    """Records the events sent to the editor by input and GUI interaction
+    together with the mouse positions of each frame.
+
+    Only the outermost event handled by the editor gets recorded, events sent
+    while handling it will be sent again when replaying it. Text typed into
+    GUI entries isn't handled by the editor and is not part of the recording.
+    """
+    def __init__(self, editor):
+        self.editor = editor
+        self.frames = []
+        self.start_frame = 0
+        self.start_time = 0.0
+        self.mouse = None
+        self.region_mouse = None
+        self.handling_recorded = False
+        self.original_send = None
+
+    def is_recording(self):
+        return self.original_send is not None
+
+    def start(self):
+        if self.is_recording():
+            return
+        self.frames = []
+        self.start_frame = globalClock.get_frame_count()
+        self.start_time = globalClock.get_real_time()
+        self.mouse = None
+        self.region_mouse = None
+
+        # shadow the messengers send method to see all events
+        self.original_send = base.messenger.send
+        base.messenger.send = self.send
+
+        # run after the input has been processed but before the events of the
+        # frame get dispatched by the event manager
+        base.task_mgr.add(
+            self.record_mouse_task, "SceneEditor_task_inputRecorder", sort=-40)
+        logging.info("Started recording input")
+
+    def stop(self):
+        if not self.is_recording():
+            return
+        base.task_mgr.remove("SceneEditor_task_inputRecorder")
+        del base.messenger.send
+        self.original_send = None
+        logging.info(f"Stopped recording input, {len(self.frames)} frames recorded")
+
+    def write(self, path):
+        recording = {
+            "version": RECORDING_VERSION,
+            "window_size": list(base.win.get_size()),
+            "frames": self.frames}
+        with open(path, "w") as outfile:
+            json.dump(recording, outfile)
+
+    def get_frame(self):
+        frame = globalClock.get_frame_count() - self.start_frame
+        if len(self.frames) == 0 or self.frames[-1]["frame"] != frame:
+            self.frames.append({
+                "frame": frame,
+                "time": globalClock.get_real_time() - self.start_time,
+                "mouse": self.mouse,
+                "region_mouse": self.region_mouse,
+                "events": []})
+        return self.frames[-1]
+
+    def record_mouse_task(self, task):
+        mouse = self.get_mouse(base.mouseWatcherNode)
+        region_mouse = self.get_mouse(self.editor.core.selction_mouse_watcher)
+        if mouse != self.mouse or region_mouse != self.region_mouse:
+            self.mouse = mouse
+            self.region_mouse = region_mouse
+            self.get_frame()
+        return task.cont
+
+    def get_mouse(self, mouse_watcher):
+        if not mouse_watcher.has_mouse():
+            return None
+        pos = mouse_watcher.get_mouse()
+        return [pos.x, pos.y]
+
+    def send(self, event, sentArgs=[], taskChain=None):
+        record = not self.handling_recorded \
+            and self.is_input_event() \
+            and base.messenger.isAccepting(event, self.editor)
+        if record:
+            args = self.encode_args(sentArgs)
+            if args is None:
+                logging.debug(f"Event {event} can't be recorded, unsupported arguments")
+                record = False
+            else:
+                self.get_frame()["events"].append([event, args])
+
+        if not record:
+            return self.original_send(event, sentArgs, taskChain)
+
+        self.handling_recorded = True
+        try:
+            return self.original_send(event, sentArgs, taskChain)
+        finally:
+            self.handling_recorded = False
+
+    def is_input_event(self):
+        # events sent from other tasks will be sent again while replaying
+        task = Thread.get_current_thread().get_current_task()
+        return task is not None and task.name == EVENT_MANAGER_TASK
+
+    def encode_args(self, args):
+        encoded = []
+        for arg in args:
+            if isinstance(arg, NodePath):
+                if arg not in self.editor.core.scene_objects:
+                    return None
+                encoded.append(
+                    {"scene_object": self.editor.core.scene_objects.index(arg)})
+            elif arg is None or isinstance(arg, (bool, int, float, str)):
+                encoded.append(arg)
+            elif isinstance(arg, (list, tuple)):
+                values = self.encode_args(arg)
+                if values is None:
+                    return None
+                encoded.append(values)
+            else:
+                return None
+        return encoded
+
+class InputReplayer:
+    """Replays a recording against the editor, one task manager step per
+    recorded frame, and measures the time spent handling each event"""
+    def __init__(self, editor, recording):
+        self.editor = editor
+        self.recording = recording
+        if recording.get("version") != RECORDING_VERSION:
+            logging.warning("Unsupported input recording version")
+
+    @staticmethod
+    def load(editor, path):
+        with open(path, "r") as infile:
+            return InputReplayer(editor, json.load(infile))
+
+    def decode_args(self, args):
+        decoded = []
+        for arg in args:
+            if isinstance(arg, dict):
+                decoded.append(self.editor.core.scene_objects[arg["scene_object"]])
+            elif isinstance(arg, list):
+                decoded.append(self.decode_args(arg))
+            else:
+                decoded.append(arg)
+        return decoded
+
+    def replay(self):
+        """Replays all frames and returns the timings of each event name and
+        of the frames in seconds as dict of count, p50, p90, p99 and max"""
+        core = self.editor.core
+        mouse = ScriptedMouse()
+        region_mouse = ScriptedMouse()
+        mouse_watcher = base.mouseWatcherNode
+        selection_mouse_watcher = core.selction_mouse_watcher
+        base.mouseWatcherNode = mouse
+        core.selction_mouse_watcher = region_mouse
+
+        event_durations = {}
+        frame_durations = []
+        try:
+            for frame in self.recording["frames"]:
+                mouse.set_mouse(frame["mouse"])
+                region_mouse.set_mouse(frame["region_mouse"])
+
+                for event, args in frame["events"]:
+                    mouse.update_buttons(event)
+                    args = self.decode_args(args)
+                    start = time.perf_counter()
+                    base.messenger.send(event, args)
+                    event_durations.setdefault(event, []).append(
+                        time.perf_counter() - start)
+
+                start = time.perf_counter()
+                base.task_mgr.step()
+                frame_durations.append(time.perf_counter() - start)
+        finally:
+            base.mouseWatcherNode = mouse_watcher
+            core.selction_mouse_watcher = selection_mouse_watcher
+
+        return {
+            "events": {
+                event: get_statistics(durations)
+                for event, durations in sorted(event_durations.items())},
+            "frames": get_statistics(frame_durations)}
@@ -0,0 +1,98 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import time
+import functools
+from contextlib import contextmanager, nullcontext
+
+from panda3d.core import ConfigVariableBool, PStatCollector
+
+# Read once on import, so the decorated functions stay untouched if the
+# instrumentation is disabled. Set this in a PRC file to enable it.
+ENABLED = ConfigVariableBool("scene-editor-instrumentation", False).getValue()
+
+class TimingRecord:
+    def __init__(self, name):
+        self.name = name
+        # collectors are shown in PStats below a common SceneEditor entry
+        self.collector = PStatCollector(f"SceneEditor:{name}")
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.max = 0.0
+
+    def add(self, duration):
+        self.calls += 1
+        self.total += duration
+        self.last = duration
+        if duration > self.max:
+            self.max = duration
+
+    def get_average(self):
+        if self.calls == 0:
+            return 0.0
+        return self.total / self.calls
+
+# name -> TimingRecord of all sections measured so far
+records = {}
+
+def get_record(name):
+    if name not in records:
+        records[name] = TimingRecord(name)
+    return records[name]
+
+def timed(name):
+    """Decorator measuring each call of the function as the given section.
+    Returns the function unchanged if the instrumentation is disabled."""
+    def decorator(func):
+        if not ENABLED:
+            return func
+        record = get_record(name)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            record.collector.start()
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record.add(time.perf_counter() - start)
+                record.collector.stop()
+        return wrapper
+    return decorator
+
+@contextmanager
+def _timed_block(name):
+    record = get_record(name)
+    record.collector.start()
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.add(time.perf_counter() - start)
+        record.collector.stop()
+
+def timer(name):
+    """Context manager measuring the enclosed block as the given section"""
+    if not ENABLED:
+        return nullcontext()
+    return _timed_block(name)
+
+def get_report():
+    """Returns a list of (name, calls, last, average, max) tuples sorted by
+    the section names, all times in seconds"""
+    return [
+        (record.name, record.calls, record.last, record.get_average(), record.max)
+        for name, record in sorted(records.items())]
+
+def reset():
+    for record in records.values():
+        record.reset()
@@ -13,8 +13,11 @@ from panda3d.core import NodePath
 
 from SceneEditor.GUI.panels.ObjectPropertiesDefinition import DEFINITIONS
 from SceneEditor.GUI.panels.PropertiesPanel import PropertyHelper
+from SceneEditor.tools.EditedProperties import get_edited_properties
+from SceneEditor.tools.Instrumentation import timed
 
 class JSONTools:
+    @timed("Save:JSON")
     def getProjectJSON(self, scene_objects, scene_root):
         self.scene_objects = scene_objects
         jsonElements = {}
@@ -23,9 +26,12 @@ class JSONTools:
 
         self.writtenRoots = []
 
+        # a set makes the lookup independent of the scene size
+        scene_object_set = set(scene_objects)
+
         index = 0
         for child in scene_root.get_children():
-            if child in self.scene_objects:
+            if child in scene_object_set:
                 if not child.is_stashed():
                     index += 1
                     jsonElements["Scene"][f"{index}|{child.get_name()}"] = self.__createJSONEntry(child)
@@ -70,9 +76,7 @@ class JSONTools:
             object_dict["camera_type"] = scene_object.get_tag("camera_type")
 
         # get edited property names
-        edit_list = []
-        if scene_object.has_tag("edited_properties"):
-            edit_list = scene_object.get_tag("edited_properties").split(",")
+        edit_list = get_edited_properties(scene_object)
 
         # add all edited properties
         for definition in DEFINITIONS[definition_object_type]:
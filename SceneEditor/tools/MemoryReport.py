@@ -0,0 +1,220 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import json
+import logging
+from datetime import datetime
+
+from panda3d.core import NodePath, TextureAttrib
+
+# only the geometry of models is scene content, the geometry of all other
+# object types is drawn by the editor to show them in the viewport
+CONTENT_TYPES = ["model"]
+
+class MemoryUsage:
+    """Sizes in bytes of the geometry and textures used below a node.
+
+    Loaded models share their vertex data and textures through the model
+    and texture pools, so the referenced sizes of multiple objects can add
+    up to more than is actually allocated. The unique sizes only count the
+    data which hasn't been counted before in the same report."""
+
+    def __init__(self):
+        self.nodes = 0
+        self.geoms = 0
+        self.vertex_bytes = 0
+        self.index_bytes = 0
+        self.texture_bytes = 0
+        self.unique_bytes = 0
+
+    def add(self, other):
+        self.nodes += other.nodes
+        self.geoms += other.geoms
+        self.vertex_bytes += other.vertex_bytes
+        self.index_bytes += other.index_bytes
+        self.texture_bytes += other.texture_bytes
+        self.unique_bytes += other.unique_bytes
+
+    def get_total(self):
+        return self.vertex_bytes + self.index_bytes + self.texture_bytes
+
+    def to_dict(self):
+        return {
+            "nodes": self.nodes,
+            "geoms": self.geoms,
+            "vertex_bytes": self.vertex_bytes,
+            "index_bytes": self.index_bytes,
+            "texture_bytes": self.texture_bytes,
+            "total_bytes": self.get_total(),
+            "unique_bytes": self.unique_bytes}
+
+class MemoryReport:
+    """Breaks down the memory used by the scene objects, the helper models
+    of the editor and objects which have been removed but are still kept
+    for the undo history."""
+
+    def __init__(self, core):
+        self.core = core
+        # pointers of the arrays and textures already counted as unique
+        self.counted = set()
+
+    def count_unique(self, usage, data, size):
+        if data.this not in self.counted:
+            self.counted.add(data.this)
+            usage.unique_bytes += size
+
+    def add_textures(self, usage, state):
+        if not state.has_attrib(TextureAttrib):
+            return
+        texture_attrib = state.get_attrib(TextureAttrib)
+        for i in range(texture_attrib.get_num_on_stages()):
+            texture = texture_attrib.get_on_texture(
+                texture_attrib.get_on_stage(i))
+            size = texture.estimate_texture_memory()
+            usage.texture_bytes += size
+            self.count_unique(usage, texture, size)
+
+    def add_geom_node(self, usage, node):
+        for i in range(node.get_num_geoms()):
+            geom = node.get_geom(i)
+            usage.geoms += 1
+
+            vertex_data = geom.get_vertex_data()
+            for j in range(vertex_data.get_num_arrays()):
+                array = vertex_data.get_array(j)
+                size = array.get_data_size_bytes()
+                usage.vertex_bytes += size
+                self.count_unique(usage, array, size)
+
+            for j in range(geom.get_num_primitives()):
+                indices = geom.get_primitive(j).get_vertices()
+                if indices is None:
+                    continue
+                size = indices.get_data_size_bytes()
+                usage.index_bytes += size
+                self.count_unique(usage, indices, size)
+
+            self.add_textures(usage, node.get_geom_state(i))
+
+    def get_usage(self, root):
+        """Returns the memory used below the given node path including its
+        stashed children but without other scene objects parented to it"""
+        usage = MemoryUsage()
+        to_visit = [root]
+        while to_visit:
+            np = to_visit.pop()
+            node = np.node()
+            usage.nodes += 1
+            self.add_textures(usage, node.get_state())
+            if node.is_geom_node():
+                self.add_geom_node(usage, node)
+            for child in list(np.get_children()) + list(np.get_stashed_children()):
+                if not child.has_tag("scene_object_id"):
+                    to_visit.append(child)
+        return usage
+
+    def get_kill_ring_info(self):
+        entries = self.core.killRing.getEntries()
+        stashed_objects = set()
+        for entry in entries:
+            edit_objects = entry.editObject
+            if not isinstance(edit_objects, list):
+                edit_objects = [edit_objects]
+            for obj in edit_objects:
+                if isinstance(obj, NodePath) \
+                and not obj.is_empty() \
+                and obj.is_stashed():
+                    stashed_objects.add(obj.get_key())
+        return {
+            "entries": len(entries),
+            "stashed_objects": len(stashed_objects)}
+
+    def create(self):
+        """Returns the report as dictionary of plain values"""
+        self.counted = set()
+
+        objects = []
+        types = {}
+        content = MemoryUsage()
+        helpers = MemoryUsage()
+        stashed = MemoryUsage()
+        num_stashed = 0
+        for obj in self.core.scene_objects:
+            if obj.is_empty():
+                continue
+            object_type = obj.get_tag("object_type")
+            usage = self.get_usage(obj)
+            is_content = object_type in CONTENT_TYPES
+
+            if obj.is_stashed():
+                # removed objects are only stashed to be able to undo it
+                num_stashed += 1
+                stashed.add(usage)
+            elif is_content:
+                content.add(usage)
+            else:
+                helpers.add(usage)
+
+            if object_type not in types:
+                types[object_type] = {
+                    "objects": 0, "stashed": 0, "usage": MemoryUsage()}
+            types[object_type]["objects"] += 1
+            types[object_type]["usage"].add(usage)
+            if obj.is_stashed():
+                types[object_type]["stashed"] += 1
+
+            objects.append({
+                "name": obj.get_name(),
+                "scene_object_id": obj.get_tag("scene_object_id"),
+                "object_type": object_type,
+                "stashed": obj.is_stashed(),
+                "helper": not is_content,
+                "memory": usage.to_dict()})
+
+        editor_nodes = {
+            "grid": self.core.grid,
+            "axis": self.core.axis,
+            "selection_highlight_marker": self.core.selection_highlight_marker,
+            "proxy_bounds": self.core.proxy_np}
+        editor = {
+            name: self.get_usage(np).to_dict()
+            for name, np in editor_nodes.items()}
+
+        for info in types.values():
+            info["usage"] = info["usage"].to_dict()
+
+        return {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "summary": {
+                "content": content.to_dict(),
+                "helpers": helpers.to_dict(),
+                "stashed": stashed.to_dict(),
+                "stashed_objects": num_stashed,
+                "unique_bytes": sum(
+                    usage.unique_bytes
+                    for usage in [content, helpers, stashed])
+                    + sum(info["unique_bytes"] for info in editor.values())},
+            "kill_ring": self.get_kill_ring_info(),
+            "object_types": types,
+            "editor": editor,
+            "objects": objects}
+
+    def write(self, path):
+        report = self.create()
+        with open(path, "w") as outfile:
+            json.dump(report, outfile, indent=2)
+
+        summary = report["summary"]
+        logging.info(
+            f"Memory report written to {path}: "
+            f"content {summary['content']['total_bytes'] / 1024:.0f} KiB, "
+            f"helpers {summary['helpers']['total_bytes'] / 1024:.0f} KiB, "
+            f"{summary['stashed_objects']} stashed objects "
+            f"{summary['stashed']['total_bytes'] / 1024:.0f} KiB, "
+            f"{report['kill_ring']['entries']} kill ring entries")
+        return report
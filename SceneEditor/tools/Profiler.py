@@ -0,0 +1,62 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import os
+import cProfile
+import logging
+from datetime import datetime
+
+from panda3d.core import ConfigVariableString
+
+class SessionProfiler:
+    """Profiles everything running in the editors main loop between starting
+    and stopping it and writes the result as pstats file, which can be viewed
+    with tools like snakeviz or converted for speedscope."""
+
+    def __init__(self):
+        profile_path = ConfigVariableString(
+            "scene-editor-profile-path",
+            os.path.join("~", ".SceneEditor", "profiles")).getValue()
+        self.profile_path = os.path.expanduser(profile_path)
+        self.profile = None
+
+    def is_running(self):
+        return self.profile is not None
+
+    def toggle(self):
+        if self.is_running():
+            self.stop()
+        else:
+            self.start()
+
+    def start(self):
+        if self.is_running():
+            return
+        # the profiler stays enabled while this handler returns to the task
+        # manager, so all following frames are recorded
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        logging.info("Started profiling")
+        base.messenger.send("SceneEditor_profiler_changed", [True])
+
+    def stop(self):
+        """Stops profiling and returns the path of the written file"""
+        if not self.is_running():
+            return None
+        self.profile.disable()
+
+        if not os.path.exists(self.profile_path):
+            os.makedirs(self.profile_path)
+        file_name = datetime.now().strftime("profile_%Y-%m-%d_%H-%M-%S.prof")
+        path = os.path.join(self.profile_path, file_name)
+        self.profile.dump_stats(path)
+        self.profile = None
+
+        logging.info(f"Profile written to {path}")
+        base.messenger.send("SceneEditor_profiler_changed", [False])
+        return path
@@ -0,0 +1,331 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+"""Benchmark of the editors core operations on synthetic scenes of growing
+size. Runs headless in an offscreen buffer with only the editor core set up,
+so the times don't include refreshing the GUI panels. The results are written
+as JSON to compare them between releases.
+
+Run from the repository root with: python benchmarks/core_operations.py
+
+Without a display server an offscreen capable software renderer can be used
+with: python benchmarks/core_operations.py --display p3tinydisplay"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from panda3d.core import (
+    loadPrcFileData,
+    MouseWatcher,
+    NodePath,
+    Point2,
+    PandaSystem)
+
+from direct.showbase.DirectObject import DirectObject
+
+# share of the scene consisting of each type of helper object, the rest are
+# models. Adding lights and cameras searches the scene for a free name, so
+# their number is capped to keep the large scenes in a sensible time
+HELPER_SHARE = 0.05
+
+class ScriptedMouse:
+    """Stands in for the mouse watcher while running the transformation tasks
+    as no real mouse is available in an offscreen buffer"""
+    def __init__(self):
+        self.pos = Point2(0, 0)
+
+    def hasMouse(self):
+        return True
+
+    def getMouse(self):
+        return self.pos
+
+class Results:
+    def __init__(self):
+        self.operations = {}
+
+    def measure(self, name, func, count=1):
+        """Runs func once and stores its time for the given number of
+        operations it executed"""
+        start = time.perf_counter()
+        func()
+        duration = time.perf_counter() - start
+        self.add(name, duration, count)
+
+    def add(self, name, duration, count):
+        self.operations[name] = {
+            "count": count,
+            "total": duration,
+            "per_call": duration / count if count else 0.0}
+
+def setup_editor():
+    from direct.showbase.ShowBase import ShowBase
+    base = ShowBase()
+
+    # offscreen buffers don't get a mouse watcher set up, the selection
+    # handler needs one to attach its own one next to it. It's kept out of
+    # the data graph as there is no mouse input to process
+    if base.mouseWatcher is None:
+        base.mouseWatcher = NodePath("benchmark_input").attach_new_node(
+            MouseWatcher("benchmark_mouse_watcher"))
+        base.mouseWatcherNode = base.mouseWatcher.node()
+
+    from SceneEditor.core.Core import Core
+    core = Core()
+
+    # the editor itself forwards these events to the core
+    listener = DirectObject()
+    listener.accept("addToKillRing", core.addToKillRing)
+    listener.accept(
+        "update_selection_highlight_marker",
+        core.update_selection_highlight_marker)
+    return base, core, listener
+
+def reset_scene(core):
+    from SceneEditor.core.KillRing import KillRing
+    core.new_project()
+    core.killRing = KillRing()
+    core.copied_objects = []
+    core.cut_objects = []
+
+def build_scene(core, results, num_objects, model_path, max_helpers):
+    num_helpers = min(int(num_objects * HELPER_SHARE), max_helpers)
+    num_models = num_objects - num_helpers * 3
+
+    results.measure(
+        "load_model",
+        lambda: [core.load_model(model_path) for i in range(num_models)],
+        num_models)
+    results.measure(
+        "add_empty",
+        lambda: [core.add_empty() for i in range(num_helpers)],
+        num_helpers)
+    results.measure(
+        "add_light",
+        lambda: [core.add_light("PointLight", {}) for i in range(num_helpers)],
+        num_helpers)
+    results.measure(
+        "add_camera",
+        lambda: [core.add_camera("PerspectiveLens", {}) for i in range(num_helpers)],
+        num_helpers)
+
+def benchmark_selection(core, results, selection):
+    def select_single():
+        for obj in selection:
+            core.select(obj)
+    results.measure("select", select_single, len(selection))
+
+    def select_multi():
+        core.deselect_all()
+        for obj in selection:
+            core.select(obj, True)
+    results.measure("select_multi", select_multi, len(selection))
+
+    def deselect():
+        for obj in selection:
+            core.deselect(obj)
+    results.measure("deselect", deselect, len(selection))
+
+def benchmark_paste(core, results, selection):
+    core.deselect_all()
+    for obj in selection:
+        core.select(obj, True)
+    core.copy_elements()
+    results.measure("paste_elements", core.paste_elements, len(selection))
+
+def benchmark_move(core, results, selection, frames):
+    core.deselect_all()
+    for obj in selection:
+        core.select(obj, True)
+
+    mouse = ScriptedMouse()
+    mouse_watcher = base.mouseWatcherNode
+    base.mouseWatcherNode = mouse
+    try:
+        core.start_move_objects(selection)
+        task = base.task_mgr.getTasksNamed("move_objects_task")[0]
+
+        def move():
+            # call the task directly, stepping the task manager would add
+            # the time of all other tasks
+            for i in range(frames):
+                mouse.pos = Point2(i * 0.01, i * 0.005)
+                core.move_objects_task(task)
+        results.measure("move_objects_task", move, frames)
+        results.measure("stop_move_objects", core.stop_move_objects)
+    finally:
+        base.mouseWatcherNode = mouse_watcher
+
+def benchmark_undo_redo(core, results):
+    steps = 0
+    while core.killRing.currentRoot.parent is not core.killRing.currentRoot:
+        core.killRing.currentRoot = core.killRing.currentRoot.parent
+        steps += 1
+    # move back to the latest entry, only the number of steps was needed
+    while core.killRing.currentRoot.activeChild is not None:
+        core.killRing.currentRoot = core.killRing.currentRoot.activeChild
+
+    results.measure(
+        "undo", lambda: [core.undo() for i in range(steps)], steps)
+    results.measure(
+        "redo", lambda: [core.redo() for i in range(steps)], steps)
+
+def benchmark_save_load(core, results, work_dir):
+    from SceneEditor.tools.JSONTools import JSONTools
+    from SceneEditor.loader.LoadProject import ProjectLoader
+
+    num_objects = len(core.scene_objects)
+    project = {}
+    def save():
+        project["json"] = JSONTools().getProjectJSON(
+            core.scene_objects, core.scene_model_parent)
+    results.measure("getProjectJSON", save, num_objects)
+
+    path = os.path.join(work_dir, "benchmark.scene")
+    with open(path, "w") as outfile:
+        json.dump(project["json"], outfile, indent=2)
+
+    reset_scene(core)
+
+    # load without the file browser the project loader usually opens
+    project_loader = ProjectLoader.__new__(ProjectLoader)
+    DirectObject.__init__(project_loader)
+    project_loader.newProjectCall = None
+    project_loader.hasErrors = False
+    project_loader.core = core
+    project_loader.objects = []
+    results.measure(
+        "ProjectLoader",
+        lambda: project_loader._ProjectLoader__executeLoad(path),
+        num_objects)
+
+def benchmark_export(core, results, work_dir):
+    from SceneEditor.export.ExportPy import ExporterPy
+    from SceneEditor.export.ExportBam import ExporterBam
+    from SceneEditor.export.ExportCache import ExportCache
+
+    num_objects = len(core.scene_objects)
+    exporters = {}
+
+    # the exporters open a file browser once they are done, which is
+    # included in the measured time as it's part of each export
+    def export_py():
+        exporters["py"] = ExporterPy(
+            work_dir, "benchmark.py",
+            core.scene_model_parent, core.scene_objects, None)
+    results.measure("ExporterPy", export_py, num_objects)
+    exporters["py"].browser.destroy()
+    with open(os.path.join(work_dir, "benchmark.py"), "w") as outfile:
+        outfile.write(exporters["py"].content)
+
+    # shared between the runs like the editor does during a session
+    export_cache = ExportCache()
+    def export_bam():
+        exporters["bam"] = ExporterBam(
+            work_dir, "benchmark.bam",
+            core.scene_model_parent, core.scene_objects, None,
+            export_cache=export_cache)
+    results.measure("ExporterBam", export_bam, num_objects)
+    exporters["bam"].browser.destroy()
+    results.measure(
+        "ExporterBam.write",
+        lambda: exporters["bam"].write(os.path.join(work_dir, "benchmark.bam")),
+        num_objects)
+
+def run_size(core, num_objects, args, work_dir):
+    results = Results()
+    reset_scene(core)
+
+    build_scene(core, results, num_objects, args.model, args.max_helpers)
+
+    models = [
+        obj for obj in core.scene_objects
+        if obj.get_tag("object_type") == "model"]
+    selection = models[:args.max_selection]
+
+    benchmark_selection(core, results, selection)
+    benchmark_paste(core, results, selection)
+    benchmark_move(core, results, selection, args.move_frames)
+    benchmark_undo_redo(core, results)
+    benchmark_export(core, results, work_dir)
+    # this comes last as it replaces the scene with the loaded one
+    benchmark_save_load(core, results, work_dir)
+
+    return {
+        "objects": num_objects,
+        "selection": len(selection),
+        "operations": results.operations}
+
+def print_results(runs):
+    names = []
+    for run in runs:
+        for name in run["operations"]:
+            if name not in names:
+                names.append(name)
+
+    print("time per call in ms")
+    print(f"{'':20}" + "".join(f"{run['objects']:>12}" for run in runs))
+    for name in names:
+        line = f"{name:20}"
+        for run in runs:
+            operation = run["operations"].get(name)
+            if operation is None:
+                line += f"{'-':>12}"
+            else:
+                line += f"{operation['per_call'] * 1000:>12.4f}"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--model", default="models/box")
+    parser.add_argument(
+        "--max-helpers", type=int, default=20,
+        help="maximum number of empties, lights and cameras each")
+    parser.add_argument(
+        "--max-selection", type=int, default=100,
+        help="maximum number of objects selected, pasted and moved")
+    parser.add_argument("--move-frames", type=int, default=30)
+    parser.add_argument("--display", default=None)
+    parser.add_argument("--output", default="core_operations.json")
+    args = parser.parse_args()
+
+    prc = "window-type offscreen\naudio-library-name null\n"
+    if args.display is not None:
+        prc += f"load-display {args.display}\n"
+    loadPrcFileData("", prc)
+
+    base, core, listener = setup_editor()
+
+    runs = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for num_objects in args.sizes:
+            runs.append(run_size(core, num_objects, args, work_dir))
+
+    print_results(runs)
+
+    report = {
+        "panda3d": PandaSystem.get_version_string(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "model": args.model,
+        "runs": runs}
+    with open(args.output, "w") as outfile:
+        json.dump(report, outfile, indent=2)
+    print(f"results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+"""Micro benchmark comparing the time to regenerate the editors line grid
+when drawing each line with LineNodePath as done before and when filling the
+vertex data of the grid in bulk.
+
+Run from the repository root with: python benchmarks/grid_build.py"""
+
+import os
+import sys
+import math
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from panda3d.core import loadPrcFileData, VBase4
+loadPrcFileData("", "window-type none\naudio-library-name null")
+
+from direct.showbase.ShowBase import ShowBase
+from direct.directtools.DirectGeometry import LineNodePath
+
+from SceneEditor.directtoolsOverrides.DirectGrid import DirectGrid
+
+class LegacyLines:
+    """The line node paths of the grid as they were set up before"""
+    def __init__(self, parent):
+        self.minorLines = LineNodePath(parent)
+        self.minorLines.setColor(VBase4(0.3, 0.55, 1, 1))
+        self.minorLines.setThickness(1)
+        self.majorLines = LineNodePath(parent)
+        self.majorLines.setColor(VBase4(0.3, 0.55, 1, 1))
+        self.majorLines.setThickness(5)
+        self.centerLines = LineNodePath(parent)
+        self.centerLines.setColor(VBase4(1, 0, 0, 0))
+        self.centerLines.setThickness(3)
+
+def legacyUpdateGrid(lines, gridSize, gridSpacing):
+    """The grid update drawing each line with a python call"""
+    lines.minorLines.reset()
+    lines.majorLines.reset()
+    lines.centerLines.reset()
+
+    numLines = int(math.ceil(gridSize/gridSpacing))
+    scaledSize = numLines * gridSpacing
+
+    center = lines.centerLines
+    minor = lines.minorLines
+    major = lines.majorLines
+    for i in range(-numLines, numLines + 1):
+        if i == 0:
+            center.setColor(VBase4(0, 1, 0, 0))
+            center.moveTo(i * gridSpacing, -scaledSize, 0)
+            center.drawTo(i * gridSpacing, scaledSize, 0)
+            center.setColor(VBase4(1, 0, 0, 0))
+            center.moveTo(-scaledSize, i * gridSpacing, 0)
+            center.drawTo(scaledSize, i * gridSpacing, 0)
+        elif (i % 5) == 0:
+            major.moveTo(i * gridSpacing, -scaledSize, 0)
+            major.drawTo(i * gridSpacing, scaledSize, 0)
+            major.moveTo(-scaledSize, i * gridSpacing, 0)
+            major.drawTo(scaledSize, i * gridSpacing, 0)
+        else:
+            minor.moveTo(i * gridSpacing, -scaledSize, 0)
+            minor.drawTo(i * gridSpacing, scaledSize, 0)
+            minor.moveTo(-scaledSize, i * gridSpacing, 0)
+            minor.drawTo(scaledSize, i * gridSpacing, 0)
+
+    center.create()
+    minor.create()
+    major.create()
+
+def time_update(update, repeats):
+    best = None
+    for i in range(repeats):
+        start = time.perf_counter()
+        update()
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=float, default=1000.0)
+    parser.add_argument("--spacing", type=float, default=1.0)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    base = ShowBase()
+
+    grid = DirectGrid(
+        gridSize=args.size, gridSpacing=args.spacing, parent=base.render)
+    legacyLines = LegacyLines(base.render)
+
+    legacy = time_update(
+        lambda: legacyUpdateGrid(legacyLines, args.size, args.spacing),
+        args.repeats)
+    bulk = time_update(grid.updateGrid, args.repeats)
+
+    numLines = 2 * (2 * int(math.ceil(args.size / args.spacing)) + 1)
+    print(f"grid of {numLines} lines, best of {args.repeats} runs")
+    print(f"{'':20}{'before':>12}{'after':>12}{'speedup':>10}")
+    print(f"{'grid update':20}{legacy:>11.4f}s{bulk:>11.4f}s{legacy / bulk:>9.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+"""Replays an input recording against a headless editor and reports the
+time spent handling each event as percentiles. Recordings are written by
+the editor when it is started with scene-editor-input-recording set to a
+file path in the PRC configuration and then closed.
+
+To replay a session on the same scene, load the project that was open at
+the start of the recording with --project.
+
+Run from the repository root with:
+python benchmarks/input_replay.py recording.json
+
+Without a display server an offscreen capable software renderer can be used
+by adding --display p3tinydisplay"""
+
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from panda3d.core import (
+    loadPrcFileData,
+    MouseWatcher,
+    NodePath)
+
+def setup_editor():
+    from direct.showbase.ShowBase import ShowBase
+    base = ShowBase()
+
+    # offscreen buffers don't get a mouse watcher set up, the editor needs one
+    # to attach its own one next to it
+    if base.mouseWatcher is None:
+        base.mouseWatcher = NodePath("replay_input").attach_new_node(
+            MouseWatcher("replay_mouse_watcher"))
+        base.mouseWatcherNode = base.mouseWatcher.node()
+
+    from SceneEditor.SceneEditor import SceneEditor
+    return SceneEditor(base.pixel2d)
+
+def load_project(editor, path):
+    from direct.showbase.DirectObject import DirectObject
+    from SceneEditor.loader.LoadProject import ProjectLoader
+
+    # load without the file browser the project loader usually opens
+    project_loader = ProjectLoader.__new__(ProjectLoader)
+    DirectObject.__init__(project_loader)
+    project_loader.newProjectCall = None
+    project_loader.hasErrors = False
+    project_loader.core = editor.core
+    project_loader.objects = []
+    project_loader._ProjectLoader__executeLoad(path)
+    # let the panels catch up so their refresh isn't part of the replay
+    base.task_mgr.step()
+
+def print_report(report):
+    print("event handling time in ms")
+    print(f"{'event':32}{'count':>7}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    rows = list(report["events"].items()) + [("(frame)", report["frames"])]
+    for name, stats in rows:
+        print(
+            f"{name:32}{stats['count']:>7}"
+            f"{stats['p50'] * 1000:>10.3f}{stats['p90'] * 1000:>10.3f}"
+            f"{stats['p99'] * 1000:>10.3f}{stats['max'] * 1000:>10.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recording")
+    parser.add_argument("--project", default=None)
+    parser.add_argument("--display", default=None)
+    parser.add_argument("--output", default="input_replay.json")
+    args = parser.parse_args()
+
+    with open(args.recording, "r") as infile:
+        recording = json.load(infile)
+
+    width, height = recording.get("window_size", [1280, 720])
+    prc = "window-type offscreen\naudio-library-name null\n"
+    prc += f"win-size {width} {height}\n"
+    if args.display is not None:
+        prc += f"load-display {args.display}\n"
+    loadPrcFileData("", prc)
+
+    editor = setup_editor()
+    if args.project is not None:
+        load_project(editor, args.project)
+
+    from SceneEditor.tools.InputReplay import InputReplayer
+    report = InputReplayer(editor, recording).replay()
+
+    print_report(report)
+    with open(args.output, "w") as outfile:
+        json.dump(report, outfile, indent=2)
+    print(f"results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+"""Micro benchmark comparing the compiled property accessors of the
+PropertyHelper with walking the definitions lookup attributes on every access
+as done before, measured on reading all edited properties and on saving a
+scene with many objects.
+
+Run from the repository root with: python benchmarks/property_access.py"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from panda3d.core import NodePath, Camera, PerspectiveLens
+
+from SceneEditor.GUI.panels.ObjectPropertiesDefinition import DEFINITIONS
+from SceneEditor.GUI.panels.PropertiesPanel import PropertyHelper
+from SceneEditor.tools.JSONTools import JSONTools
+
+def legacyGetValues(definition, obj):
+    """The property lookup without compiled accessors"""
+    editObj = obj
+    if definition.lookupAttrs is not None:
+        for lookupAttr, lookupAttrArgs in definition.lookupAttrs.items():
+            editObj = getattr(editObj, lookupAttr)(*lookupAttrArgs)
+    if definition.setAsTag:
+        return editObj.get_tag(definition.internalName)
+    if definition.getFunctionName:
+        return getattr(editObj, definition.getFunctionName)()
+    return getattr(editObj, definition.internalName)
+
+def legacySave(scene_objects, scene_root):
+    """Saving as it was done before, looking up each child in the list of
+    scene objects"""
+    jsonTools = JSONTools()
+    jsonTools.scene_objects = scene_objects
+    jsonElements = {"ProjectVersion": "0", "Scene": {}}
+    index = 0
+    for child in scene_root.get_children():
+        if child in scene_objects:
+            if not child.is_stashed():
+                index += 1
+                jsonElements["Scene"][f"{index}|{child.get_name()}"] = \
+                    jsonTools._JSONTools__createJSONEntry(child)
+    return jsonElements
+
+def create_scene(num_objects):
+    scene_root = NodePath("scene_root")
+    scene_objects = []
+    for i in range(num_objects):
+        if i % 10 == 0:
+            # every tenth object is a camera to have some lookups
+            obj = scene_root.attach_new_node(f"camera_{i}")
+            obj.set_tag("object_type", "camera")
+            obj.set_tag("camera_type", "PerspectiveLens")
+            obj.attach_new_node("camera_model")
+            obj.attach_new_node(Camera("Camera", PerspectiveLens()))
+            definitions = DEFINITIONS["PerspectiveLens"]
+        else:
+            obj = scene_root.attach_new_node(f"model_{i}")
+            obj.set_tag("object_type", "model")
+            obj.set_tag("filepath", "models/box")
+            definitions = DEFINITIONS["model"]
+        obj.set_pos(i, i, 0)
+        obj.set_color(1, 1, 1, 1)
+        obj.set_tag("edited_properties", ",".join(
+            [definition.internalName for definition in definitions]))
+        scene_objects.append(obj)
+    return scene_root, scene_objects
+
+def time_save(save, scene_root, scene_objects, repeats):
+    best = None
+    for i in range(repeats):
+        start = time.perf_counter()
+        save(scene_objects, scene_root)
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return best
+
+def time_access(scene_objects, getValues, repeats):
+    """Only the time spent reading the edited properties of all objects"""
+    object_definitions = []
+    for obj in scene_objects:
+        object_type = obj.get_tag("object_type")
+        if object_type == "camera":
+            object_type = obj.get_tag("camera_type")
+        definitions = [
+            definition for definition in DEFINITIONS[object_type]
+            if definition.internalName != ""]
+        object_definitions.append((obj, definitions))
+
+    best = None
+    for i in range(repeats):
+        start = time.perf_counter()
+        for obj, definitions in object_definitions:
+            for definition in definitions:
+                getValues(definition, obj)
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    scene_root, scene_objects = create_scene(args.objects)
+
+    compiledGetValues = PropertyHelper.getValues
+    PropertyHelper.getValues = legacyGetValues
+    legacy_save = time_save(legacySave, scene_root, scene_objects, args.repeats)
+    PropertyHelper.getValues = compiledGetValues
+    compiled_save = time_save(
+        JSONTools().getProjectJSON, scene_root, scene_objects, args.repeats)
+
+    legacy_access = time_access(scene_objects, legacyGetValues, args.repeats)
+    compiled_access = time_access(scene_objects, compiledGetValues, args.repeats)
+
+    print(f"{args.objects} objects, best of {args.repeats} runs")
+    print(f"{'':20}{'before':>12}{'after':>12}{'speedup':>10}")
+    for name, legacy, compiled in (
+            ("property access", legacy_access, compiled_access),
+            ("save", legacy_save, compiled_save)):
+        print(f"{name:20}{legacy:>11.4f}s{compiled:>11.4f}s{legacy / compiled:>9.2f}x")
+
+if __name__ == "__main__":
+    main()